@@ -0,0 +1 @@
+"""Benchmarks of the ČHMÚ Weather integration."""
@@ -0,0 +1,375 @@
+"""Benchmark suite for parsing, station lookup and refresh cycles.
+
+Run from the repository root:
+
+    python -m benchmarks.bench [--quick] [--output FILE] [--compare BASELINE]
+
+Every benchmark reports throughput, latency percentiles and peak memory.
+Results are written as JSON, and ``--compare`` fails when a benchmark got
+slower or bigger than a baseline by more than ``--threshold``.
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import logging
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.chmu.api import ChmuApi, async_fetch_stations_with_coords
+from custom_components.chmu.coordinator import ChmuHub
+from custom_components.chmu.geo import StationIndex
+from custom_components.chmu.governor import RequestGovernor
+from custom_components.chmu.parser import StationParser
+
+from . import generators
+from .server import StandInServer
+
+RESULTS_VERSION = 1
+DEFAULT_OUTPUT = "benchmarks/results/latest.json"
+# Relative slowdown or memory growth reported as a regression
+DEFAULT_THRESHOLD = 0.25
+
+Runnable = Callable[[], Union[None, Awaitable[None]]]
+
+
+class Benchmark:
+    """One measured operation.
+
+    ``units`` is how many rows, stations or queries one run processes, for
+    the throughput figure. ``setup`` runs untimed before every run.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Runnable,
+        unit: str,
+        units: int,
+        iterations: int,
+        warmup: int = 1,
+        setup: Optional[Callable[[], None]] = None,
+    ):
+        """Initialize the benchmark."""
+        self.name = name
+        self.run = run
+        self.unit = unit
+        self.units = units
+        self.iterations = iterations
+        self.warmup = warmup
+        self.setup = setup
+        # Extra figures reported with the result
+        self.extra: Dict[str, Any] = {}
+
+    async def _call(self) -> None:
+        if self.setup is not None:
+            self.setup()
+        result = self.run()
+        if inspect.isawaitable(result):
+            await result
+
+    async def async_measure(self) -> Dict[str, Any]:
+        """Run the benchmark and summarize it."""
+        for _ in range(self.warmup):
+            await self._call()
+
+        latencies = []
+        for _ in range(self.iterations):
+            if self.setup is not None:
+                self.setup()
+            start = time.perf_counter()
+            result = self.run()
+            if inspect.isawaitable(result):
+                await result
+            latencies.append(time.perf_counter() - start)
+
+        # Tracing slows everything down, so memory is measured separately
+        tracemalloc.start()
+        try:
+            await self._call()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        latencies.sort()
+        total = sum(latencies)
+        return {
+            "unit": self.unit,
+            "units_per_run": self.units,
+            "iterations": self.iterations,
+            "throughput": self.units * len(latencies) / total if total else None,
+            "mean_ms": total / len(latencies) * 1000,
+            "p50_ms": _percentile(latencies, 50) * 1000,
+            "p95_ms": _percentile(latencies, 95) * 1000,
+            "p99_ms": _percentile(latencies, 99) * 1000,
+            "peak_kib": peak / 1024,
+            **self.extra,
+        }
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    """Return a percentile of sorted values by the nearest-rank method."""
+    rank = max(1, round(percent / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def _parse_benchmarks(quick: bool) -> List[Benchmark]:
+    """Benchmarks of the streaming parser and the result mapping."""
+    day = datetime.now(timezone.utc).date()
+    station_id = generators.station_ids(1)[0]
+    single = generators.data_file([station_id], day)
+    single_rows = generators.INTERVALS_PER_DAY * len(generators.ELEMENT_CODES)
+
+    stations = generators.station_ids(10 if quick else 50)
+    multi = generators.data_file(stations, day)
+    multi_rows = single_rows * len(stations)
+
+    parser = StationParser(station_id)
+    parser.parse_document(single)
+    series = parser.series
+
+    iterations = 5 if quick else 30
+    benchmarks = [
+        Benchmark(
+            "parse_station_day",
+            lambda: StationParser(station_id).parse_document(single),
+            "rows",
+            single_rows,
+            iterations * 4,
+        ),
+        Benchmark(
+            "parse_multi_station_day",
+            lambda: StationParser(station_id).parse_document(multi),
+            "rows",
+            multi_rows,
+            iterations,
+        ),
+        Benchmark(
+            "parse_chmu_data",
+            lambda: ChmuApi(None, station_id)._parse_chmu_data(series),
+            "results",
+            1,
+            iterations * 20,
+        ),
+    ]
+    benchmarks[0].extra["file_kib"] = len(single) / 1024
+    benchmarks[1].extra["file_kib"] = len(multi) / 1024
+    return benchmarks
+
+
+def _lookup_benchmarks(
+    stations: Dict[str, Dict[str, Any]], quick: bool
+) -> List[Benchmark]:
+    """Benchmarks of the spatial station index."""
+    rng = random.Random(1)
+    queries = [
+        (rng.uniform(*generators.LATITUDES), rng.uniform(*generators.LONGITUDES))
+        for _ in range(200 if quick else 1000)
+    ]
+    index = StationIndex(stations)
+
+    def nearest() -> None:
+        for latitude, longitude in queries:
+            index.nearest(latitude, longitude)
+
+    def within() -> None:
+        for latitude, longitude in queries:
+            index.within(latitude, longitude, 25)
+
+    iterations = 5 if quick else 20
+    return [
+        Benchmark(
+            "station_index_build",
+            lambda: StationIndex(stations),
+            "stations",
+            len(stations),
+            iterations,
+        ),
+        Benchmark("nearest_station", nearest, "queries", len(queries), iterations),
+        Benchmark("stations_within_25km", within, "queries", len(queries), iterations),
+    ]
+
+
+def _refresh_benchmark(
+    hass: HomeAssistant, server: StandInServer, quick: bool
+) -> Benchmark:
+    """Benchmark a hub refresh of many stations against the local server."""
+    day = datetime.now(timezone.utc).date()
+    stations = generators.station_ids(5 if quick else 20)
+    iterations = 5 if quick else 30
+    # Start mid-day so every refresh can append one more interval
+    intervals = generators.INTERVALS_PER_DAY - iterations - 3
+
+    def publish() -> None:
+        nonlocal intervals
+        intervals += 1
+        for index, station_id in enumerate(stations):
+            path = f"/now/data/{generators.data_filename(station_id, day)}"
+            server.files[path] = generators.data_file(
+                [station_id], day, intervals, seed=index
+            )
+
+    # Without the rate limit, which would measure the token bucket instead
+    hub = ChmuHub(hass, server.base_url, RequestGovernor(rate=None))
+    for station_id in stations:
+        hub.async_add_station(station_id, None)
+
+    async def refresh() -> None:
+        for tracker in hub._trackers.values():
+            tracker.next_poll = None
+        await hub._async_update_data()
+
+    return Benchmark(
+        "coordinator_refresh",
+        refresh,
+        "stations",
+        len(stations),
+        iterations,
+        setup=publish,
+    )
+
+
+async def async_run(quick: bool) -> Dict[str, Any]:
+    """Run every benchmark and return the results document."""
+    # Keep per-refresh logging out of the measurements
+    logging.getLogger("custom_components.chmu").setLevel(logging.WARNING)
+
+    server = StandInServer()
+    base_url = await server.async_start()
+
+    count = 1000 if quick else 5000
+    metadata_path = (
+        f"/now/metadata/{generators.metadata_filename(datetime.now().date())}"
+    )
+    server.files[metadata_path] = generators.metadata_file(count)
+
+    results: Dict[str, Any] = {}
+    try:
+        async with aiohttp.ClientSession() as session:
+            catalogue = Benchmark(
+                "metadata_catalogue",
+                lambda: async_fetch_stations_with_coords(session, base_url),
+                "stations",
+                count,
+                3 if quick else 10,
+            )
+            catalogue.extra["file_kib"] = len(server.files[metadata_path]) / 1024
+            stations = await async_fetch_stations_with_coords(session, base_url)
+
+            benchmarks = [
+                *_parse_benchmarks(quick),
+                catalogue,
+                *_lookup_benchmarks(stations, quick),
+            ]
+            for benchmark in benchmarks:
+                results[benchmark.name] = await benchmark.async_measure()
+                _print_result(benchmark.name, results[benchmark.name])
+
+        hass = HomeAssistant(tempfile.mkdtemp(prefix="chmu-bench-"))
+        refresh = _refresh_benchmark(hass, server, quick)
+        requests = server.stats.requests
+        sent = server.stats.bytes_sent
+        try:
+            results[refresh.name] = await refresh.async_measure()
+        finally:
+            await hass.async_stop(force=True)
+        # The warm-up downloads whole files, later runs only what was appended
+        runs = refresh.warmup + refresh.iterations + 1
+        results[refresh.name]["requests_per_run"] = (
+            server.stats.requests - requests
+        ) / runs
+        results[refresh.name]["kib_per_run"] = (
+            (server.stats.bytes_sent - sent) / runs / 1024
+        )
+        _print_result(refresh.name, results[refresh.name])
+    finally:
+        await server.async_stop()
+
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "quick": quick,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def _print_result(name: str, result: Dict[str, Any]) -> None:
+    """Print one result line."""
+    throughput = result["throughput"] or 0
+    print(
+        f"{name:<26} {throughput:>14,.0f} {result['unit'] + '/s':<12}"
+        f" p50 {result['p50_ms']:>9.3f} ms  p95 {result['p95_ms']:>9.3f} ms"
+        f"  p99 {result['p99_ms']:>9.3f} ms  peak {result['peak_kib']:>9.1f} KiB"
+    )
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> List[str]:
+    """Return the regressions of ``current`` against ``baseline``."""
+    regressions = []
+    for name, result in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            continue
+        for key in ("p50_ms", "peak_kib"):
+            if before.get(key) and result[key] > before[key] * (1 + threshold):
+                regressions.append(
+                    f"{name}: {key} {before[key]:.3f} -> {result[key]:.3f}"
+                    f" (+{(result[key] / before[key] - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def main() -> int:
+    """Run the suite from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--quick", action="store_true", help="smaller inputs and fewer iterations"
+    )
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="results file")
+    parser.add_argument("--compare", help="baseline results file to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="relative change reported as a regression",
+    )
+    args = parser.parse_args()
+
+    document = asyncio.run(async_run(args.quick))
+
+    if args.output:
+        path = Path(args.output)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(document, indent=2) + "\n")
+        print(f"Results written to {path}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(baseline, document, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
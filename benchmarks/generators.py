@@ -0,0 +1,155 @@
+"""Synthetic ČHMÚ opendata files.
+
+The generated files have the layout of the real ones, so they go through
+exactly the same code paths. Values are pseudo-random but reproducible for
+a given seed.
+"""
+
+import json
+import random
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterable, List
+
+# Elements of a fully equipped professional station
+ELEMENT_CODES = (
+    "T",
+    "H",
+    "P",
+    "SRA10M",
+    "F",
+    "D",
+    "Fmax",
+    "Dmax",
+    "TPM",
+    "T05",
+    "SSV10M",
+)
+# 10-minute intervals in a day
+INTERVALS_PER_DAY = 144
+
+DATA_HEADER = "STATION,ELEMENT,DT,VAL,FLAG,QUALITY"
+METADATA_HEADER = "WSI,GH_ID,FULL_NAME,GEOGR1,GEOGR2,ELEVATION,BEGIN_DATE"
+
+# Rough bounding box of the Czech Republic
+LATITUDES = (48.55, 51.05)
+LONGITUDES = (12.10, 18.85)
+
+
+def station_ids(count: int) -> List[str]:
+    """Return ``count`` WMO-like station IDs."""
+    return [f"{11000 + index:05d}" for index in range(count)]
+
+
+def data_filename(station_id: str, day: date) -> str:
+    """Return the name of a station's 10-minute file for a day."""
+    return f"10m-0-20000-0-{station_id}-{day.strftime('%Y%m%d')}.json"
+
+
+def metadata_filename(day: date) -> str:
+    """Return the name of the station metadata file for a day."""
+    return f"meta1-{day.strftime('%Y%m%d')}.json"
+
+
+def _value(rng: random.Random, element: str, interval: int) -> float:
+    """Return a plausible value of an element."""
+    if element in ("T", "TPM", "T05"):
+        return round(10 + 8 * rng.random() + interval / 24, 1)
+    if element == "H":
+        return float(rng.randint(40, 100))
+    if element == "P":
+        return round(960 + 20 * rng.random(), 1)
+    if element == "SRA10M":
+        return round(rng.choice((0.0, 0.0, 0.0, 0.1, 0.3, 1.2)), 1)
+    if element in ("F", "Fmax"):
+        return round(12 * rng.random(), 1)
+    if element in ("D", "Dmax"):
+        return float(rng.randint(0, 359))
+    if element == "SSV10M":
+        # Seconds of sunshine in the interval
+        return float(rng.randint(0, 600))
+    return round(10 * rng.random(), 1)
+
+
+def data_rows(
+    stations: Iterable[str],
+    day: date,
+    intervals: int = INTERVALS_PER_DAY,
+    elements: Iterable[str] = ELEMENT_CODES,
+    seed: int = 0,
+) -> List[list]:
+    """Return the rows of a 10-minute file, oldest interval first."""
+    rng = random.Random(seed)
+    stations = list(stations)
+    elements = list(elements)
+    start = datetime.combine(day, time(), timezone.utc)
+    rows = []
+    for interval in range(intervals):
+        timestamp = (start + timedelta(minutes=10 * interval)).strftime(
+            "%Y-%m-%dT%H:%M:%SZ"
+        )
+        for station_id in stations:
+            for element in elements:
+                rows.append(
+                    [
+                        f"0-20000-0-{station_id}",
+                        element,
+                        timestamp,
+                        _value(rng, element, interval),
+                        None,
+                        0.0,
+                    ]
+                )
+    return rows
+
+
+def data_file(
+    stations: Iterable[str],
+    day: date,
+    intervals: int = INTERVALS_PER_DAY,
+    elements: Iterable[str] = ELEMENT_CODES,
+    seed: int = 0,
+) -> bytes:
+    """Return a 10-minute file covering ``intervals`` from midnight."""
+    return _document(DATA_HEADER, data_rows(stations, day, intervals, elements, seed))
+
+
+def metadata_file(count: int, seed: int = 0, other_networks: float = 0.5) -> bytes:
+    """Return a ``meta1`` catalogue of ``count`` professional stations.
+
+    ``other_networks`` adds that share of rows of non-professional stations,
+    which the integration has to skip.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for index, station_id in enumerate(station_ids(count)):
+        rows.append(
+            [
+                f"0-20000-0-{station_id}",
+                f"P{index:06d}",
+                f"Station {station_id}",
+                round(rng.uniform(*LONGITUDES), 6),
+                round(rng.uniform(*LATITUDES), 6),
+                round(rng.uniform(150, 1600), 1),
+                "1961-01-01T00:00:00Z",
+            ]
+        )
+        if rng.random() < other_networks:
+            rows.append(
+                [
+                    f"0-203-0-{station_id}{index}",
+                    f"O{index:06d}",
+                    f"Gauge {index}",
+                    round(rng.uniform(*LONGITUDES), 6),
+                    round(rng.uniform(*LATITUDES), 6),
+                    round(rng.uniform(150, 1600), 1),
+                    "1990-01-01T00:00:00Z",
+                ]
+            )
+    return _document(METADATA_HEADER, rows)
+
+
+def _document(header: str, rows: List[list]) -> bytes:
+    """Wrap rows like the opendata files do."""
+    return json.dumps(
+        {"data": {"type": "DataCollection", "data": {"header": header, "values": rows}}}
+    ).encode()
@@ -0,0 +1,173 @@
+"""Load harness driving simulated time through the real hub.
+
+Run from the repository root:
+
+    python -m benchmarks.load --stations 50 --hours 24 [--latency 0.05] ...
+
+The hub polls a local stand-in server whose files grow with a simulated
+clock. The clock jumps from one hub refresh to the next, as scheduled by
+the hub itself, so N stations × M hours run in seconds of wall time.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.chmu.coordinator import ChmuHub
+from custom_components.chmu.governor import RequestGovernor
+
+from . import generators
+from .bench import _percentile
+from .server import Faults, SimulatedFeed, StandInServer
+
+DEFAULT_START = "2024-06-01T06:00:00+00:00"
+
+
+async def async_run(
+    stations: int,
+    hours: float,
+    start: datetime,
+    faults: Faults,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Simulate ``hours`` of refreshes of ``stations`` and return a report."""
+    station_ids = generators.station_ids(stations)
+    feed = SimulatedFeed(station_ids, start, seed=seed)
+    server = StandInServer(feed=feed, faults=faults, seed=seed)
+    base_url = await server.async_start()
+
+    end = start + timedelta(hours=hours)
+    durations: List[float] = []
+    polls = 0
+    failed = 0
+    missing = 0
+
+    # Every part of the integration reads the time through dt_util
+    with patch.object(dt_util, "utcnow", lambda: feed.clock):
+        hass = HomeAssistant(tempfile.mkdtemp(prefix="chmu-load-"))
+        # Backoff follows the simulated clock; the rate limit would wait in
+        # wall time, so only the concurrency cap applies
+        governor = RequestGovernor(rate=None, clock=lambda: feed.clock.timestamp())
+        hub = ChmuHub(hass, base_url, governor)
+        for station_id in station_ids:
+            hub.async_add_station(station_id, None)
+
+        wall = time.perf_counter()
+        try:
+            while feed.clock < end:
+                due = sum(
+                    tracker.is_due(feed.clock) for tracker in hub._trackers.values()
+                )
+                refresh_start = time.perf_counter()
+                await hub.async_refresh()
+                durations.append(time.perf_counter() - refresh_start)
+                polls += due
+                if not hub.last_update_success:
+                    failed += 1
+                missing += len(station_ids) - len(hub.data or {})
+                feed.clock += hub.update_interval
+        finally:
+            wall = time.perf_counter() - wall
+            await hass.async_stop(force=True)
+            await server.async_stop()
+
+    durations.sort()
+    refreshes = len(durations)
+    delays = [tracker.delay.total_seconds() for tracker in hub._trackers.values()]
+    return {
+        "stations": stations,
+        "simulated_hours": hours,
+        "wall_seconds": wall,
+        "refreshes": refreshes,
+        "failed_refreshes": failed,
+        "station_polls": polls,
+        "polls_per_station_hour": polls / stations / hours if hours else None,
+        # Station results missing after a refresh, summed over all refreshes
+        "missing_results": missing,
+        "refresh_ms": {
+            "mean": sum(durations) / refreshes * 1000 if refreshes else None,
+            "p50": _percentile(durations, 50) * 1000 if refreshes else None,
+            "p95": _percentile(durations, 95) * 1000 if refreshes else None,
+            "max": durations[-1] * 1000 if refreshes else None,
+        },
+        "learned_delay_s": {
+            "min": min(delays),
+            "mean": sum(delays) / len(delays),
+            "max": max(delays),
+        },
+        "governor": governor.as_dict(),
+        "server": {
+            **server.stats.as_dict(),
+            "requests_per_station_hour": server.stats.requests / stations / hours
+            if hours
+            else None,
+        },
+    }
+
+
+def main() -> int:
+    """Run the harness from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stations", type=int, default=20)
+    parser.add_argument("--hours", type=float, default=24)
+    parser.add_argument(
+        "--start", default=DEFAULT_START, help="simulated start time (ISO 8601)"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument(
+        "--not-found", type=float, default=0.0, help="share of 404 responses"
+    )
+    parser.add_argument(
+        "--errors", type=float, default=0.0, help="share of 503 responses"
+    )
+    parser.add_argument(
+        "--truncated", type=float, default=0.0, help="share of truncated bodies"
+    )
+    parser.add_argument(
+        "--slow", type=float, default=0.0, help="share of slowly sent bodies"
+    )
+    parser.add_argument("--output", help="write the report to this JSON file")
+    args = parser.parse_args()
+
+    # Injected faults make the hub log every failed station
+    logging.basicConfig(level=logging.ERROR)
+
+    report = asyncio.run(
+        async_run(
+            args.stations,
+            args.hours,
+            datetime.fromisoformat(args.start),
+            Faults(
+                latency=args.latency,
+                jitter=args.jitter,
+                not_found=args.not_found,
+                errors=args.errors,
+                truncated=args.truncated,
+                slow=args.slow,
+            ),
+            args.seed,
+        )
+    )
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+"""Local stand-in for the ČHMÚ opendata server.
+
+Files are either set up front in ``files`` or generated by a
+``SimulatedFeed``, whose daily files grow as its simulated clock advances.
+``Faults`` inject latency, errors, truncated payloads and slow responses.
+"""
+
+import asyncio
+import hashlib
+import random
+from datetime import date, datetime, time, timedelta, timezone
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+from . import generators
+
+# Size of the pieces a slow response is sent in
+SLOW_CHUNK_SIZE = 4 * 1024
+
+
+class Faults:
+    """What goes wrong with responses, as shares of all requests."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        not_found: float = 0.0,
+        errors: float = 0.0,
+        truncated: float = 0.0,
+        slow: float = 0.0,
+        slow_delay: float = 0.05,
+    ):
+        """Initialize the faults.
+
+        ``latency`` and ``jitter`` delay every response by that many seconds
+        plus up to ``jitter`` more. Slow responses pause ``slow_delay`` before
+        every ``SLOW_CHUNK_SIZE`` bytes.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.not_found = not_found
+        self.errors = errors
+        self.truncated = truncated
+        self.slow = slow
+        self.slow_delay = slow_delay
+
+
+class SimulatedFeed:
+    """Generated ``now/data`` and ``now/metadata`` files at a simulated time.
+
+    A daily file holds the intervals a station has published by ``clock``.
+    Every station publishes with its own fixed delay, so a poller has
+    something to learn. Rendered files are cached until they grow.
+    """
+
+    def __init__(
+        self,
+        stations: List[str],
+        clock: datetime,
+        delays: Tuple[int, int] = (300, 540),
+        seed: int = 0,
+    ):
+        """Initialize the feed.
+
+        ``delays`` is the range of publication delays in seconds.
+        """
+        rng = random.Random(seed)
+        self.stations = {
+            station_id: (index, timedelta(seconds=rng.randint(*delays)))
+            for index, station_id in enumerate(stations)
+        }
+        self.clock = clock
+        self._metadata = generators.metadata_file(len(stations), seed)
+        self._cache: Dict[Tuple[str, date], Tuple[int, bytes]] = {}
+
+    def intervals(self, station_id: str, day: date) -> int:
+        """Return how many intervals of a day a station has published."""
+        _, delay = self.stations[station_id]
+        start = datetime.combine(day, time(), timezone.utc)
+        elapsed = self.clock - delay - start
+        if elapsed < timedelta(0):
+            return 0
+        # The first interval is stamped at midnight
+        published = elapsed // timedelta(minutes=10) + 1
+        return min(published, generators.INTERVALS_PER_DAY)
+
+    def data_file(self, station_id: str, day: date) -> Optional[bytes]:
+        """Return a station's daily file as published by now."""
+        if station_id not in self.stations or day > self.clock.date():
+            return None
+        intervals = self.intervals(station_id, day)
+        cached = self._cache.get((station_id, day))
+        if cached is not None and cached[0] == intervals:
+            return cached[1]
+        index, _ = self.stations[station_id]
+        # Seeded per station and day, so a growing file keeps its prefix
+        body = generators.data_file(
+            [station_id], day, intervals, seed=hash((index, day.toordinal()))
+        )
+        self._cache[(station_id, day)] = (intervals, body)
+        return body
+
+    def lookup(self, path: str) -> Optional[bytes]:
+        """Return the file at a path below the base URL."""
+        directory, _, name = path.rpartition("/")
+        if directory == "/now/metadata" and name.startswith("meta1-"):
+            return self._metadata
+        if directory == "/now/data" and name.startswith("10m-0-20000-0-"):
+            parts = name[: -len(".json")].split("-")
+            if len(parts) != 6:
+                return None
+            try:
+                day = datetime.strptime(parts[5], "%Y%m%d").date()
+            except ValueError:
+                return None
+            return self.data_file(parts[4], day)
+        return None
+
+
+class ServerStats:
+    """Requests served, by outcome."""
+
+    def __init__(self):
+        """Initialize the counters."""
+        self.requests = 0
+        self.bytes_sent = 0
+        self.statuses: Dict[int, int] = {}
+        self.faults: Dict[str, int] = {}
+
+    def count(self, status: int, size: int) -> None:
+        """Record one response."""
+        self.requests += 1
+        self.bytes_sent += size
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def fault(self, kind: str) -> None:
+        """Record an injected fault."""
+        self.faults[kind] = self.faults.get(kind, 0) + 1
+
+    def as_dict(self) -> Dict[str, object]:
+        """Return the counters."""
+        return {
+            "requests": self.requests,
+            "bytes_sent": self.bytes_sent,
+            "statuses": {str(status): n for status, n in sorted(self.statuses.items())},
+            "faults": dict(sorted(self.faults.items())),
+        }
+
+
+class StandInServer:
+    """Serve files the way opendata.chmi.cz does.
+
+    Files are looked up by path relative to the base URL, e.g.
+    ``/now/data/10m-0-20000-0-11450-20240101.json``, first in ``files`` and
+    then in the ``feed``. Responses carry an ETag and honour If-None-Match
+    and open-ended byte ranges.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        feed: Optional[SimulatedFeed] = None,
+        faults: Optional[Faults] = None,
+        seed: int = 0,
+    ):
+        """Initialize the server."""
+        self.host = host
+        self.port = port
+        self.files: Dict[str, bytes] = {}
+        self.feed = feed
+        self.faults = faults or Faults()
+        self.stats = ServerStats()
+        self._rng = random.Random(seed)
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def base_url(self) -> str:
+        """Return the URL to use in place of ``API_BASE_URL``."""
+        return f"http://{self.host}:{self.port}"
+
+    async def async_start(self) -> str:
+        """Start serving and return the base URL."""
+        app = web.Application()
+        app.router.add_get("/{path:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if not self.port:
+            self.port = site._server.sockets[0].getsockname()[1]
+        return self.base_url
+
+    async def async_stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _lookup(self, path: str) -> Optional[bytes]:
+        """Return the file at a path."""
+        body = self.files.get(path)
+        if body is None and self.feed is not None:
+            body = self.feed.lookup(path)
+        return body
+
+    def _roll(self, share: float) -> bool:
+        """Return True for about ``share`` of the calls."""
+        return share > 0 and self._rng.random() < share
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        """Serve one file."""
+        faults = self.faults
+        if faults.latency or faults.jitter:
+            await asyncio.sleep(faults.latency + faults.jitter * self._rng.random())
+
+        if self._roll(faults.errors):
+            self.stats.fault("error")
+            return self._respond(web.Response(status=HTTPStatus.SERVICE_UNAVAILABLE))
+
+        body = self._lookup("/" + request.match_info["path"])
+        if body is not None and self._roll(faults.not_found):
+            self.stats.fault("not_found")
+            body = None
+        if body is None:
+            return self._respond(web.Response(status=HTTPStatus.NOT_FOUND))
+
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            return self._respond(
+                web.Response(status=HTTPStatus.NOT_MODIFIED, headers={"ETag": etag})
+            )
+
+        status = HTTPStatus.OK
+        headers = {"ETag": etag}
+        payload = body
+        range_header = request.headers.get("Range", "")
+        if range_header.startswith("bytes=") and range_header.endswith("-"):
+            start = int(range_header[6:-1])
+            if start >= len(body):
+                return self._respond(
+                    web.Response(
+                        status=HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE,
+                        headers={"Content-Range": f"bytes */{len(body)}"},
+                    )
+                )
+            status = HTTPStatus.PARTIAL_CONTENT
+            headers["Content-Range"] = f"bytes {start}-{len(body) - 1}/{len(body)}"
+            payload = body[start:]
+
+        if self._roll(faults.truncated):
+            # A well-formed response whose document stops half way
+            self.stats.fault("truncated")
+            payload = payload[: len(payload) // 2]
+
+        if self._roll(faults.slow):
+            self.stats.fault("slow")
+            response = web.StreamResponse(status=status, headers=headers)
+            response.content_length = len(payload)
+            await response.prepare(request)
+            for offset in range(0, len(payload), SLOW_CHUNK_SIZE):
+                await asyncio.sleep(faults.slow_delay)
+                await response.write(payload[offset : offset + SLOW_CHUNK_SIZE])
+            await response.write_eof()
+            self.stats.count(status, len(payload))
+            return response
+
+        return self._respond(web.Response(status=status, body=payload, headers=headers))
+
+    def _respond(self, response: web.Response) -> web.Response:
+        """Count a response on its way out."""
+        self.stats.count(response.status, len(response.body or b""))
+        return response
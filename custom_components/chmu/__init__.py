@@ -1,62 +1,154 @@
 """ČHMÚ Weather Integration."""
 
+import asyncio
 import logging
 from datetime import timedelta
+from typing import Dict, Tuple
+
+import aiohttp
+import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
+from homeassistant.const import CONF_ELEVATION, CONF_LATITUDE, CONF_LONGITUDE, Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import (
-    DataUpdateCoordinator,
-    UpdateFailed,
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
+
+from .backfill import BACKFILL_DEFAULT_DAYS
+from .const import (
+    CONF_BACKFILLED,
+    CONF_BASE_URL,
+    CONF_STATION_NAME,
+    DATA_BASE_URL,
+    DATA_HUB,
+    DOMAIN,
+    VIRTUAL_STATION_ID,
 )
-
-from .const import DOMAIN
-from .api import ChmuApi
+from .coordinator import ChmuHub, async_get_hub, entry_stations
+from .metadata import async_get_metadata
+from .services import async_setup_services
+from .virtual import VIRTUAL_STATION_COUNT, VirtualStation
+from .websocket_api import async_setup_websocket_api
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = [Platform.SENSOR]
-SCAN_INTERVAL = timedelta(minutes=10)
+PLATFORMS = [Platform.SENSOR, Platform.WEATHER]
 
+# Stations are set up from the UI; YAML only points the integration at
+# another server, e.g. the stand-in server of the load harness
+CONFIG_SCHEMA = vol.Schema(
+    {DOMAIN: vol.Schema({vol.Optional(CONF_BASE_URL): cv.url})},
+    extra=vol.ALLOW_EXTRA,
+)
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up ČHMÚ Weather from a config entry."""
-    station_id = entry.data["station_id"]
-    station_name = entry.data.get("station_name", f"Station {station_id}")
-
-    api = ChmuApi(station_id, station_name)
-
-    async def async_update_data():
-        """Fetch data from API."""
-        try:
-            return await hass.async_add_executor_job(api.get_current_data)
-        except Exception as err:
-            raise UpdateFailed(f"Error communicating with API: {err}") from err
-
-    coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name=f"ČHMÚ {station_id}",
-        update_method=async_update_data,
-        update_interval=SCAN_INTERVAL,
-    )
 
-    await coordinator.async_config_entry_first_refresh()
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the ČHMÚ Weather integration."""
+    base_url = config.get(DOMAIN, {}).get(CONF_BASE_URL)
+    if base_url is not None:
+        hass.data.setdefault(DOMAIN, {})[DATA_BASE_URL] = base_url.rstrip("/")
+    async_setup_services(hass)
+    async_setup_websocket_api(hass)
+    return True
+
 
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = coordinator
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up ČHMÚ Weather from a config entry."""
+    stations = entry_stations(entry.data)
+
+    hub = async_get_hub(hass)
+    if VIRTUAL_STATION_ID in stations:
+        virtual, station_names = await _async_build_virtual_station(hass, entry)
+        hub.async_add_virtual(VIRTUAL_STATION_ID, virtual, station_names)
+        station_ids = virtual.station_ids
+    else:
+        for station_id, station_name in stations.items():
+            hub.async_add_station(station_id, station_name)
+        station_ids = list(stations)
+
+    try:
+        restored = await hub.async_prepare_stations(station_ids)
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as err:
+        await _async_release(hass, hub, stations)
+        raise ConfigEntryNotReady(f"Error communicating with API: {err}") from err
+
+    hass.data[DOMAIN][entry.entry_id] = hub
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if restored:
+        # Served from the saved snapshot, revalidate without blocking startup
+        hass.async_create_task(hub.async_request_refresh())
+
+    if VIRTUAL_STATION_ID not in stations and not entry.data.get(CONF_BACKFILLED):
+        # Give newly added stations some history right away; tied to the
+        # entry so unloading it cancels the whole batch
+        end = dt_util.utcnow().date() - timedelta(days=1)
+        entry.async_create_background_task(
+            hass,
+            hub.async_backfill_stations(
+                station_ids, end - timedelta(days=BACKFILL_DEFAULT_DAYS - 1), end
+            ),
+            f"{DOMAIN} backfill {entry.title}",
+        )
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_BACKFILLED: True}
+        )
+
     return True
 
 
+async def _async_build_virtual_station(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Tuple[VirtualStation, Dict[str, str]]:
+    """Pick the stations closest to the entry's location to interpolate from."""
+    metadata = async_get_metadata(hass)
+    index = await metadata.async_get_index()
+    nearest = index.nearest(
+        entry.data[CONF_LATITUDE], entry.data[CONF_LONGITUDE], VIRTUAL_STATION_COUNT
+    )
+    if not nearest:
+        raise ConfigEntryNotReady("No stations to interpolate from")
+
+    stations = index.stations
+    virtual = VirtualStation(
+        entry.data.get(CONF_STATION_NAME, "Home"),
+        entry.data.get(CONF_ELEVATION),
+        [
+            (source_id, distance, stations[source_id].get("elevation"))
+            for source_id, distance in nearest
+        ],
+    )
+    _LOGGER.debug("Virtual station interpolated from %s", nearest)
+    return virtual, {source_id: stations[source_id]["name"] for source_id, _ in nearest}
+
+
+async def _async_release(
+    hass: HomeAssistant, hub: ChmuHub, stations: Dict[str, str]
+) -> None:
+    """Drop the subscriptions of an entry's stations.
+
+    The hub is shut down once no entry uses it anymore.
+    """
+    for station_id in stations:
+        if station_id == VIRTUAL_STATION_ID:
+            hub.async_remove_virtual(station_id)
+        else:
+            hub.async_remove_station(station_id)
+    if not hub.station_ids:
+        if hass.data[DOMAIN].get(DATA_HUB) is hub:
+            hass.data[DOMAIN].pop(DATA_HUB)
+        await hub.async_shutdown()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        hub = hass.data[DOMAIN].pop(entry.entry_id)
+        await _async_release(hass, hub, entry_stations(entry.data))
 
     return unload_ok
@@ -0,0 +1,209 @@
+"""Rolling-window aggregates over a station's recent measurements."""
+
+from collections import deque
+from math import atan2, cos, degrees, radians, sin
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .series import StationSeries
+
+# Seconds covered by one 10-minute value
+INTERVAL = 600
+HOUR = 3600
+
+PRECIPITATION_ELEMENT = "SRA10M"
+GUST_ELEMENT = "Fmax"
+DIRECTION_ELEMENT = "D"
+PRESSURE_ELEMENT = "P"
+
+
+class _Window:
+    """Values of one element within the last ``span`` seconds.
+
+    Every value enters and leaves the window once, so keeping an aggregate
+    up to date costs O(1) amortized per new interval. A window only has a
+    value once the element has been seen for its whole span.
+    """
+
+    __slots__ = ("span", "entries", "first")
+
+    def __init__(self, span: int):
+        """Initialize the window."""
+        self.span = span
+        self.entries: Deque[Tuple[int, Any]] = deque()
+        # Timestamp of the first value ever added
+        self.first: Optional[int] = None
+
+    def add(self, timestamp: int, value: float) -> None:
+        """Add the newest value and drop those that fell out of the window."""
+        if self.first is None:
+            self.first = timestamp
+        self._push(timestamp, value)
+        start = timestamp - self.span
+        entries = self.entries
+        while entries and entries[0][0] <= start:
+            self._pop(entries.popleft())
+
+    def complete(self, latest: int) -> bool:
+        """Return if the window ending at ``latest`` is fully covered."""
+        return self.first is not None and self.first <= latest - self.span + INTERVAL
+
+    def _push(self, timestamp: int, value: float) -> None:
+        self.entries.append((timestamp, value))
+
+    def _pop(self, entry: Tuple[int, Any]) -> None:
+        pass
+
+
+class WindowSum(_Window):
+    """Running total of the values in the window."""
+
+    __slots__ = ("total",)
+
+    def __init__(self, span: int):
+        """Initialize the window."""
+        super().__init__(span)
+        self.total = 0.0
+
+    def _push(self, timestamp: int, value: float) -> None:
+        super()._push(timestamp, value)
+        self.total += value
+
+    def _pop(self, entry: Tuple[int, Any]) -> None:
+        self.total -= entry[1]
+
+    @property
+    def value(self) -> float:
+        """Return the total, without the rounding error of the subtractions."""
+        return round(self.total, 2) + 0.0
+
+
+class WindowMax(_Window):
+    """Maximum of the values in the window.
+
+    Only values that can still become the maximum are kept, in decreasing
+    order, so the maximum is always the first entry.
+    """
+
+    __slots__ = ()
+
+    def add(self, timestamp: int, value: float) -> None:
+        """Add the newest value and drop those that fell out of the window."""
+        if self.first is None:
+            self.first = timestamp
+        entries = self.entries
+        while entries and entries[-1][1] <= value:
+            entries.pop()
+        entries.append((timestamp, value))
+        start = timestamp - self.span
+        while entries[0][0] <= start:
+            entries.popleft()
+
+    @property
+    def value(self) -> float:
+        """Return the maximum."""
+        return self.entries[0][1]
+
+
+class WindowDirection(_Window):
+    """Vector mean of the directions in the window, in degrees."""
+
+    __slots__ = ("x", "y")
+
+    def __init__(self, span: int):
+        """Initialize the window."""
+        super().__init__(span)
+        self.x = 0.0
+        self.y = 0.0
+
+    def _push(self, timestamp: int, value: float) -> None:
+        angle = radians(value)
+        x = cos(angle)
+        y = sin(angle)
+        self.entries.append((timestamp, (x, y)))
+        self.x += x
+        self.y += y
+
+    def _pop(self, entry: Tuple[int, Any]) -> None:
+        self.x -= entry[1][0]
+        self.y -= entry[1][1]
+
+    @property
+    def value(self) -> Optional[float]:
+        """Return the mean direction, None when the directions cancel out."""
+        if abs(self.x) < 1e-9 and abs(self.y) < 1e-9:
+            return None
+        return round(degrees(atan2(self.y, self.x)), 1) % 360
+
+
+class WindowDelta(_Window):
+    """Change of the value over the window, e.g. a pressure tendency.
+
+    Besides the values in the window, the last value at or before its start
+    is kept as the reference the change is measured from.
+    """
+
+    __slots__ = ()
+
+    def add(self, timestamp: int, value: float) -> None:
+        """Add the newest value and drop those older than the reference."""
+        if self.first is None:
+            self.first = timestamp
+        entries = self.entries
+        entries.append((timestamp, value))
+        start = timestamp - self.span
+        while len(entries) > 1 and entries[1][0] <= start:
+            entries.popleft()
+
+    def complete(self, latest: int) -> bool:
+        """Return if there is a reference value from the window start."""
+        return self.first is not None and self.first <= latest - self.span
+
+    @property
+    def value(self) -> float:
+        """Return the newest value minus the reference value."""
+        return round(self.entries[-1][1] - self.entries[0][1], 1) + 0.0
+
+
+class StationAggregates:
+    """Derived rolling values of one station.
+
+    ``update`` only reads the entries appended to the series since the
+    previous call.
+    """
+
+    def __init__(self):
+        """Initialize the aggregates."""
+        # Result key, element and window
+        self._windows: List[Tuple[str, str, _Window]] = [
+            ("precipitation_1h", PRECIPITATION_ELEMENT, WindowSum(HOUR)),
+            ("precipitation_3h", PRECIPITATION_ELEMENT, WindowSum(3 * HOUR)),
+            ("precipitation_24h", PRECIPITATION_ELEMENT, WindowSum(24 * HOUR)),
+            ("wind_gust_max_1h", GUST_ELEMENT, WindowMax(HOUR)),
+            ("wind_direction_mean_1h", DIRECTION_ELEMENT, WindowDirection(HOUR)),
+            ("pressure_tendency_3h", PRESSURE_ELEMENT, WindowDelta(3 * HOUR)),
+        ]
+        # Newest timestamp read per element
+        self._cursors: Dict[str, int] = {}
+
+    def update(self, series: StationSeries) -> Dict[str, Any]:
+        """Add new measurements and return the values of complete windows."""
+        for element in {element for _, element, _ in self._windows}:
+            element_series = series.get(element)
+            if element_series is None:
+                continue
+            cursor = self._cursors.get(element)
+            entries = (
+                element_series.since(cursor) if cursor is not None else element_series
+            )
+            for timestamp, value in entries:
+                for _, window_element, window in self._windows:
+                    if window_element == element:
+                        window.add(timestamp, value)
+                self._cursors[element] = timestamp
+
+        values = {}
+        for key, element, window in self._windows:
+            latest = self._cursors.get(element)
+            if latest is not None and window.complete(latest):
+                values[key] = window.value
+        return values
@@ -1,241 +1,517 @@
 """API client for ČHMÚ Weather."""
 
+import asyncio
+import contextlib
 import logging
-from datetime import datetime
-from typing import Any, Dict, Optional
+import time
+from datetime import date, datetime, timedelta, timezone
+from http import HTTPStatus
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
 
-import requests
+import aiohttp
 
+from homeassistant.util import dt as dt_util
+
+from .aggregates import StationAggregates
 from .const import API_BASE_URL, API_METADATA_PATH, API_NOW_PATH
+from .elements import ELEMENTS
+from .governor import PRIORITY_BACKGROUND, PRIORITY_LIVE, RequestGovernor
+from .nowcast import StationNowcast
+from .parser import RowStream, StationParser
+from .series import StationSeries
+from .stats import StationStats
 
 _LOGGER = logging.getLogger(__name__)
 
-
-def get_stations() -> Dict[str, str]:
-    """Fetch available stations from ČHMÚ metadata."""
-    session = requests.Session()
-    session.headers.update({"User-Agent": "Home-Assistant-CHMU-Integration/1.0"})
-
-    # Try today's metadata first
-    date_str = datetime.now().strftime("%Y%m%d")
+HEADERS = {"User-Agent": "Home-Assistant-CHMU-Integration/1.0"}
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=30)
+CHUNK_SIZE = 64 * 1024
+# Returned when a conditional request found the file unchanged
+NOT_MODIFIED = object()
+# How long after midnight yesterday's file stands in for today's missing one
+PREVIOUS_DAY_GRACE = timedelta(hours=1)
+
+
+async def _async_fetch_metadata_values(
+    session: aiohttp.ClientSession,
+    base_url: str,
+    governor: Optional[RequestGovernor] = None,
+    priority: int = PRIORITY_BACKGROUND,
+) -> List[list]:
+    """Fetch today's professional station metadata rows.
+
+    The metadata file is several megabytes, so it is parsed as it arrives
+    and only rows of professional stations are kept.
+    """
+    # Named by the UTC day, like the data files
+    date_str = dt_util.utcnow().strftime("%Y%m%d")
     filename = f"meta1-{date_str}.json"
-    url = f"{API_BASE_URL}{API_METADATA_PATH}/{filename}"
-
-    _LOGGER.info(f"Fetching stations from: {url}")
-
-    try:
-        response = session.get(url, timeout=30)
+    url = f"{base_url}{API_METADATA_PATH}/{filename}"
+
+    _LOGGER.debug("Fetching stations from: %s", url)
+
+    slot = governor.slot(priority) if governor is not None else contextlib.nullcontext()
+    async with (
+        slot,
+        session.get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT) as response,
+    ):
+        if governor is not None:
+            governor.observe(response.status, response.headers.get("Retry-After"))
+        if response.status == HTTPStatus.NOT_FOUND:
+            raise ValueError(f"Metadata file not found: {filename}")
         response.raise_for_status()
-        metadata = response.json()
-
-        stations = {}
-        values = metadata.get("data", {}).get("data", {}).get("values", [])
-
-        _LOGGER.info(f"Got {len(values)} total entries from metadata")
 
-        for station in values:
-            if len(station) < 3:
-                continue
-
-            wsi = station[0]  # e.g., "0-20000-0-11450"
-            full_name = station[2]  # e.g., "Plzeň, Mikulka"
+        stream = RowStream()
+        values = []
+        total = 0
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            rows = stream.feed(chunk)
+            total += len(rows)
+            values.extend(row for row in rows if _is_professional(row))
+        rows = stream.close()
+        total += len(rows)
+        values.extend(row for row in rows if _is_professional(row))
+
+    _LOGGER.debug("Got %s total entries from metadata", total)
+    return values
+
+
+def _is_professional(row: list) -> bool:
+    """Return if a metadata row describes a professional station (0-20000-0-11*)."""
+    return bool(row) and isinstance(row[0], str) and row[0].startswith("0-20000-0-11")
+
+
+# Used when the metadata cannot be fetched and nothing is cached
+FALLBACK_STATIONS = {
+    "11450": {
+        "name": "Plzeň, Mikulka",
+        "latitude": 49.764722,
+        "longitude": 13.378889,
+        "elevation": 360.0,
+    },
+    "11518": {
+        "name": "Praha-Ruzyně",
+        "latitude": 50.1008,
+        "longitude": 14.26,
+        "elevation": 364.0,
+    },
+    "11782": {
+        "name": "Brno-Tuřany",
+        "latitude": 49.1513,
+        "longitude": 16.6944,
+        "elevation": 241.0,
+    },
+}
+
+
+async def async_fetch_stations_with_coords(
+    session: aiohttp.ClientSession,
+    base_url: str = API_BASE_URL,
+    governor: Optional[RequestGovernor] = None,
+    priority: int = PRIORITY_BACKGROUND,
+) -> Dict[str, Dict[str, Any]]:
+    """Fetch available stations with coordinates from ČHMÚ metadata.
 
-            # Only include professional stations (0-20000-0-11*)
-            if not wsi or not wsi.startswith("0-20000-0-11"):
-                continue
+    Returns:
+        Dict mapping station ID to station info with name, latitude, longitude
+        and elevation in meters.
+    """
+    values = await _async_fetch_metadata_values(session, base_url, governor, priority)
 
-            # Extract WMO_ID from WSI (last part after last dash)
-            if full_name:
-                wmo_id = wsi.split("-")[-1]
-                stations[wmo_id] = full_name
+    stations = {}
+    for station in values:
+        # Format: [WSI, GH_ID, FULL_NAME, GEOGR1, GEOGR2,
+        #          ELEVATION, BEGIN_DATE]
+        if len(station) < 5:
+            continue
 
-        _LOGGER.info(f"Found {len(stations)} stations")
-        return stations
-    except Exception as e:
-        _LOGGER.exception(f"Failed to fetch stations: {e}")
-        # Fallback to a basic set
-        return {
-            "11450": "Plzeň, Mikulka",
-            "11518": "Praha-Ruzyně",
-            "11782": "Brno-Tuřany",
-        }
+        wsi = station[0]  # e.g., "0-20000-0-11450"
+        full_name = station[2]  # e.g., "Plzeň, Mikulka"
+        longitude = station[3]  # GEOGR1
+        latitude = station[4]  # GEOGR2
+        elevation = station[5] if len(station) > 5 else None
 
+        # Skip stations without coordinates
+        if not longitude or not latitude:
+            continue
 
-def get_stations_with_coords() -> Dict[str, Dict[str, Any]]:
-    """Fetch available stations with coordinates from ČHMÚ metadata.
+        # Extract WMO_ID from WSI (last part after last dash)
+        if full_name:
+            wmo_id = wsi.split("-")[-1]
+            stations[wmo_id] = {
+                "name": full_name,
+                "latitude": float(latitude),
+                "longitude": float(longitude),
+                "elevation": float(elevation) if elevation not in (None, "") else None,
+            }
 
-    Returns:
-        Dict mapping station ID to station info with name, latitude, longitude.
-    """
-    session = requests.Session()
-    session.headers.update({"User-Agent": "Home-Assistant-CHMU-Integration/1.0"})
+    if not stations:
+        raise ValueError("No stations found in metadata")
 
-    # Try today's metadata first
-    date_str = datetime.now().strftime("%Y%m%d")
-    filename = f"meta1-{date_str}.json"
-    url = f"{API_BASE_URL}{API_METADATA_PATH}/{filename}"
+    _LOGGER.debug("Found %s stations with coordinates", len(stations))
+    return stations
 
-    _LOGGER.info(f"Fetching stations with coordinates from: {url}")
 
-    try:
-        response = session.get(url, timeout=30)
-        response.raise_for_status()
-        metadata = response.json()
+class FetchResult(NamedTuple):
+    """Outcome of a (possibly conditional or partial) request."""
 
-        stations = {}
-        values = metadata.get("data", {}).get("data", {}).get("values", [])
+    status: int
+    payload: Any
+    validators: Dict[str, str]
 
-        _LOGGER.info(f"Got {len(values)} total entries from metadata")
 
-        for station in values:
-            # Format: [WSI, GH_ID, FULL_NAME, GEOGR1, GEOGR2,
-            #          ELEVATION, BEGIN_DATE]
-            if len(station) < 5:
-                continue
+class ChmuClient:
+    """Shared HTTP client that merges concurrent requests for the same file.
 
-            wsi = station[0]  # e.g., "0-20000-0-11450"
-            full_name = station[2]  # e.g., "Plzeň, Mikulka"
-            longitude = station[3]  # GEOGR1
-            latitude = station[4]  # GEOGR2
+    Every request goes through the ``governor``, which limits the rate and
+    concurrency and backs off while the server is failing.
+    """
 
-            # Only include professional stations (0-20000-0-11*)
-            if not wsi or not wsi.startswith("0-20000-0-11"):
-                continue
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        base_url: str = API_BASE_URL,
+        governor: Optional[RequestGovernor] = None,
+    ):
+        """Initialize the client.
 
-            # Skip stations without coordinates
-            if not longitude or not latitude:
+        ``base_url`` replaces the opendata server, e.g. with a local stand-in.
+        """
+        self.session = session
+        self.base_url = base_url.rstrip("/")
+        self.governor = governor if governor is not None else RequestGovernor()
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+
+    async def async_fetch(
+        self,
+        url: str,
+        validators: Optional[Dict[str, str]] = None,
+        start: Optional[int] = None,
+        reader: Optional[Callable[[aiohttp.ClientResponse], Awaitable[Any]]] = None,
+        priority: int = PRIORITY_LIVE,
+    ) -> FetchResult:
+        """Fetch a file, joining an identical request already in flight.
+
+        ``validators`` are the conditional request headers returned by a
+        previous fetch of the same URL; the server may then answer 304.
+        ``start`` requests only the bytes from that offset on; the server
+        answers 206 if it supports ranges and 200 with the full file if not.
+        ``reader`` consumes a successful response body as it streams in; its
+        return value becomes the payload. Without it the raw bytes are read.
+        ``priority`` orders the request against others waiting for a slot.
+        """
+        key = (url, tuple(sorted((validators or {}).items())), start, reader)
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(
+                self._async_fetch(url, validators, start, reader, priority)
+            )
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one cancelled caller does not cancel the request for the others
+        return await asyncio.shield(future)
+
+    async def _async_fetch(
+        self,
+        url: str,
+        validators: Optional[Dict[str, str]],
+        start: Optional[int],
+        reader: Optional[Callable[[aiohttp.ClientResponse], Awaitable[Any]]],
+        priority: int,
+    ) -> FetchResult:
+        """Perform a single GET request."""
+        headers = {**HEADERS, **(validators or {})}
+        if start is not None:
+            # Byte offsets refer to the uncompressed file
+            headers["Range"] = f"bytes={start}-"
+            headers["Accept-Encoding"] = "identity"
+
+        governor = self.governor
+        async with (
+            governor.slot(priority),
+            self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT) as response,
+        ):
+            governor.observe(response.status, response.headers.get("Retry-After"))
+            if response.status in (
+                HTTPStatus.NOT_MODIFIED,
+                HTTPStatus.NOT_FOUND,
+                HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE,
+            ):
+                return FetchResult(response.status, None, validators or {})
+            response.raise_for_status()
+            if reader is not None:
+                payload = await reader(response)
+            else:
+                payload = await response.read()
+
+            new_validators = {}
+            if etag := response.headers.get("ETag"):
+                new_validators["If-None-Match"] = etag
+            if last_modified := response.headers.get("Last-Modified"):
+                new_validators["If-Modified-Since"] = last_modified
+            return FetchResult(response.status, payload, new_validators)
+
+
+class DailyFile:
+    """Download state of one station's 10-minute file for one UTC day."""
+
+    def __init__(
+        self,
+        station_id: str,
+        day: date,
+        series: StationSeries,
+        base_url: str = API_BASE_URL,
+        stats: Optional[StationStats] = None,
+    ):
+        """Initialize the file state."""
+        self.day = day
+        # Format: 10m-0-20000-0-{station_id}-{YYYYMMDD}.json
+        self.filename = f"10m-0-20000-0-{station_id}-{day.strftime('%Y%m%d')}.json"
+        self.url = f"{base_url}{API_NOW_PATH}/{self.filename}"
+        self.parser = StationParser(station_id, series)
+        self.stats = stats
+        # Set once the file was read, to answer 304 Not Modified responses
+        self.fetched = False
+        self.validators: Dict[str, str] = {}
+
+    def reset(self) -> None:
+        """Forget what was read, e.g. after a failed or inconsistent read."""
+        self.parser.reset()
+        self.fetched = False
+        self.validators = {}
+
+    async def async_read_rows(self, response: aiohttp.ClientResponse) -> None:
+        """Stream the file, or the tail of it, into the parser."""
+        parser = self.parser
+        stats = self.stats
+        parser.begin(partial=response.status == HTTPStatus.PARTIAL_CONTENT)
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            if stats is None:
+                parser.feed(chunk)
                 continue
-
-            # Extract WMO_ID from WSI (last part after last dash)
-            if full_name:
-                wmo_id = wsi.split("-")[-1]
-                stations[wmo_id] = {
-                    "name": full_name,
-                    "latitude": float(latitude),
-                    "longitude": float(longitude),
-                }
-
-        _LOGGER.info(f"Found {len(stations)} stations with coordinates")
-        return stations
-    except Exception as e:
-        _LOGGER.exception(f"Failed to fetch stations with coordinates: {e}")
-        # Fallback to a basic set with approximate coordinates
-        return {
-            "11450": {
-                "name": "Plzeň, Mikulka",
-                "latitude": 49.764722,
-                "longitude": 13.378889,
-            },
-            "11518": {
-                "name": "Praha-Ruzyně",
-                "latitude": 50.1008,
-                "longitude": 14.26,
-            },
-            "11782": {
-                "name": "Brno-Tuřany",
-                "latitude": 49.1513,
-                "longitude": 16.6944,
-            },
-        }
+            rows = parser.rows_parsed
+            start = time.perf_counter()
+            parser.feed(chunk)
+            stats.add_chunk(
+                len(chunk), parser.rows_parsed - rows, time.perf_counter() - start
+            )
+        parser.close()
 
 
 class ChmuApi:
-    """API client for ČHMÚ weather data."""
+    """API client for ČHMÚ weather data.
+
+    Daily files are named by their UTC date. Right after midnight the new
+    file does not exist yet or has no rows, so the previous day's file stays
+    authoritative until the new one has data. Until then each refresh only
+    probes the new file, which costs a 404 or a tiny body.
+    """
 
-    def __init__(self, station_id: str, station_name: Optional[str] = None):
+    def __init__(
+        self,
+        client: ChmuClient,
+        station_id: str,
+        station_name: Optional[str] = None,
+    ):
         """Initialize the API client."""
+        self.client = client
         self.station_id = station_id
         self.station_name = station_name or f"Station {station_id}"
-        self.session = requests.Session()
-        self.session.headers.update(
-            {"User-Agent": "Home-Assistant-CHMU-Integration/1.0"}
+        # Recent measurements of every element, across daily files
+        self.series = StationSeries()
+        self.aggregates = StationAggregates()
+        self.nowcast = StationNowcast()
+        self.stats = StationStats()
+        self._current: Optional[DailyFile] = None
+        self._result: Optional[Dict[str, Any]] = None
+
+    async def async_get_current_data(self) -> Dict[str, Any]:
+        """Get current weather data from ČHMÚ."""
+        stats = self.stats
+        stats.start_refresh()
+        start = time.perf_counter()
+        try:
+            result = await self._async_get_current_data()
+        except Exception as err:
+            if isinstance(err, aiohttp.ClientResponseError):
+                # Error responses are raised before they can be counted
+                stats.add_response(err.status)
+            stats.end_refresh(time.perf_counter() - start, dt_util.utcnow(), error=err)
+            raise
+        latest = self.series.latest_time()
+        stats.end_refresh(
+            time.perf_counter() - start,
+            dt_util.utcnow(),
+            datetime.fromtimestamp(latest, timezone.utc) if latest else None,
         )
+        return result
 
-    def get_current_data(self) -> Dict[str, Any]:
-        """Get current weather data from ČHMÚ."""
-        now = datetime.now()
+    async def _async_get_current_data(self) -> Dict[str, Any]:
+        """Bring the authoritative daily file up to date.
 
-        data = self._fetch_10min_data(now)
-        if not data:
-            raise ValueError(f"No data available for station {self.station_id}")
-        return data
+        Yesterday's file is only served in place of today's for
+        ``PREVIOUS_DAY_GRACE`` after midnight; a station that publishes
+        nothing today becomes unavailable after that.
+        """
+        now = dt_util.utcnow()
+        today = now.date()
+        in_grace = (
+            now - now.replace(hour=0, minute=0, second=0, microsecond=0)
+            <= PREVIOUS_DAY_GRACE
+        )
+        current = self._current
+
+        if current is None or current.day > today:
+            # Read yesterday's file first so the rolling windows start full
+            previous = self._daily_file(today - timedelta(days=1))
+            try:
+                have_previous = await self._async_refresh_file(previous, probe=True)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                _LOGGER.debug("Cannot read %s: %s", previous.filename, err)
+                have_previous = False
+
+            # Start with today's file, or yesterday's right after midnight
+            daily = self._daily_file(today)
+            if await self._async_refresh_file(daily, probe=True):
+                self._current = daily
+                return self._result
+            if have_previous and in_grace:
+                self._current = previous
+                return self._result
+        else:
+            if current.day < today:
+                daily = self._daily_file(today)
+                if await self._async_refresh_file(daily, probe=True):
+                    _LOGGER.debug("Switched to new daily file: %s", daily.filename)
+                    self._current = daily
+                    return self._result
+                if not in_grace:
+                    raise ValueError(
+                        f"No data published today for station {self.station_id}"
+                    )
+            # Keep serving the authoritative file until the next one has data
+            if await self._async_refresh_file(current):
+                return self._result
+
+        raise ValueError(f"No data available for station {self.station_id}")
+
+    def _daily_file(self, day: date) -> DailyFile:
+        """Return the download state of a new daily file."""
+        return DailyFile(
+            self.station_id, day, self.series, self.client.base_url, self.stats
+        )
 
-    def _fetch_10min_data(self, date: datetime) -> Optional[Dict[str, Any]]:
-        """Fetch 10-minute interval data for a specific date."""
-        # Format: 10m-0-20000-0-{station_id}-{YYYYMMDD}.json
-        date_str = date.strftime("%Y%m%d")
-        filename = f"10m-0-20000-0-{self.station_id}-{date_str}.json"
-        url = f"{API_BASE_URL}{API_NOW_PATH}/{filename}"
+    async def _async_refresh_file(self, daily: DailyFile, probe: bool = False) -> bool:
+        """Bring a daily file up to date and build the result from it.
 
-        _LOGGER.debug(f"Fetching data from: {url}")
+        Returns False when the file does not exist. With ``probe`` a file
+        without any rows also returns False instead of raising.
+        """
+        _LOGGER.debug("Fetching data from: %s", daily.url)
 
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-
-            json_data = response.json()
-            return self._parse_chmu_data(json_data)
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 404:
-                _LOGGER.debug(f"Data file not found: {filename}")
-                return None
+            found = await self._async_read_file(daily)
+        except ValueError:
+            daily.reset()
+            if probe:
+                _LOGGER.debug("Data file has no data yet: %s", daily.filename)
+                return False
+            raise
+        except BaseException:
+            # A half-read file leaves the parser in an unknown state
+            daily.reset()
             raise
 
-    def _parse_chmu_data(self, json_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Parse CHMU JSON data format.
+        if not found:
+            _LOGGER.debug("Data file not found: %s", daily.filename)
+            return False
+        if found is not NOT_MODIFIED or self._result is None:
+            self._result = self._parse_chmu_data(self.series)
+        return True
 
-        Data format:
-        Array of [station_id, element, timestamp, value, flag, quality]
+    async def _async_read_file(self, daily: DailyFile) -> Any:
+        """Download what is new in a daily file.
 
-        Elements:
-        T (temp), H (humidity), P (pressure), SRA10M (precip),
-        F (wind speed), D (wind dir)
+        Returns False if the file does not exist, NOT_MODIFIED if nothing
+        changed since the last read and True otherwise.
         """
-        values = json_data.get("data", {}).get("data", {}).get("values", [])
-
-        if not values:
-            raise ValueError("No data values found in response")
-
-        # Get the most recent values for each element
-        latest_values = {}
-        for row in values:
-            if len(row) < 4:
-                continue
-
-            station_id = row[0]
-            element = row[1]
-            timestamp = row[2]
-            value = row[3]
-
-            # Only process our station's data
-            if not station_id.endswith(self.station_id):
-                continue
+        parser = daily.parser
+        try:
+            if daily.fetched and parser.offset is not None:
+                # Only download what was appended since the last refresh
+                response = await self.client.async_fetch(
+                    daily.url,
+                    daily.validators,
+                    start=parser.offset,
+                    reader=daily.async_read_rows,
+                )
+            else:
+                response = await self.client.async_fetch(
+                    daily.url,
+                    daily.validators if daily.fetched else None,
+                    reader=daily.async_read_rows,
+                )
+        except ValueError as err:
+            if not daily.fetched:
+                raise
+            _LOGGER.debug("Cannot append to %s, refetching: %s", daily.filename, err)
+            response = None
+
+        if response is not None:
+            self.stats.add_response(response.status)
+            if response.status == HTTPStatus.NOT_MODIFIED and daily.fetched:
+                _LOGGER.debug("Data file not modified: %s", daily.filename)
+                return NOT_MODIFIED
+            if response.status == HTTPStatus.NOT_FOUND:
+                return False
+            if response.status != HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE:
+                daily.fetched = True
+                daily.validators = response.validators
+                return True
+
+        # The file was rewritten rather than appended to
+        daily.reset()
+        response = await self.client.async_fetch(
+            daily.url, reader=daily.async_read_rows
+        )
+        self.stats.add_response(response.status)
+        if response.status == HTTPStatus.NOT_FOUND:
+            return False
+        # Do not try ranges on this file again
+        parser.offset = None
+        daily.fetched = True
+        daily.validators = response.validators
+        return True
+
+    def _parse_chmu_data(self, series: StationSeries) -> Dict[str, Any]:
+        """Map the latest CHMU element values to sensor values.
 
-            # Keep only the latest value for each element
-            if (
-                element not in latest_values
-                or timestamp > latest_values[element]["timestamp"]
-            ):
-                latest_values[element] = {"value": value, "timestamp": timestamp}
+        Data format:
+        Array of [station_id, element, timestamp, value, flag, quality]
 
-        if not latest_values:
+        Every element known to ``ELEMENTS`` that the station reports is
+        included under its sensor key, e.g. T (temp) as ``temperature``,
+        followed by the rolling aggregates of the station.
+        """
+        if not series:
             raise ValueError(f"No data found for station {self.station_id}")
 
-        # Map CHMU elements to our sensor values
-        timestamp = latest_values.get("T", {}).get(
-            "timestamp", datetime.now().isoformat()
-        )
-
-        result = {
-            "temperature": latest_values.get("T", {}).get("value"),
-            "humidity": latest_values.get("H", {}).get("value"),
-            "pressure": latest_values.get("P", {}).get("value"),
-            "precipitation": latest_values.get("SRA10M", {}).get("value", 0),
-            "wind_speed": latest_values.get("F", {}).get("value"),
-            "wind_direction": latest_values.get("D", {}).get("value"),
-            "station_name": self.station_name,
-            "timestamp": timestamp,
-        }
-
-        _LOGGER.debug(f"Parsed data: {result}")
+        result: Dict[str, Any] = {}
+        for element, element_series in series.elements.items():
+            info = ELEMENTS.get(element)
+            latest = element_series.latest()
+            if info is not None and latest is not None:
+                result[info.key] = latest[1]
+        result.setdefault("precipitation", 0)
+        result.update(self.aggregates.update(series))
+        self.nowcast.update(series)
+
+        result["station_name"] = self.station_name
+        # Measurement time of the newest element, whichever it is
+        result["timestamp"] = datetime.fromtimestamp(
+            series.latest_time(), timezone.utc
+        ).isoformat()
+
+        # Lazy formatting, the result is only rendered when debug is enabled
+        _LOGGER.debug("Parsed data: %s", result)
         return result
@@ -0,0 +1,298 @@
+"""Backfill of long-term statistics from historical ČHMÚ daily files."""
+
+import asyncio
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+
+from homeassistant.components.recorder import DOMAIN as RECORDER_DOMAIN, get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    StatisticsRow,
+    async_add_external_statistics,
+    async_import_statistics,
+    get_last_statistics,
+    statistics_during_period,
+)
+from homeassistant.const import (
+    PERCENTAGE,
+    UnitOfPrecipitationDepth,
+    UnitOfPressure,
+    UnitOfSpeed,
+    UnitOfTemperature,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from .api import CHUNK_SIZE, ChmuClient
+from .const import API_NOW_PATH, DOMAIN
+from .governor import PRIORITY_BACKGROUND
+from .parser import RowStream
+from .series import parse_timestamp
+
+_LOGGER = logging.getLogger(__name__)
+
+# Daily files downloaded at the same time
+BACKFILL_CONCURRENCY = 4
+# Days imported when a station is set up for the first time
+BACKFILL_DEFAULT_DAYS = 7
+BACKFILL_MAX_DAYS = 366
+
+# Elements imported as hourly mean/min/max into the sensor's own statistics
+MEAN_ELEMENTS = {
+    "T": ("temperature", UnitOfTemperature.CELSIUS),
+    "H": ("humidity", PERCENTAGE),
+    "P": ("pressure", UnitOfPressure.HPA),
+    "F": ("wind_speed", UnitOfSpeed.METERS_PER_SECOND),
+    "SRA10M": ("precipitation", UnitOfPrecipitationDepth.MILLIMETERS),
+}
+# Also imported as hourly totals into an external sum statistic
+PRECIPITATION_ELEMENT = "SRA10M"
+
+
+class HourlyAggregate:
+    """Running count, total, minimum and maximum of one hour."""
+
+    __slots__ = ("count", "total", "min", "max")
+
+    def __init__(self, value: float):
+        """Start the aggregate with its first value."""
+        self.count = 1
+        self.total = value
+        self.min = value
+        self.max = value
+
+    def merge(self, other: "HourlyAggregate") -> None:
+        """Add the values of another aggregate of the same hour."""
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def add(self, value: float) -> None:
+        """Add a value."""
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+
+# Hour start in epoch seconds to aggregate, per element
+HourlyData = Dict[str, Dict[int, HourlyAggregate]]
+
+
+def _aggregate(rows: List[list], station_id: str, hours: HourlyData) -> None:
+    """Add rows of a daily file to the hourly aggregates."""
+    for row in rows:
+        if len(row) < 4 or not row[0].endswith(station_id):
+            continue
+        element = row[1]
+        value = row[3]
+        if element not in MEAN_ELEMENTS or not isinstance(value, (int, float)):
+            continue
+        # A 10-minute value covers the interval ending at its timestamp
+        hour = (parse_timestamp(row[2]) - 1) // 3600 * 3600
+        by_hour = hours.setdefault(element, {})
+        if hour in by_hour:
+            by_hour[hour].add(value)
+        else:
+            by_hour[hour] = HourlyAggregate(value)
+
+
+async def _async_fetch_day(
+    client: ChmuClient,
+    semaphore: asyncio.Semaphore,
+    station_id: str,
+    day: date,
+) -> Optional[HourlyData]:
+    """Download one daily file and aggregate it by hour as it streams in."""
+    filename = f"10m-0-20000-0-{station_id}-{day.strftime('%Y%m%d')}.json"
+    url = f"{client.base_url}{API_NOW_PATH}/{filename}"
+
+    async def async_read(response: aiohttp.ClientResponse) -> HourlyData:
+        stream = RowStream()
+        hours: HourlyData = {}
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            _aggregate(stream.feed(chunk), station_id, hours)
+        _aggregate(stream.close(), station_id, hours)
+        return hours
+
+    async with semaphore:
+        try:
+            response = await client.async_fetch(
+                url, reader=async_read, priority=PRIORITY_BACKGROUND
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as err:
+            _LOGGER.warning("Skipping %s in backfill: %s", filename, err)
+            return None
+
+    if response.status == HTTPStatus.NOT_FOUND:
+        _LOGGER.debug("Data file not found: %s", filename)
+        return None
+    return response.payload
+
+
+async def _async_stored_sum(
+    hass: HomeAssistant, statistic_id: str, first: int
+) -> Tuple[float, List[StatisticsRow]]:
+    """Return the stored sum before hour ``first`` and the rows from it on.
+
+    Only reads the whole statistic when the import overlaps or precedes
+    rows stored earlier.
+    """
+    instance = get_instance(hass)
+    last = await instance.async_add_executor_job(
+        get_last_statistics, hass, 1, statistic_id, False, {"sum"}
+    )
+    if not last.get(statistic_id):
+        return 0.0, []
+    if last[statistic_id][0]["start"] < first:
+        return last[statistic_id][0].get("sum") or 0.0, []
+
+    stored = await instance.async_add_executor_job(
+        statistics_during_period,
+        hass,
+        datetime.fromtimestamp(0, timezone.utc),
+        None,
+        {statistic_id},
+        "hour",
+        None,
+        {"state", "sum"},
+    )
+    rows = stored.get(statistic_id, [])
+    before = [row for row in rows if row["start"] < first]
+    return (
+        (before[-1].get("sum") or 0.0) if before else 0.0,
+        [row for row in rows if row["start"] >= first],
+    )
+
+
+async def async_backfill_station(
+    hass: HomeAssistant,
+    client: ChmuClient,
+    station_id: str,
+    station_name: str,
+    start: date,
+    end: date,
+) -> int:
+    """Import hourly statistics of a station for the given range of days.
+
+    Temperature, humidity, pressure, wind speed and precipitation are
+    imported as hourly mean/min/max into the statistics of the station's
+    sensors, matching what the recorder compiles for them. The precipitation
+    sensor reports 10-minute amounts, so its mean is not a total; hourly
+    totals are also imported into an external ``chmu:<station>_precipitation``
+    sum statistic for graphs of accumulated precipitation. Its sum continues
+    from the rows stored before the range, and rows stored after it are
+    shifted to stay continuous.
+
+    Returns the number of hours imported.
+    """
+    count = (end - start).days + 1
+    _LOGGER.info("Backfilling %s days of station %s", count, station_id)
+
+    # The first value of a file closes the last hour of the previous day, so
+    # the day after the range is read too and only whole hours are kept
+    days = [start + timedelta(days=n) for n in range(count + 1)]
+    semaphore = asyncio.Semaphore(BACKFILL_CONCURRENCY)
+    results = await asyncio.gather(
+        *(_async_fetch_day(client, semaphore, station_id, day) for day in days)
+    )
+
+    range_start = int(datetime.combine(start, time.min, timezone.utc).timestamp())
+    range_stop = range_start + count * 86400
+    hours: HourlyData = {}
+    for result in results:
+        for element, by_hour in (result or {}).items():
+            merged = hours.setdefault(element, {})
+            for hour, aggregate in by_hour.items():
+                if not range_start <= hour < range_stop:
+                    continue
+                if hour in merged:
+                    merged[hour].merge(aggregate)
+                else:
+                    merged[hour] = aggregate
+
+    registry = er.async_get(hass)
+    imported = 0
+    for element, (key, unit) in MEAN_ELEMENTS.items():
+        by_hour = hours.get(element)
+        entity_id = registry.async_get_entity_id(
+            "sensor", DOMAIN, f"{station_id}_{key}"
+        )
+        if not by_hour or entity_id is None:
+            continue
+        statistics = [
+            StatisticData(
+                start=datetime.fromtimestamp(hour, timezone.utc),
+                mean=aggregate.total / aggregate.count,
+                min=aggregate.min,
+                max=aggregate.max,
+            )
+            for hour, aggregate in sorted(by_hour.items())
+        ]
+        async_import_statistics(
+            hass,
+            StatisticMetaData(
+                has_mean=True,
+                has_sum=False,
+                name=None,
+                source=RECORDER_DOMAIN,
+                statistic_id=entity_id,
+                unit_of_measurement=unit,
+            ),
+            statistics,
+        )
+        imported += len(statistics)
+
+    if by_hour := hours.get(PRECIPITATION_ELEMENT):
+        statistic_id = f"{DOMAIN}:{station_id}_precipitation"
+        ordered = sorted(by_hour.items())
+        first, last = ordered[0][0], ordered[-1][0]
+        # Continue the sum of what was imported before the range
+        total, stored = await _async_stored_sum(hass, statistic_id, first)
+        previous = total
+        statistics = []
+        for hour, aggregate in ordered:
+            total += aggregate.total
+            statistics.append(
+                StatisticData(
+                    start=datetime.fromtimestamp(hour, timezone.utc),
+                    state=aggregate.total,
+                    sum=total,
+                )
+            )
+        # Rows imported earlier for later hours were summed on top of the
+        # old values of this range; shift them by the difference
+        for row in stored:
+            if row["start"] <= last:
+                previous = row.get("sum") or 0.0
+                continue
+            statistics.append(
+                StatisticData(
+                    start=datetime.fromtimestamp(row["start"], timezone.utc),
+                    state=row.get("state"),
+                    sum=(row.get("sum") or 0.0) + total - previous,
+                )
+            )
+        async_add_external_statistics(
+            hass,
+            StatisticMetaData(
+                has_mean=False,
+                has_sum=True,
+                name=f"{station_name} precipitation",
+                source=DOMAIN,
+                statistic_id=statistic_id,
+                unit_of_measurement=UnitOfPrecipitationDepth.MILLIMETERS,
+            ),
+            statistics,
+        )
+        imported += len(ordered)
+
+    _LOGGER.info("Backfilled %s hourly statistics of station %s", imported, station_id)
+    return imported
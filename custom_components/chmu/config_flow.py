@@ -1,69 +1,37 @@
 """Config flow for ČHMÚ Weather integration."""
 
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import voluptuous as vol
 
 from homeassistant import config_entries
+from homeassistant.const import CONF_ELEVATION, CONF_LATITUDE, CONF_LONGITUDE
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import selector
 
-from .api import get_stations_with_coords
-from .const import CONF_STATION_ID, CONF_STATION_NAME, DOMAIN
+from .const import (
+    CONF_RADIUS,
+    CONF_STATION_ID,
+    CONF_STATION_NAME,
+    CONF_STATIONS,
+    DOMAIN,
+    VIRTUAL_STATION_ID,
+)
+from .coordinator import entry_stations
+from .governor import PRIORITY_INTERACTIVE
+from .metadata import async_get_metadata
 
 _LOGGER = logging.getLogger(__name__)
 
-
-def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Calculate distance between two coordinates using Haversine formula.
-
-    Returns distance in kilometers.
-    """
-    from math import radians, sin, cos, sqrt, atan2
-
-    # Earth radius in kilometers
-    R = 6371.0
-
-    lat1_rad = radians(lat1)
-    lon1_rad = radians(lon1)
-    lat2_rad = radians(lat2)
-    lon2_rad = radians(lon2)
-
-    dlat = lat2_rad - lat1_rad
-    dlon = lon2_rad - lon1_rad
-
-    a = sin(dlat / 2) ** 2 + cos(lat1_rad) * cos(lat2_rad) * sin(dlon / 2) ** 2
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
-
-    distance = R * c
-    return distance
-
-
-def find_nearest_station(
-    home_lat: float, home_lon: float, stations: Dict[str, Dict[str, Any]]
-) -> Optional[str]:
-    """Find the nearest station to home coordinates.
-
-    Returns station ID of the nearest station.
-    """
-    if not stations:
-        return None
-
-    nearest_id = None
-    nearest_distance = float("inf")
-
-    for station_id, info in stations.items():
-        distance = calculate_distance(
-            home_lat, home_lon, info["latitude"], info["longitude"]
-        )
-        if distance < nearest_distance:
-            nearest_distance = distance
-            nearest_id = station_id
-
-    _LOGGER.debug(f"Nearest station: {nearest_id} at {nearest_distance:.1f} km")
-
-    return nearest_id
+# Number of closest stations listed first in the station selector
+NEAREST_SUGGESTIONS = 5
+VIRTUAL_STATION_NAME = "Home"
+# Selector values leading to the steps that pick several stations
+MULTIPLE_STATIONS = "multiple"
+STATIONS_WITHIN_RADIUS = "radius"
+DEFAULT_RADIUS = 25
+MAX_RADIUS = 150
 
 
 class ChmuConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -79,17 +47,26 @@ class ChmuConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             station_id = user_input[CONF_STATION_ID]
+            if station_id == VIRTUAL_STATION_ID:
+                return await self._async_create_virtual_entry()
+            if station_id == MULTIPLE_STATIONS:
+                return await self.async_step_stations()
+            if station_id == STATIONS_WITHIN_RADIUS:
+                return await self.async_step_radius()
 
             # Fetch stations to get the name
-            stations_with_coords = await self.hass.async_add_executor_job(
-                get_stations_with_coords
-            )
+            stations_with_coords = await async_get_metadata(
+                self.hass
+            ).async_get_stations_with_coords(PRIORITY_INTERACTIVE)
             station_info = stations_with_coords.get(station_id, {})
             station_name = station_info.get("name", f"Station {station_id}")
 
             # Check if already configured
             await self.async_set_unique_id(station_id)
             self._abort_if_unique_id_configured()
+            if station_id in self._configured_station_ids():
+                # Part of an entry covering several stations
+                return self.async_abort(reason="already_configured")
 
             return self.async_create_entry(
                 title=f"{station_name} ({station_id})",
@@ -100,9 +77,10 @@ class ChmuConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             )
 
         # Fetch available stations with coordinates
+        metadata = async_get_metadata(self.hass)
         try:
-            stations_with_coords = await self.hass.async_add_executor_job(
-                get_stations_with_coords
+            stations_with_coords = await metadata.async_get_stations_with_coords(
+                PRIORITY_INTERACTIVE
             )
             if not stations_with_coords:
                 errors["base"] = "cannot_connect"
@@ -111,26 +89,49 @@ class ChmuConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors["base"] = "cannot_connect"
             stations_with_coords = {}
 
-        # Get Home Assistant location to suggest nearest station
+        # Get Home Assistant location to suggest nearest stations
         home_lat = self.hass.config.latitude
         home_lon = self.hass.config.longitude
 
         suggested_station = None
+        nearest_distance = None
+        nearest: List[Tuple[str, float]] = []
         if home_lat and home_lon and stations_with_coords:
-            suggested_station = find_nearest_station(
-                home_lat, home_lon, stations_with_coords
+            index = await metadata.async_get_index(PRIORITY_INTERACTIVE)
+            nearest = index.nearest(home_lat, home_lon, NEAREST_SUGGESTIONS)
+            if nearest:
+                suggested_station, nearest_distance = nearest[0]
+                _LOGGER.debug(
+                    "Nearest station: %s at %.1f km",
+                    suggested_station,
+                    nearest_distance,
+                )
+
+        # Build select options: the home location, several stations, nearest
+        # stations by distance, then the rest by name. The labels of the
+        # first ones are translated; those here are the fallback.
+        select_options = []
+        if nearest:
+            select_options.append(
+                selector.SelectOptionDict(
+                    value=VIRTUAL_STATION_ID,
+                    label=f"{VIRTUAL_STATION_NAME} (interpolated from nearby stations)",
+                )
             )
-
-        # Build select options sorted by name
-        select_options = [
-            selector.SelectOptionDict(
-                value=station_id,
-                label=info["name"],
+        if stations_with_coords:
+            select_options.append(
+                selector.SelectOptionDict(
+                    value=MULTIPLE_STATIONS, label="Several stations…"
+                )
             )
-            for station_id, info in sorted(
-                stations_with_coords.items(), key=lambda x: x[1]["name"]
+        if nearest:
+            select_options.append(
+                selector.SelectOptionDict(
+                    value=STATIONS_WITHIN_RADIUS,
+                    label="All stations within a distance from home…",
+                )
             )
-        ]
+        select_options.extend(_station_options(stations_with_coords, nearest))
 
         # Build schema with suggested default if available
         if suggested_station:
@@ -143,6 +144,7 @@ class ChmuConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                             options=select_options,
                             mode=selector.SelectSelectorMode.DROPDOWN,
                             sort=False,
+                            translation_key=CONF_STATION_ID,
                         )
                     )
                 }
@@ -155,6 +157,7 @@ class ChmuConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                             options=select_options,
                             mode=selector.SelectSelectorMode.DROPDOWN,
                             sort=False,
+                            translation_key=CONF_STATION_ID,
                         )
                     )
                 }
@@ -165,13 +168,10 @@ class ChmuConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             "stations_count": str(len(stations_with_coords)),
         }
 
-        if suggested_station and suggested_station in stations_with_coords:
+        if suggested_station:
             station_info = stations_with_coords[suggested_station]
-            distance = calculate_distance(
-                home_lat, home_lon, station_info["latitude"], station_info["longitude"]
-            )
             description_placeholders["nearest_station"] = station_info["name"]
-            description_placeholders["distance"] = f"{distance:.1f}"
+            description_placeholders["distance"] = f"{nearest_distance:.1f}"
         else:
             description_placeholders["nearest_station"] = "N/A"
             description_placeholders["distance"] = "N/A"
@@ -182,3 +182,180 @@ class ChmuConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
             description_placeholders=description_placeholders,
         )
+
+    async def async_step_stations(
+        self, user_input: Optional[Dict[str, Any]] = None
+    ) -> FlowResult:
+        """Pick several stations for one entry."""
+        errors: Dict[str, str] = {}
+        metadata = async_get_metadata(self.hass)
+        try:
+            stations_with_coords = await metadata.async_get_stations_with_coords(
+                PRIORITY_INTERACTIVE
+            )
+        except Exception:
+            _LOGGER.exception("Failed to fetch stations")
+            return self.async_abort(reason="cannot_connect")
+
+        if user_input is not None:
+            station_ids = user_input[CONF_STATIONS]
+            if not station_ids:
+                errors["base"] = "no_stations"
+            elif set(station_ids) & self._configured_station_ids():
+                errors["base"] = "station_configured"
+            else:
+                return self._async_create_stations_entry(
+                    f"{len(station_ids)} stations",
+                    {
+                        station_id: stations_with_coords.get(station_id, {}).get(
+                            "name", f"Station {station_id}"
+                        )
+                        for station_id in station_ids
+                    },
+                )
+
+        nearest: List[Tuple[str, float]] = []
+        if self.hass.config.latitude and self.hass.config.longitude:
+            index = await metadata.async_get_index(PRIORITY_INTERACTIVE)
+            nearest = index.nearest(
+                self.hass.config.latitude,
+                self.hass.config.longitude,
+                NEAREST_SUGGESTIONS,
+            )
+        configured = self._configured_station_ids()
+        options = [
+            option
+            for option in _station_options(stations_with_coords, nearest)
+            if option["value"] not in configured
+        ]
+
+        return self.async_show_form(
+            step_id="stations",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_STATIONS): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=options,
+                            multiple=True,
+                            mode=selector.SelectSelectorMode.DROPDOWN,
+                            sort=False,
+                        )
+                    )
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_radius(
+        self, user_input: Optional[Dict[str, Any]] = None
+    ) -> FlowResult:
+        """Pick every station within a distance from the home location."""
+        errors: Dict[str, str] = {}
+        if user_input is not None:
+            radius = user_input[CONF_RADIUS]
+            metadata = async_get_metadata(self.hass)
+            try:
+                index = await metadata.async_get_index(PRIORITY_INTERACTIVE)
+            except Exception:
+                _LOGGER.exception("Failed to fetch stations")
+                return self.async_abort(reason="cannot_connect")
+
+            configured = self._configured_station_ids()
+            stations = {
+                station_id: index.stations[station_id]["name"]
+                for station_id, _ in index.within(
+                    self.hass.config.latitude, self.hass.config.longitude, radius
+                )
+                if station_id not in configured
+            }
+            if not stations:
+                errors["base"] = "no_stations"
+            else:
+                return self._async_create_stations_entry(
+                    f"Stations within {radius:g} km", stations, {CONF_RADIUS: radius}
+                )
+
+        return self.async_show_form(
+            step_id="radius",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_RADIUS, default=DEFAULT_RADIUS
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1,
+                            max=MAX_RADIUS,
+                            step=1,
+                            unit_of_measurement="km",
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    )
+                }
+            ),
+            errors=errors,
+        )
+
+    def _configured_station_ids(self) -> Set[str]:
+        """Return the stations of all existing entries."""
+        return {
+            station_id
+            for entry in self._async_current_entries(include_ignore=False)
+            for station_id in entry_stations(entry.data)
+        }
+
+    def _async_create_stations_entry(
+        self,
+        title: str,
+        stations: Dict[str, str],
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> FlowResult:
+        """Create an entry refreshing several stations together.
+
+        Stations are listed explicitly, so the entry does not change when
+        the catalogue does.
+        """
+        return self.async_create_entry(
+            title=title, data={CONF_STATIONS: stations, **(extra or {})}
+        )
+
+    async def _async_create_virtual_entry(self) -> FlowResult:
+        """Create the virtual station at the home location."""
+        await self.async_set_unique_id(VIRTUAL_STATION_ID)
+        self._abort_if_unique_id_configured()
+
+        return self.async_create_entry(
+            title=f"{VIRTUAL_STATION_NAME} (virtual station)",
+            data={
+                CONF_STATION_ID: VIRTUAL_STATION_ID,
+                CONF_STATION_NAME: VIRTUAL_STATION_NAME,
+                CONF_LATITUDE: self.hass.config.latitude,
+                CONF_LONGITUDE: self.hass.config.longitude,
+                CONF_ELEVATION: self.hass.config.elevation,
+            },
+        )
+
+
+def _station_options(
+    stations_with_coords: Dict[str, Dict[str, Any]],
+    nearest: List[Tuple[str, float]],
+) -> List[selector.SelectOptionDict]:
+    """Return station options, the nearest first by distance, then by name."""
+    options = [
+        selector.SelectOptionDict(
+            value=station_id,
+            label=f"{stations_with_coords[station_id]['name']} ({distance:.1f} km)",
+        )
+        for station_id, distance in nearest
+    ]
+    nearest_ids = {station_id for station_id, _ in nearest}
+    options.extend(
+        selector.SelectOptionDict(
+            value=station_id,
+            label=info["name"],
+        )
+        for station_id, info in sorted(
+            stations_with_coords.items(), key=lambda x: x[1]["name"]
+        )
+        if station_id not in nearest_ids
+    )
+    return options
@@ -9,3 +9,34 @@ CONF_STATION_NAME = "station_name"
 API_BASE_URL = "https://opendata.chmi.cz/meteorology/climate"
 API_NOW_PATH = "/now/data"
 API_METADATA_PATH = "/now/metadata"
+# YAML option replacing API_BASE_URL, e.g. with a local stand-in server
+CONF_BASE_URL = "base_url"
+
+# Key of the shared hub coordinator in hass.data[DOMAIN]
+DATA_HUB = "hub"
+# Key of the shared station catalogue in hass.data[DOMAIN]
+DATA_METADATA = "metadata"
+# Key of the request governor shared by all requests in hass.data[DOMAIN]
+DATA_GOVERNOR = "governor"
+# Key of the base URL set in YAML in hass.data[DOMAIN]
+DATA_BASE_URL = "base_url"
+
+# Set in the entry data once history was imported on first setup
+CONF_BACKFILLED = "backfilled"
+
+SERVICE_BACKFILL = "backfill"
+ATTR_START_DATE = "start_date"
+ATTR_END_DATE = "end_date"
+
+SERVICE_PROFILE = "profile"
+ATTR_REFRESHES = "refreshes"
+
+# Attribute marking a result served from cache while the station is failing
+ATTR_STALE = "stale"
+
+# Station ID of the virtual station interpolated at the home location
+VIRTUAL_STATION_ID = "virtual"
+
+# Entries covering several stations store them by ID with their names
+CONF_STATIONS = "stations"
+CONF_RADIUS = "radius"
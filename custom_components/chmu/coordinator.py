@@ -0,0 +1,503 @@
+"""Shared update coordinator for ČHMÚ Weather stations."""
+
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+import aiohttp
+
+from homeassistant.config_entries import current_entry
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import (
+    DataUpdateCoordinator,
+    UpdateFailed,
+)
+from homeassistant.util import dt as dt_util
+
+from .api import ChmuApi, ChmuClient
+from .backfill import async_backfill_station
+from .const import (
+    API_BASE_URL,
+    ATTR_STALE,
+    CONF_STATION_ID,
+    CONF_STATION_NAME,
+    CONF_STATIONS,
+    DATA_BASE_URL,
+    DATA_HUB,
+    DOMAIN,
+)
+from .governor import RequestGovernor, async_get_governor
+from .profiler import RefreshProfiler
+from .scheduler import PublicationTracker
+from .series import StationSeries
+from .stats import StationStats
+from .virtual import VirtualStation
+
+_LOGGER = logging.getLogger(__name__)
+
+SCAN_INTERVAL = timedelta(minutes=10)
+# Shortest pause between two hub refreshes
+MIN_SCAN_INTERVAL = timedelta(seconds=10)
+
+SNAPSHOT_STORAGE_KEY = f"{DOMAIN}.snapshot"
+SNAPSHOT_STORAGE_VERSION = 1
+# Batch snapshot writes of stations refreshed close together
+SNAPSHOT_SAVE_DELAY = 30
+# How long the last good result is served while the station keeps failing
+MAX_STALE = timedelta(hours=2)
+
+
+class ChmuHub(DataUpdateCoordinator[Dict[str, Dict[str, Any]]]):
+    """Domain-level coordinator refreshing all configured stations together.
+
+    Config entries subscribe to stations with ``async_add_station`` and read
+    their slice from ``data[station_id]``. One HTTP client and one timer are
+    shared by every entry.
+
+    Each refresh only polls the stations whose next interval is expected to
+    be published by now, and the timer is re-armed for the earliest station
+    due next.
+
+    The last good result of every station is saved to disk. On startup it is
+    served right away and revalidated in the background, and while a station
+    keeps failing it is served marked as stale for up to ``MAX_STALE``.
+
+    Virtual stations subscribe to their source stations and are interpolated
+    from them into ``data[virtual_id]`` after every refresh.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        base_url: str = API_BASE_URL,
+        governor: Optional[RequestGovernor] = None,
+    ):
+        """Initialize the hub.
+
+        ``base_url`` replaces the opendata server, e.g. with a local stand-in.
+        ``governor`` defaults to the one shared by all requests of the domain.
+        """
+        # The hub outlives the entry being set up when it is created, so it
+        # must not be tied to that entry and shut down when it unloads
+        token = current_entry.set(None)
+        try:
+            super().__init__(
+                hass,
+                _LOGGER,
+                name=DOMAIN,
+                update_interval=SCAN_INTERVAL,
+            )
+        finally:
+            current_entry.reset(token)
+        self.shut_down = False
+        self._unsub_stop: Optional[Callable[[], None]] = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, self._async_on_stop
+        )
+        self.client = ChmuClient(
+            async_get_clientsession(hass),
+            base_url,
+            governor if governor is not None else async_get_governor(hass),
+        )
+        self._apis: Dict[str, ChmuApi] = {}
+        self._subscribers: Dict[str, int] = {}
+        self._trackers: Dict[str, PublicationTracker] = {}
+        self._last_success: Dict[str, datetime] = {}
+        self._snapshot_store: Store = Store(
+            hass, SNAPSHOT_STORAGE_VERSION, SNAPSHOT_STORAGE_KEY
+        )
+        self._snapshot: Optional[Dict[str, Dict[str, Any]]] = None
+        self._virtuals: Dict[str, VirtualStation] = {}
+        # Set while the chmu.profile service is waiting for refreshes
+        self._profiler: Optional[RefreshProfiler] = None
+        # Called once when the hub shuts down, e.g. to end subscriptions
+        self._shutdown_listeners: List[Callable[[], None]] = []
+
+    @property
+    def station_ids(self) -> list:
+        """Return the IDs of all subscribed stations."""
+        return list(self._apis)
+
+    def get_series(self, station_id: str) -> Optional[StationSeries]:
+        """Return the recent measurements kept in memory for a station."""
+        api = self._apis.get(station_id)
+        return api.series if api is not None else None
+
+    def get_stats(self, station_id: str) -> Optional[StationStats]:
+        """Return the runtime counters of a station."""
+        api = self._apis.get(station_id)
+        return api.stats if api is not None else None
+
+    def get_tracker(self, station_id: str) -> Optional[PublicationTracker]:
+        """Return the polling schedule of a station."""
+        return self._trackers.get(station_id)
+
+    def get_forecast(self, station_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Return the nowcast of a station for the next hours.
+
+        The forecast of a virtual station is interpolated hour by hour from
+        the forecasts of its sources.
+        """
+        virtual = self._virtuals.get(station_id)
+        if virtual is None:
+            api = self._apis.get(station_id)
+            return api.nowcast.forecast() if api is not None else None
+
+        forecasts = {
+            source_id: self._apis[source_id].nowcast.forecast()
+            for source_id in virtual.station_ids
+            if source_id in self._apis
+        }
+        forecast = []
+        for hour in range(max(map(len, forecasts.values()), default=0)):
+            entry = virtual.interpolate(
+                {
+                    source_id: source[hour]
+                    for source_id, source in forecasts.items()
+                    if hour < len(source)
+                }
+            )
+            if entry is not None:
+                forecast.append(entry)
+        return forecast
+
+    def get_virtual(self, virtual_id: str) -> Optional[VirtualStation]:
+        """Return a virtual station."""
+        return self._virtuals.get(virtual_id)
+
+    def async_add_station(self, station_id: str, station_name: Optional[str]) -> None:
+        """Subscribe to a station."""
+        if station_id not in self._apis:
+            self._apis[station_id] = ChmuApi(self.client, station_id, station_name)
+            self._trackers[station_id] = PublicationTracker(station_id)
+        self._subscribers[station_id] = self._subscribers.get(station_id, 0) + 1
+
+    def async_remove_station(self, station_id: str) -> None:
+        """Drop a subscription, forgetting the station when nobody uses it."""
+        count = self._subscribers.get(station_id, 0) - 1
+        if count > 0:
+            self._subscribers[station_id] = count
+            return
+
+        self._subscribers.pop(station_id, None)
+        self._apis.pop(station_id, None)
+        self._trackers.pop(station_id, None)
+        self._last_success.pop(station_id, None)
+        if self.data:
+            self.data.pop(station_id, None)
+
+    def async_add_virtual(
+        self,
+        virtual_id: str,
+        virtual: VirtualStation,
+        station_names: Dict[str, Optional[str]],
+    ) -> None:
+        """Subscribe a virtual station and the stations it is built from."""
+        for station_id in virtual.station_ids:
+            self.async_add_station(station_id, station_names.get(station_id))
+        self._virtuals[virtual_id] = virtual
+
+    def async_remove_virtual(self, virtual_id: str) -> None:
+        """Drop a virtual station and its subscriptions."""
+        virtual = self._virtuals.pop(virtual_id, None)
+        if virtual is None:
+            return
+        for station_id in virtual.station_ids:
+            self.async_remove_station(station_id)
+        if self.data:
+            self.data.pop(virtual_id, None)
+
+    async def async_prepare_stations(self, station_ids: List[str]) -> List[str]:
+        """Give newly subscribed stations data before their entities exist.
+
+        Stations are restored from the snapshot where possible and the rest
+        are fetched together. Returns the restored stations, which are still
+        to be revalidated. Raises the first error when none of the stations
+        has data.
+        """
+        missing = [
+            station_id
+            for station_id in station_ids
+            if not self.data or station_id not in self.data
+        ]
+        restored = [
+            station_id
+            for station_id in missing
+            if await self.async_restore_station(station_id)
+        ]
+        results = await asyncio.gather(
+            *(
+                self.async_refresh_station(station_id)
+                for station_id in missing
+                if station_id not in restored
+            ),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        for error in errors:
+            if not isinstance(
+                error, (aiohttp.ClientError, asyncio.TimeoutError, ValueError)
+            ):
+                raise error
+        if errors and not any(
+            station_id in (self.data or {}) for station_id in station_ids
+        ):
+            raise errors[0]
+
+        self.data = self._interpolate(self.data or {})
+        return restored
+
+    def async_start_backfill(
+        self, station_ids: List[str], start: date, end: date
+    ) -> None:
+        """Import historical statistics of stations in the background."""
+        self.hass.async_create_background_task(
+            self.async_backfill_stations(station_ids, start, end),
+            f"{DOMAIN} backfill {', '.join(station_ids)}",
+        )
+
+    async def async_backfill_stations(
+        self, station_ids: List[str], start: date, end: date
+    ) -> None:
+        """Import historical statistics of stations one after another.
+
+        Running them in turn keeps the load on the server as low as for a
+        single station; cancelling the task stops all of them.
+        """
+        for station_id in station_ids:
+            api = self._apis.get(station_id)
+            if api is None:
+                # Unsubscribed in the meantime
+                continue
+            await async_backfill_station(
+                self.hass, self.client, station_id, api.station_name, start, end
+            )
+
+    async def async_restore_station(self, station_id: str) -> bool:
+        """Serve a station's saved result until it is revalidated.
+
+        Returns False when there is no saved result recent enough to use.
+        """
+        if self._snapshot is None:
+            self._snapshot = await self._snapshot_store.async_load() or {}
+
+        saved = self._snapshot.get(station_id)
+        if not saved:
+            return False
+        fetched = dt_util.parse_datetime(saved.get("fetched") or "")
+        if fetched is None or dt_util.utcnow() - fetched > MAX_STALE:
+            return False
+
+        self._last_success[station_id] = fetched
+        self.data = {
+            **(self.data or {}),
+            station_id: {**saved["result"], ATTR_STALE: True},
+        }
+        return True
+
+    async def async_profile(self, refreshes: int) -> RefreshProfiler:
+        """Profile the next refreshes and return the profiler when done."""
+        if self._profiler is not None:
+            raise RuntimeError("A profile is already being taken")
+        profiler = self._profiler = RefreshProfiler(refreshes)
+        try:
+            await profiler.done
+        finally:
+            self._profiler = None
+        return profiler
+
+    async def _async_refresh(self, *args: Any, **kwargs: Any) -> None:
+        """Refresh, profiling the whole refresh while a profile is taken."""
+        profiler = self._profiler
+        if profiler is None:
+            await super()._async_refresh(*args, **kwargs)
+            return
+        profiler.enable()
+        try:
+            await super()._async_refresh(*args, **kwargs)
+        finally:
+            profiler.disable()
+
+    @callback
+    def async_on_shutdown(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call ``listener`` when the hub shuts down; return a remover."""
+        self._shutdown_listeners.append(listener)
+
+        @callback
+        def remove() -> None:
+            if listener in self._shutdown_listeners:
+                self._shutdown_listeners.remove(listener)
+
+        return remove
+
+    async def _async_on_stop(self, event: Event) -> None:
+        """Shut down with Home Assistant."""
+        self._unsub_stop = None
+        await self.async_shutdown()
+
+    async def async_shutdown(self) -> None:
+        """Stop refreshing, give up a profile and tell shutdown listeners.
+
+        Called when the last entry unloads or Home Assistant stops; a shut
+        down hub is replaced by ``async_get_hub``.
+        """
+        self.shut_down = True
+        if self._unsub_stop is not None:
+            self._unsub_stop()
+            self._unsub_stop = None
+        if self._profiler is not None:
+            self._profiler.abort(RuntimeError("The hub was shut down"))
+        listeners, self._shutdown_listeners = self._shutdown_listeners, []
+        for listener in listeners:
+            listener()
+        await super().async_shutdown()
+
+    async def async_refresh_station(self, station_id: str) -> Dict[str, Any]:
+        """Fetch a single station immediately, e.g. when its entry is set up."""
+        try:
+            result = await self._apis[station_id].async_get_current_data()
+        except Exception:
+            tracker = self._trackers.get(station_id)
+            if tracker is not None:
+                tracker.observe(None, dt_util.utcnow())
+            raise
+        tracker = self._trackers.get(station_id)
+        if tracker is None:
+            # Removed while it was fetched
+            return result
+        now = dt_util.utcnow()
+        tracker.observe(_data_time(result), now)
+        self._remember(station_id, result, now)
+        self.data = {**(self.data or {}), station_id: result}
+        return result
+
+    def _remember(self, station_id: str, result: Dict[str, Any], now: datetime) -> None:
+        """Record a good result and schedule saving it to disk."""
+        self._last_success[station_id] = now
+        if self._snapshot is None:
+            # Not loaded yet; nothing was restored, so start afresh
+            self._snapshot = {}
+        self._snapshot[station_id] = {"fetched": now.isoformat(), "result": result}
+        self._snapshot_store.async_delay_save(self._snapshot_data, SNAPSHOT_SAVE_DELAY)
+
+    def _snapshot_data(self) -> Dict[str, Dict[str, Any]]:
+        """Return the snapshot of the subscribed stations to save."""
+        return {
+            station_id: saved
+            for station_id, saved in (self._snapshot or {}).items()
+            if station_id in self._apis
+        }
+
+    async def _async_update_data(self) -> Dict[str, Dict[str, Any]]:
+        """Fetch all stations that are due concurrently."""
+        now = dt_util.utcnow()
+        previous = self.data or {}
+        apis = [
+            api
+            for station_id, api in self._apis.items()
+            if self._trackers[station_id].is_due(now)
+        ]
+        results = await asyncio.gather(
+            *(api.async_get_current_data() for api in apis),
+            return_exceptions=True,
+        )
+
+        # Stations that were not due keep their last result
+        data = {
+            station_id: previous[station_id]
+            for station_id in self._apis
+            if station_id in previous
+        }
+        errors = []
+        now = dt_util.utcnow()
+        for api, result in zip(apis, results):
+            tracker = self._trackers.get(api.station_id)
+            if tracker is None:
+                # The station's entry unloaded while it was fetched
+                continue
+            if isinstance(
+                result, (aiohttp.ClientError, asyncio.TimeoutError, ValueError)
+            ):
+                _LOGGER.warning(
+                    "Error fetching data for station %s: %s", api.station_id, result
+                )
+                tracker.observe(None, now)
+                errors.append(result)
+                last_success = self._last_success.get(api.station_id)
+                if (
+                    api.station_id in data
+                    and last_success is not None
+                    and now - last_success <= MAX_STALE
+                ):
+                    # Keep serving the last good result through short outages
+                    data[api.station_id] = {**data[api.station_id], ATTR_STALE: True}
+                else:
+                    data.pop(api.station_id, None)
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            tracker.observe(_data_time(result), now)
+            self._remember(api.station_id, result, now)
+            data[api.station_id] = result
+
+        self._schedule_next(now)
+
+        if apis and not data:
+            raise UpdateFailed(f"Error communicating with API: {errors[0]}")
+
+        return self._interpolate(data)
+
+    def _interpolate(
+        self, data: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Add the results of the virtual stations to fresh station data."""
+        for virtual_id, virtual in self._virtuals.items():
+            result = virtual.interpolate(data)
+            if result is not None:
+                data[virtual_id] = result
+            else:
+                data.pop(virtual_id, None)
+        return data
+
+    def _schedule_next(self, now: datetime) -> None:
+        """Re-arm the timer for the station due first."""
+        next_polls = [
+            tracker.next_poll
+            for tracker in self._trackers.values()
+            if tracker.next_poll is not None
+        ]
+        if not next_polls:
+            self.update_interval = SCAN_INTERVAL
+            return
+        self.update_interval = max(min(next_polls) - now, MIN_SCAN_INTERVAL)
+
+
+def _data_time(result: Dict[str, Any]) -> Optional[datetime]:
+    """Return the measurement time of a station result."""
+    parsed = dt_util.parse_datetime(result.get("timestamp") or "")
+    return dt_util.as_utc(parsed) if parsed else None
+
+
+def entry_stations(data: Mapping[str, Any]) -> Dict[str, str]:
+    """Return the stations of a config entry's data by ID with their names.
+
+    Entries set up for a single station, including the virtual one, store
+    it under ``CONF_STATION_ID``.
+    """
+    if CONF_STATIONS in data:
+        return dict(data[CONF_STATIONS])
+    station_id = data[CONF_STATION_ID]
+    return {station_id: data.get(CONF_STATION_NAME, f"Station {station_id}")}
+
+
+def async_get_hub(hass: HomeAssistant) -> ChmuHub:
+    """Return the shared hub, creating it on first use or after a shutdown."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_HUB not in domain_data or domain_data[DATA_HUB].shut_down:
+        domain_data[DATA_HUB] = ChmuHub(
+            hass, domain_data.get(DATA_BASE_URL, API_BASE_URL)
+        )
+    return domain_data[DATA_HUB]
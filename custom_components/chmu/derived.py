@@ -0,0 +1,39 @@
+"""Quantities derived from the measurements of one interval."""
+
+from bisect import bisect_right
+from math import exp, log
+from typing import Optional
+
+# Magnus formula coefficients over water
+MAGNUS_A = 17.62
+MAGNUS_B = 243.12
+
+# Lower bounds of Beaufort forces 1 to 12 in m/s
+BEAUFORT_SCALE = (0.5, 1.6, 3.4, 5.5, 8.0, 10.8, 13.9, 17.2, 20.8, 24.5, 28.5, 32.7)
+
+
+def dew_point(temperature: float, humidity: float) -> Optional[float]:
+    """Return the dew point in °C from temperature in °C and humidity in %."""
+    if humidity <= 0:
+        return None
+    gamma = log(humidity / 100) + MAGNUS_A * temperature / (MAGNUS_B + temperature)
+    return round(MAGNUS_B * gamma / (MAGNUS_A - gamma), 1)
+
+
+def apparent_temperature(
+    temperature: float, humidity: float, wind_speed: float
+) -> float:
+    """Return the apparent temperature in °C.
+
+    Uses the Australian Bureau of Meteorology formula for shade, which
+    covers both wind chill and humidity.
+    """
+    vapour_pressure = (
+        humidity / 100 * 6.105 * exp(17.27 * temperature / (237.7 + temperature))
+    )
+    return round(temperature + 0.33 * vapour_pressure - 0.70 * wind_speed - 4.00, 1)
+
+
+def beaufort(wind_speed: float) -> int:
+    """Return the Beaufort force of a wind speed in m/s."""
+    return bisect_right(BEAUFORT_SCALE, wind_speed)
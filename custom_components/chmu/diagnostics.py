@@ -0,0 +1,67 @@
+"""Diagnostics support for ČHMÚ Weather."""
+
+from datetime import datetime
+from typing import Any, Dict, List
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, VIRTUAL_STATION_ID
+from .coordinator import ChmuHub, entry_stations
+
+TO_REDACT = {CONF_LATITUDE, CONF_LONGITUDE}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Dict[str, Any]:
+    """Return diagnostics of a config entry."""
+    hub: ChmuHub = hass.data[DOMAIN][entry.entry_id]
+    stations = entry_stations(entry.data)
+    now = dt_util.utcnow()
+
+    # The stations polled for the entry
+    station_ids: List[str] = list(stations)
+    if VIRTUAL_STATION_ID in stations:
+        virtual = hub.get_virtual(VIRTUAL_STATION_ID)
+        station_ids = virtual.station_ids if virtual is not None else []
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "hub": {
+            "last_update_success": hub.last_update_success,
+            "update_interval": str(hub.update_interval),
+            "stations": len(hub.station_ids),
+        },
+        "governor": hub.client.governor.as_dict(),
+        "data": {
+            station_id: (hub.data or {}).get(station_id) for station_id in stations
+        },
+        "stations": {
+            source_id: _station_diagnostics(hub, source_id, now)
+            for source_id in station_ids
+        },
+    }
+
+
+def _station_diagnostics(
+    hub: ChmuHub, station_id: str, now: datetime
+) -> Dict[str, Any]:
+    """Return the counters, schedule and data of one polled station."""
+    stats = hub.get_stats(station_id)
+    tracker = hub.get_tracker(station_id)
+    return {
+        "stats": stats.as_dict(now) if stats is not None else None,
+        "schedule": {
+            "publication_delay_s": tracker.delay.total_seconds(),
+            "jitter_s": tracker.jitter.total_seconds(),
+            "attempts": tracker.attempts,
+            "next_poll": tracker.next_poll.isoformat() if tracker.next_poll else None,
+        }
+        if tracker is not None
+        else None,
+        "data": (hub.data or {}).get(station_id),
+    }
@@ -0,0 +1,152 @@
+"""Registry of ČHMÚ element codes reported in the 10-minute data."""
+
+from typing import Dict, NamedTuple, Optional
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from homeassistant.const import (
+    DEGREE,
+    PERCENTAGE,
+    UnitOfLength,
+    UnitOfPrecipitationDepth,
+    UnitOfPressure,
+    UnitOfSpeed,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+
+
+class ElementInfo(NamedTuple):
+    """How an element is exposed as a sensor."""
+
+    key: str
+    unit: Optional[str]
+    device_class: Optional[SensorDeviceClass]
+    state_class: Optional[SensorStateClass]
+    icon: str
+    # Created for every station, even before the station reports it
+    default: bool = False
+
+
+# Element code to sensor, in the order the sensors are created
+ELEMENTS: Dict[str, ElementInfo] = {
+    "T": ElementInfo(
+        "temperature",
+        UnitOfTemperature.CELSIUS,
+        SensorDeviceClass.TEMPERATURE,
+        SensorStateClass.MEASUREMENT,
+        "mdi:thermometer",
+        default=True,
+    ),
+    "H": ElementInfo(
+        "humidity",
+        PERCENTAGE,
+        SensorDeviceClass.HUMIDITY,
+        SensorStateClass.MEASUREMENT,
+        "mdi:water-percent",
+        default=True,
+    ),
+    "P": ElementInfo(
+        "pressure",
+        UnitOfPressure.HPA,
+        SensorDeviceClass.PRESSURE,
+        SensorStateClass.MEASUREMENT,
+        "mdi:gauge",
+        default=True,
+    ),
+    "SRA10M": ElementInfo(
+        "precipitation",
+        UnitOfPrecipitationDepth.MILLIMETERS,
+        SensorDeviceClass.PRECIPITATION,
+        # Amount of the last interval, not a running total
+        SensorStateClass.MEASUREMENT,
+        "mdi:weather-rainy",
+        default=True,
+    ),
+    "F": ElementInfo(
+        "wind_speed",
+        UnitOfSpeed.METERS_PER_SECOND,
+        SensorDeviceClass.WIND_SPEED,
+        SensorStateClass.MEASUREMENT,
+        "mdi:weather-windy",
+        default=True,
+    ),
+    "D": ElementInfo(
+        "wind_direction",
+        DEGREE,
+        None,
+        SensorStateClass.MEASUREMENT,
+        "mdi:compass",
+        default=True,
+    ),
+    "Fmax": ElementInfo(
+        "wind_gust",
+        UnitOfSpeed.METERS_PER_SECOND,
+        SensorDeviceClass.WIND_SPEED,
+        SensorStateClass.MEASUREMENT,
+        "mdi:weather-windy-variant",
+    ),
+    "Dmax": ElementInfo(
+        "wind_gust_direction",
+        DEGREE,
+        None,
+        SensorStateClass.MEASUREMENT,
+        "mdi:compass-outline",
+    ),
+    "TPM": ElementInfo(
+        "grass_temperature",
+        UnitOfTemperature.CELSIUS,
+        SensorDeviceClass.TEMPERATURE,
+        SensorStateClass.MEASUREMENT,
+        "mdi:grass",
+    ),
+    "T05": ElementInfo(
+        "soil_temperature_5cm",
+        UnitOfTemperature.CELSIUS,
+        SensorDeviceClass.TEMPERATURE,
+        SensorStateClass.MEASUREMENT,
+        "mdi:thermometer-low",
+    ),
+    "T10": ElementInfo(
+        "soil_temperature_10cm",
+        UnitOfTemperature.CELSIUS,
+        SensorDeviceClass.TEMPERATURE,
+        SensorStateClass.MEASUREMENT,
+        "mdi:thermometer-low",
+    ),
+    "T20": ElementInfo(
+        "soil_temperature_20cm",
+        UnitOfTemperature.CELSIUS,
+        SensorDeviceClass.TEMPERATURE,
+        SensorStateClass.MEASUREMENT,
+        "mdi:thermometer-low",
+    ),
+    "T50": ElementInfo(
+        "soil_temperature_50cm",
+        UnitOfTemperature.CELSIUS,
+        SensorDeviceClass.TEMPERATURE,
+        SensorStateClass.MEASUREMENT,
+        "mdi:thermometer-low",
+    ),
+    "T100": ElementInfo(
+        "soil_temperature_100cm",
+        UnitOfTemperature.CELSIUS,
+        SensorDeviceClass.TEMPERATURE,
+        SensorStateClass.MEASUREMENT,
+        "mdi:thermometer-low",
+    ),
+    # Seconds of sunshine in the 10-minute interval, 0 to 600
+    "SSV10M": ElementInfo(
+        "sunshine_duration",
+        UnitOfTime.SECONDS,
+        SensorDeviceClass.DURATION,
+        SensorStateClass.MEASUREMENT,
+        "mdi:weather-sunny",
+    ),
+    "SCE": ElementInfo(
+        "snow_depth",
+        UnitOfLength.CENTIMETERS,
+        SensorDeviceClass.DISTANCE,
+        SensorStateClass.MEASUREMENT,
+        "mdi:snowflake",
+    ),
+}
@@ -0,0 +1,154 @@
+"""Spatial lookup of ČHMÚ stations."""
+
+import heapq
+from math import asin, cos, pi, radians, sin, sqrt
+from typing import Any, Dict, List, Optional, Tuple
+
+# Earth radius in kilometers
+EARTH_RADIUS = 6371.0
+
+
+def _to_vector(latitude: float, longitude: float) -> Tuple[float, float, float]:
+    """Convert coordinates to a point on the unit sphere."""
+    lat = radians(latitude)
+    lon = radians(longitude)
+    cos_lat = cos(lat)
+    return (cos_lat * cos(lon), cos_lat * sin(lon), sin(lat))
+
+
+def _chord_to_km(chord_sq: float) -> float:
+    """Convert a squared chord length on the unit sphere to kilometers."""
+    return 2 * EARTH_RADIUS * asin(min(1.0, sqrt(chord_sq) / 2))
+
+
+def _km_to_chord_sq(distance: float) -> float:
+    """Convert kilometers to a squared chord length on the unit sphere."""
+    angle = min(distance / EARTH_RADIUS, pi)
+    return (2 * sin(angle / 2)) ** 2
+
+
+class _Node:
+    """Node of the k-d tree."""
+
+    __slots__ = ("index", "axis", "left", "right")
+
+    def __init__(self, index: int, axis: int, left, right):
+        self.index = index
+        self.axis = axis
+        self.left = left
+        self.right = right
+
+
+class StationIndex:
+    """k-d tree over station positions on the unit sphere.
+
+    Straight-line (chord) distance between unit vectors grows monotonically
+    with great-circle distance, so nearest-neighbour and radius queries can
+    prune with plain coordinate differences and only convert the results to
+    kilometers at the end. Many locations are resolved with one ``nearest``
+    call each; without numpy a batched dot-product scan over all stations
+    is no faster than walking the tree.
+    """
+
+    def __init__(self, stations: Dict[str, Dict[str, Any]]):
+        """Build the index from a station catalogue."""
+        self.stations = stations
+        self._ids: List[str] = []
+        self._points: List[Tuple[float, float, float]] = []
+        for station_id, info in stations.items():
+            if info.get("latitude") is None or info.get("longitude") is None:
+                continue
+            self._ids.append(station_id)
+            self._points.append(_to_vector(info["latitude"], info["longitude"]))
+        self._root = self._build(list(range(len(self._points))), 0)
+
+    def __len__(self) -> int:
+        """Return the number of indexed stations."""
+        return len(self._ids)
+
+    def _build(self, indices: List[int], depth: int) -> Optional[_Node]:
+        """Recursively split the points at the median of alternating axes."""
+        if not indices:
+            return None
+        axis = depth % 3
+        indices.sort(key=lambda i: self._points[i][axis])
+        median = len(indices) // 2
+        return _Node(
+            indices[median],
+            axis,
+            self._build(indices[:median], depth + 1),
+            self._build(indices[median + 1 :], depth + 1),
+        )
+
+    def nearest(
+        self, latitude: float, longitude: float, k: int = 1
+    ) -> List[Tuple[str, float]]:
+        """Return the ``k`` closest stations as (station ID, km), closest first."""
+        if k <= 0 or self._root is None:
+            return []
+
+        query = _to_vector(latitude, longitude)
+        points = self._points
+        # Max-heap of the best candidates so far, as (-chord², index)
+        best: List[Tuple[float, int]] = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            point = points[node.index]
+            dist_sq = (
+                (point[0] - query[0]) ** 2
+                + (point[1] - query[1]) ** 2
+                + (point[2] - query[2]) ** 2
+            )
+            if len(best) < k:
+                heapq.heappush(best, (-dist_sq, node.index))
+            elif dist_sq < -best[0][0]:
+                heapq.heapreplace(best, (-dist_sq, node.index))
+
+            diff = query[node.axis] - point[node.axis]
+            near, far = (node.left, node.right) if diff < 0 else (node.right, node.left)
+            # Visit the far side only if it can hold something closer
+            if len(best) < k or diff * diff < -best[0][0]:
+                stack.append(far)
+            stack.append(near)
+
+        return [
+            (self._ids[index], _chord_to_km(-neg_dist_sq))
+            for neg_dist_sq, index in sorted(best, reverse=True)
+        ]
+
+    def within(
+        self, latitude: float, longitude: float, radius: float
+    ) -> List[Tuple[str, float]]:
+        """Return stations within ``radius`` km as (station ID, km), closest first."""
+        if self._root is None:
+            return []
+
+        query = _to_vector(latitude, longitude)
+        limit = _km_to_chord_sq(radius)
+        points = self._points
+        found = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            point = points[node.index]
+            dist_sq = (
+                (point[0] - query[0]) ** 2
+                + (point[1] - query[1]) ** 2
+                + (point[2] - query[2]) ** 2
+            )
+            if dist_sq <= limit:
+                found.append((dist_sq, node.index))
+
+            diff = query[node.axis] - point[node.axis]
+            if diff <= 0 or diff * diff <= limit:
+                stack.append(node.left)
+            if diff >= 0 or diff * diff <= limit:
+                stack.append(node.right)
+
+        found.sort()
+        return [(self._ids[index], _chord_to_km(dist_sq)) for dist_sq, index in found]
@@ -0,0 +1,217 @@
+"""Domain-wide budget for requests to the ČHMÚ opendata server."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_GOVERNOR, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Request priorities, lower first
+PRIORITY_LIVE = 0
+PRIORITY_INTERACTIVE = 1
+PRIORITY_BACKGROUND = 2
+
+# Sustained requests per second and how many may be sent in a burst
+DEFAULT_RATE = 5.0
+DEFAULT_BURST = 10
+# Requests in flight at once
+DEFAULT_CONCURRENCY = 6
+# Shared backoff after 429 or 5xx responses without Retry-After
+BACKOFF_MIN = 2.0
+BACKOFF_MAX = 300.0
+
+
+class BackoffError(aiohttp.ClientError):
+    """Raised instead of sending a request while the server is backed off."""
+
+
+class RequestGovernor:
+    """Token bucket, concurrency cap and shared backoff for all requests.
+
+    Requests wait for a slot in priority order: live refreshes, then the
+    config flow, then background jobs. After a 429 or 5xx response, or a
+    failed connection, no request is sent until the backoff ends, honouring
+    ``Retry-After``. Live and interactive requests fail right away with
+    ``BackoffError`` meanwhile; background requests wait it out.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the governor.
+
+        ``rate`` None disables the token bucket. ``clock`` returns seconds
+        and only needs to be monotonic.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self._clock = clock
+        self._tokens = float(burst)
+        self._refilled = clock()
+        self._active = 0
+        # (priority, sequence, future) of the requests waiting for a slot
+        self._waiting: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._blocked_until = 0.0
+        self._failures = 0
+        # Totals for diagnostics
+        self.granted = 0
+        self.rejected = 0
+        self.backoffs = 0
+
+    @asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_LIVE) -> AsyncIterator[None]:
+        """Hold a request slot for the duration of the block.
+
+        Connection failures and timeouts inside the block count as failed
+        requests; responses are to be reported with ``observe``.
+        """
+        await self.acquire(priority)
+        try:
+            yield
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            self.observe(None)
+            raise
+        finally:
+            self.release()
+
+    async def acquire(self, priority: int = PRIORITY_LIVE) -> None:
+        """Wait for a slot; raise BackoffError if it must not wait."""
+        remaining = self._blocked_until - self._clock()
+        if remaining > 0 and priority < PRIORITY_BACKGROUND:
+            self.rejected += 1
+            raise BackoffError(f"Server backed off for another {remaining:.0f} s")
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (priority, next(self._sequence), future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before the cancellation arrived
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Return a slot."""
+        self._active -= 1
+        self._dispatch()
+
+    def observe(self, status: Optional[int], retry_after: Optional[str] = None) -> None:
+        """Record the outcome of a request; None means no response."""
+        if status is not None and status != 429 and status < 500:
+            self._failures = 0
+            return
+
+        self._failures += 1
+        self.backoffs += 1
+        delay = _parse_retry_after(retry_after)
+        if delay is None:
+            delay = BACKOFF_MIN * 2 ** (self._failures - 1)
+        delay = min(delay, BACKOFF_MAX)
+        self._blocked_until = max(self._blocked_until, self._clock() + delay)
+        _LOGGER.debug("Backing off for %.0f s after status %s", delay, status)
+
+    def _refill(self, now: float) -> None:
+        if self.rate is None:
+            return
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._refilled) * self.rate
+        )
+        self._refilled = now
+
+    def _dispatch(self) -> None:
+        """Grant slots to waiting requests in priority order."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        waiting = self._waiting
+        while waiting and self._active < self.concurrency:
+            priority, _, future = waiting[0]
+            if future.done():
+                # Cancelled while waiting
+                heapq.heappop(waiting)
+                continue
+
+            now = self._clock()
+            self._refill(now)
+            delay = 0.0
+            if priority < PRIORITY_BACKGROUND and self._blocked_until > now:
+                heapq.heappop(waiting)
+                self.rejected += 1
+                future.set_exception(BackoffError("Server backed off"))
+                continue
+            if self._blocked_until > now:
+                delay = self._blocked_until - now
+            elif self.rate is not None and self._tokens < 1:
+                delay = (1 - self._tokens) / self.rate
+            if delay > 0:
+                self._timer = asyncio.get_running_loop().call_later(
+                    delay, self._dispatch
+                )
+                return
+
+            heapq.heappop(waiting)
+            if self.rate is not None:
+                self._tokens -= 1
+            self._active += 1
+            self.granted += 1
+            future.set_result(None)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the current state for diagnostics."""
+        return {
+            "active": self._active,
+            "waiting": sum(not future.done() for _, _, future in self._waiting),
+            "tokens": round(self._tokens, 2),
+            "backoff_s": max(0.0, round(self._blocked_until - self._clock(), 1)),
+            "consecutive_failures": self._failures,
+            "granted": self.granted,
+            "rejected": self.rejected,
+            "backoffs": self.backoffs,
+        }
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the seconds to wait from a Retry-After header."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        until = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if until.tzinfo is None:
+        until = until.replace(tzinfo=dt_util.UTC)
+    return max(0.0, (until - dt_util.utcnow()).total_seconds())
+
+
+def async_get_governor(hass: HomeAssistant) -> RequestGovernor:
+    """Return the governor shared by all requests, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_GOVERNOR not in domain_data:
+        domain_data[DATA_GOVERNOR] = RequestGovernor()
+    return domain_data[DATA_GOVERNOR]
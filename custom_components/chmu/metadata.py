@@ -0,0 +1,112 @@
+"""Station catalogue shared by the config flow and the coordinator."""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import FALLBACK_STATIONS, async_fetch_stations_with_coords
+from .const import API_BASE_URL, DATA_BASE_URL, DATA_METADATA, DOMAIN
+from .geo import StationIndex
+from .governor import PRIORITY_BACKGROUND, async_get_governor
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.stations"
+STORAGE_VERSION = 1
+# ČHMÚ publishes a new metadata file every day
+METADATA_TTL = timedelta(days=1)
+
+
+class ChmuMetadata:
+    """Parsed station catalogue, kept in memory and on disk.
+
+    The catalogue is downloaded at most once per ``METADATA_TTL``. When a
+    download fails the previous catalogue keeps being served, and only when
+    nothing was ever fetched the built-in fallback stations are returned.
+    """
+
+    def __init__(self, hass: HomeAssistant, base_url: str = API_BASE_URL):
+        """Initialize the catalogue."""
+        self.hass = hass
+        self.base_url = base_url
+        self._store: Store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._lock = asyncio.Lock()
+        self._loaded = False
+        self._stations: Optional[Dict[str, Dict[str, Any]]] = None
+        self._fetched: Optional[datetime] = None
+        self._index: Optional[StationIndex] = None
+
+    async def async_get_stations_with_coords(
+        self, priority: int = PRIORITY_BACKGROUND
+    ) -> Dict[str, Dict[str, Any]]:
+        """Return stations with name, coordinates and elevation by station ID.
+
+        ``priority`` is that of the download, if one is needed.
+        """
+        async with self._lock:
+            if not self._loaded:
+                await self._async_load()
+
+            if self._stations is None or self._is_stale():
+                await self._async_revalidate(priority)
+
+            return self._stations or FALLBACK_STATIONS
+
+    async def async_get_index(
+        self, priority: int = PRIORITY_BACKGROUND
+    ) -> StationIndex:
+        """Return a spatial index over the current catalogue."""
+        stations = await self.async_get_stations_with_coords(priority)
+        if self._index is None or self._index.stations is not stations:
+            self._index = StationIndex(stations)
+        return self._index
+
+    def _is_stale(self) -> bool:
+        """Return if the catalogue is due for revalidation."""
+        return self._fetched is None or dt_util.utcnow() - self._fetched > METADATA_TTL
+
+    async def _async_load(self) -> None:
+        """Restore the catalogue saved by a previous run."""
+        self._loaded = True
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        self._stations = stored.get("stations")
+        self._fetched = dt_util.parse_datetime(stored.get("fetched") or "")
+
+    async def _async_revalidate(self, priority: int) -> None:
+        """Download a fresh catalogue, keeping the old one on failure."""
+        try:
+            stations = await async_fetch_stations_with_coords(
+                async_get_clientsession(self.hass),
+                self.base_url,
+                async_get_governor(self.hass),
+                priority,
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            _LOGGER.warning("Failed to fetch stations with coordinates: %s", e)
+            return
+
+        self._stations = stations
+        self._fetched = dt_util.utcnow()
+        await self._store.async_save(
+            {"fetched": self._fetched.isoformat(), "stations": stations}
+        )
+
+
+def async_get_metadata(hass: HomeAssistant) -> ChmuMetadata:
+    """Return the shared station catalogue, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_METADATA not in domain_data:
+        domain_data[DATA_METADATA] = ChmuMetadata(
+            hass, domain_data.get(DATA_BASE_URL, API_BASE_URL)
+        )
+    return domain_data[DATA_METADATA]
@@ -0,0 +1,190 @@
+"""Short-term nowcast extrapolated from a station's recent measurements."""
+
+from collections import deque
+from datetime import datetime, timezone
+from math import atan2, cos, degrees, radians, sin
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .aggregates import HOUR
+from .series import StationSeries
+
+# Hours forecast ahead of the newest measurement
+NOWCAST_HOURS = 3
+# Measurements a trend is fitted to
+TREND_SPAN = 3 * HOUR
+# Fewest measurements a trend is fitted to, one hour of them
+MIN_TREND_POINTS = 6
+# Share of the trend kept from one forecast hour to the next
+TREND_DAMPING = 0.8
+# Weight of a new measurement in the smoothed wind
+SMOOTHING = 0.3
+# Trend sums are moved to a new origin this often to keep them precise
+REBASE_AFTER = 24 * HOUR
+
+
+class _Trend:
+    """Least-squares line through the values of the last ``span`` seconds.
+
+    The fit is kept as running sums, so a new value costs O(1) amortized
+    instead of a refit over the whole window.
+    """
+
+    __slots__ = ("span", "entries", "origin", "n", "sx", "sy", "sxx", "sxy")
+
+    def __init__(self, span: int):
+        """Initialize the trend."""
+        self.span = span
+        self.entries: Deque[Tuple[int, float]] = deque()
+        # Timestamp x is measured from, in hours
+        self.origin = 0
+        self.n = 0
+        self.sx = 0.0
+        self.sy = 0.0
+        self.sxx = 0.0
+        self.sxy = 0.0
+
+    def add(self, timestamp: int, value: float) -> None:
+        """Add the newest value and drop those that fell out of the window."""
+        if not self.entries or timestamp - self.origin > REBASE_AFTER:
+            self._rebase(timestamp)
+        self.entries.append((timestamp, value))
+        self._sum(timestamp, value, 1)
+        start = timestamp - self.span
+        while self.entries[0][0] <= start:
+            self._sum(*self.entries.popleft(), -1)
+
+    def _sum(self, timestamp: int, value: float, sign: int) -> None:
+        x = (timestamp - self.origin) / HOUR
+        self.n += sign
+        self.sx += sign * x
+        self.sy += sign * value
+        self.sxx += sign * x * x
+        self.sxy += sign * x * value
+
+    def _rebase(self, origin: int) -> None:
+        """Recompute the sums relative to a new origin."""
+        self.origin = origin
+        self.n = 0
+        self.sx = self.sy = self.sxx = self.sxy = 0.0
+        for timestamp, value in self.entries:
+            self._sum(timestamp, value, 1)
+
+    def fit(self) -> Optional[Tuple[float, float]]:
+        """Return the fitted value at the newest entry and the slope per hour."""
+        if self.n < MIN_TREND_POINTS:
+            return None
+        denominator = self.n * self.sxx - self.sx * self.sx
+        if denominator <= 0:
+            return None
+        slope = (self.n * self.sxy - self.sx * self.sy) / denominator
+        intercept = (self.sy - slope * self.sx) / self.n
+        x = (self.entries[-1][0] - self.origin) / HOUR
+        return intercept + slope * x, slope
+
+
+class _Smoothed:
+    """Exponentially smoothed level, optionally of directions in degrees."""
+
+    __slots__ = ("direction", "x", "y")
+
+    def __init__(self, direction: bool = False):
+        """Initialize the level."""
+        self.direction = direction
+        self.x: Optional[float] = None
+        self.y = 0.0
+
+    def add(self, timestamp: int, value: float) -> None:
+        """Blend in the newest value."""
+        if self.direction:
+            angle = radians(value)
+            x, y = cos(angle), sin(angle)
+        else:
+            x, y = value, 0.0
+        if self.x is None:
+            self.x, self.y = x, y
+            return
+        self.x += SMOOTHING * (x - self.x)
+        self.y += SMOOTHING * (y - self.y)
+
+    @property
+    def value(self) -> Optional[float]:
+        """Return the level, None for directions that cancel out."""
+        if self.x is None:
+            return None
+        if not self.direction:
+            return self.x
+        if abs(self.x) < 1e-9 and abs(self.y) < 1e-9:
+            return None
+        # Rounded before wrapping, so it never rounds up to 360
+        return round(degrees(atan2(self.y, self.x)), 1) % 360
+
+
+class StationNowcast:
+    """Forecast of the next hours from the trend of recent measurements.
+
+    Temperature and pressure follow a damped least-squares trend of the
+    last three hours, wind speed and direction their smoothed level.
+    ``update`` only reads the entries appended to the series since the
+    previous call, and the forecast is built once per new interval.
+    """
+
+    def __init__(self):
+        """Initialize the models."""
+        # Result key, element and model
+        self._trends: List[Tuple[str, str, _Trend]] = [
+            ("temperature", "T", _Trend(TREND_SPAN)),
+            ("pressure", "P", _Trend(TREND_SPAN)),
+        ]
+        self._levels: List[Tuple[str, str, _Smoothed]] = [
+            ("wind_speed", "F", _Smoothed()),
+            ("wind_direction", "D", _Smoothed(direction=True)),
+        ]
+        # Newest timestamp read per element
+        self._cursors: Dict[str, int] = {}
+        self._forecast: Optional[List[Dict[str, Any]]] = None
+
+    def update(self, series: StationSeries) -> None:
+        """Fit the models to the measurements added since the last call."""
+        for _, element, model in self._trends + self._levels:
+            element_series = series.get(element)
+            if element_series is None:
+                continue
+            cursor = self._cursors.get(element)
+            entries = (
+                element_series.since(cursor) if cursor is not None else element_series
+            )
+            for timestamp, value in entries:
+                model.add(timestamp, value)
+                self._cursors[element] = timestamp
+                self._forecast = None
+
+    def forecast(self) -> List[Dict[str, Any]]:
+        """Return the forecast for each of the next ``NOWCAST_HOURS`` hours."""
+        if self._forecast is not None:
+            return self._forecast
+        if not self._cursors:
+            self._forecast = []
+            return self._forecast
+
+        latest = max(self._cursors.values())
+        fits = [(key, model.fit()) for key, _, model in self._trends]
+        levels = [(key, model.value) for key, _, model in self._levels]
+        forecast = []
+        # Sum of the damped trend over the hours so far
+        steps = 0.0
+        for hour in range(1, NOWCAST_HOURS + 1):
+            steps += TREND_DAMPING ** (hour - 1)
+            entry: Dict[str, Any] = {
+                "timestamp": datetime.fromtimestamp(
+                    latest + hour * HOUR, timezone.utc
+                ).isoformat()
+            }
+            for key, fit in fits:
+                if fit is not None:
+                    entry[key] = round(fit[0] + fit[1] * steps, 1)
+            for key, value in levels:
+                if value is not None:
+                    entry[key] = round(value, 1)
+            forecast.append(entry)
+        self._forecast = forecast
+        return forecast
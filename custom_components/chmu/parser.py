@@ -0,0 +1,221 @@
+"""Streaming, incremental parser for ČHMÚ data files."""
+
+import codecs
+import json
+import logging
+import re
+from typing import List, Optional
+
+from .series import StationSeries, parse_timestamp
+
+_LOGGER = logging.getLogger(__name__)
+
+_DECODER = json.JSONDecoder()
+_SEPARATORS = " \t\r\n,"
+_VALUES_RE = re.compile(r'"values"\s*:\s*\[')
+# Longest text that may hold a "values" key split across two chunks
+_VALUES_LOOKBEHIND = 32
+
+
+class RowStream:
+    """Extract the rows of the ``values`` array from a JSON document in chunks.
+
+    ČHMÚ files wrap their table in ``{"data": {"data": {"values": [...]}}}``.
+    Only one row at a time is decoded, so the whole document is never held in
+    memory. Everything before the ``values`` array and after its end is
+    skipped.
+    """
+
+    def __init__(self, in_values: bool = False):
+        """Initialize the stream.
+
+        ``in_values`` starts inside the array, for a fragment that continues
+        a previously read document.
+        """
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._in_values = in_values
+        # Bytes discarded from the front of the buffer so far
+        self._consumed = 0
+        self.done = False
+        # Byte offset just after the last complete row
+        self.offset: Optional[int] = None
+
+    def feed(self, chunk: bytes) -> List[list]:
+        """Add a chunk and return the rows it completed."""
+        self._buffer += self._decoder.decode(chunk)
+        return self._drain()
+
+    def close(self) -> List[list]:
+        """Flush the stream, failing if the document ended early."""
+        self._buffer += self._decoder.decode(b"", final=True)
+        rows = self._drain()
+        if not self.done:
+            if not self._in_values:
+                raise ValueError("No data values found in response")
+            raise ValueError("Truncated data file")
+        return rows
+
+    def _drain(self) -> List[list]:
+        """Decode every complete row in the buffer."""
+        buffer = self._buffer
+        rows = []
+        pos = 0
+
+        if not self._in_values:
+            match = _VALUES_RE.search(buffer)
+            if match is None:
+                # Keep a short tail in case the key is split across chunks
+                self._discard(max(len(buffer) - _VALUES_LOOKBEHIND, 0))
+                return rows
+            pos = match.end()
+            self._in_values = True
+
+        last_end = None
+        while pos < len(buffer) and not self.done:
+            char = buffer[pos]
+            if char in _SEPARATORS:
+                pos += 1
+            elif char == "[":
+                try:
+                    row, pos = _DECODER.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # Incomplete row, wait for the next chunk
+                    break
+                rows.append(row)
+                last_end = pos
+            elif char == "]":
+                self.done = True
+            else:
+                raise ValueError(
+                    f"Unexpected data in values: {buffer[pos : pos + 20]!r}"
+                )
+
+        if last_end is not None:
+            self.offset = self._consumed + len(buffer[:last_end].encode("utf-8"))
+        self._discard(pos)
+        return rows
+
+    def _discard(self, pos: int) -> None:
+        """Drop the first ``pos`` characters of the buffer."""
+        if pos:
+            self._consumed += len(self._buffer[:pos].encode("utf-8"))
+            self._buffer = self._buffer[pos:]
+
+
+class StationParser:
+    """Feed one station's daily file into its time series store.
+
+    The daily file only grows during the day. The parser remembers the newest
+    timestamp it has seen (the high-water mark) and the byte offset just after
+    the last row, so a refresh only has to look at rows appended since then.
+
+    Data is pushed in with ``begin``, ``feed`` and ``close`` as it arrives
+    from the network. Rows for other stations are dropped straight away.
+    """
+
+    def __init__(self, station_id: str, series: Optional[StationSeries] = None):
+        """Initialize the parser.
+
+        ``series`` is shared between the parsers of consecutive daily files,
+        so history survives the switch to a new file.
+        """
+        self.station_id = station_id
+        self.series = series if series is not None else StationSeries()
+        self._stream: Optional[RowStream] = None
+        self._partial = False
+        self._ordered = True
+        self._previous: Optional[str] = None
+        self._floor: Optional[str] = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the reading position, e.g. after an inconsistent read."""
+        self.high_water: Optional[str] = None
+        # Byte offset just after the last row, None when the rows are not
+        # in time order and the file cannot be read incrementally
+        self.offset: Optional[int] = None
+        self.rows_parsed = 0
+
+    def begin(self, partial: bool = False) -> None:
+        """Start reading a complete file, or the bytes appended after ``offset``.
+
+        Reading a partial file raises ValueError when the fragment does not
+        continue the previous document, in which case the caller must fall
+        back to a full download.
+        """
+        if partial and self.offset is None:
+            raise ValueError("Incremental parsing is not possible for this file")
+        self._stream = RowStream(in_values=partial)
+        self._partial = partial
+        self._ordered = True
+        self._previous = self.high_water if partial else None
+        # Rows older than this were already ingested by an earlier read
+        self._floor = self.high_water
+
+    def feed(self, chunk: bytes) -> None:
+        """Ingest the next chunk of the file."""
+        self._consume(self._stream.feed(chunk))
+
+    def close(self) -> None:
+        """Finish reading the file."""
+        stream = self._stream
+        self._stream = None
+        self._consume(stream.close())
+
+        if self._partial:
+            if stream.offset is not None:
+                self.offset += stream.offset
+        elif stream.offset is None:
+            raise ValueError("No data values found in response")
+        else:
+            self.offset = stream.offset if self._ordered else None
+
+    def parse_document(self, body: bytes) -> None:
+        """Ingest a complete daily file held in memory."""
+        self.begin()
+        self.feed(body)
+        self.close()
+
+    def _consume(self, rows: List[list]) -> None:
+        """Check the ordering of new rows and ingest them."""
+        previous = self._previous
+        for row in rows:
+            if len(row) < 3:
+                continue
+            if previous is not None and row[2] < previous:
+                if self._partial:
+                    raise ValueError("Appended rows are older than the high-water mark")
+                self._ordered = False
+            previous = row[2]
+        self._previous = previous
+        self._ingest(rows)
+
+    def _ingest(self, rows: List[list]) -> None:
+        """Append the values of the given rows to the series store."""
+        series = self.series
+        floor = self._floor
+        for row in rows:
+            if len(row) < 4:
+                continue
+
+            station_id = row[0]
+            element = row[1]
+            timestamp = row[2]
+            value = row[3]
+
+            # Only process our station's data
+            if not station_id.endswith(self.station_id):
+                continue
+
+            if floor is not None and timestamp < floor:
+                continue
+
+            # Entries already stored are ignored by the series
+            if isinstance(value, (int, float)):
+                series.append(element, parse_timestamp(timestamp), value)
+
+            if self.high_water is None or timestamp > self.high_water:
+                self.high_water = timestamp
+
+        self.rows_parsed += len(rows)
@@ -0,0 +1,151 @@
+"""On-demand profiling of the hub's refreshes."""
+
+import asyncio
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, List
+
+# Frames kept per traced allocation
+TRACEMALLOC_FRAMES = 10
+# Entries in the report and in the summary
+REPORT_FUNCTIONS = 40
+REPORT_ALLOCATIONS = 25
+SUMMARY_FUNCTIONS = 10
+
+
+class RefreshProfiler:
+    """cProfile and tracemalloc data of the next hub refreshes.
+
+    The hub calls ``enable`` and ``disable`` around each whole refresh, so
+    the fetches, JSON decoding, parsing and the entity state writes are all
+    covered. Both profilers see everything the event loop runs meanwhile,
+    including other integrations. When no profile is requested the hub does
+    not create one, so refreshes pay nothing.
+    """
+
+    def __init__(self, refreshes: int):
+        """Initialize the profiler for the given number of refreshes."""
+        self.refreshes = refreshes
+        self.profile = cProfile.Profile()
+        self.done: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.refresh_times: List[float] = []
+        self.peak_memory = 0
+        # Statistics of the allocations still held after each refresh
+        self.allocations: List[List[tracemalloc.Statistic]] = []
+        self._started = 0.0
+        self._profiling = False
+        self._owns_tracing = False
+
+    def enable(self) -> None:
+        """Start profiling a refresh."""
+        self._owns_tracing = not tracemalloc.is_tracing()
+        if self._owns_tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        else:
+            tracemalloc.reset_peak()
+        try:
+            self.profile.enable()
+        except ValueError as err:
+            # Another profiler, e.g. the profiler integration, is running
+            self._stop_tracing()
+            self.abort(err)
+            return
+        self._profiling = True
+        self._started = time.perf_counter()
+
+    def disable(self) -> None:
+        """Stop profiling a refresh; resolve ``done`` after the last one.
+
+        Profiling and tracing always stop here, also when the profile was
+        aborted or cancelled during the refresh; only its figures are lost.
+        """
+        if not self._profiling:
+            return
+        self._profiling = False
+        elapsed = time.perf_counter() - self._started
+        self.profile.disable()
+        if self.done.done():
+            self._stop_tracing()
+            return
+        self.refresh_times.append(elapsed)
+        self.peak_memory = max(self.peak_memory, tracemalloc.get_traced_memory()[1])
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),)
+        )
+        self._stop_tracing()
+        self.allocations.append(snapshot.statistics("lineno")[:REPORT_ALLOCATIONS])
+        if len(self.refresh_times) >= self.refreshes:
+            self.done.set_result(None)
+
+    def abort(self, err: Exception) -> None:
+        """Give up before all refreshes were profiled."""
+        if not self.done.done():
+            self.done.set_exception(err)
+
+    def _stop_tracing(self) -> None:
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    def write(self, path: str, started: datetime) -> None:
+        """Write the profile next to a readable report at ``path``.
+
+        The raw profile goes to ``path`` with ``.cprof`` in place of
+        ``.txt``, for tools such as snakeviz. Does blocking I/O.
+        """
+        self.profile.dump_stats(_profile_path(path))
+        stream = io.StringIO()
+        stream.write(
+            f"ČHMÚ refresh profile started {started.isoformat()}\n"
+            f"Refreshes: {', '.join(f'{t:.3f} s' for t in self.refresh_times)}\n"
+            f"Peak traced memory: {self.peak_memory / 1024:.1f} KiB\n\n"
+        )
+        stats = pstats.Stats(self.profile, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(REPORT_FUNCTIONS)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(REPORT_FUNCTIONS)
+        for number, statistics in enumerate(self.allocations, 1):
+            stream.write(f"Allocations held after refresh {number}:\n")
+            for statistic in statistics:
+                stream.write(f"  {statistic}\n")
+            stream.write("\n")
+        with open(path, "w", encoding="utf-8") as report:
+            report.write(stream.getvalue())
+
+    def summary(self, path: str) -> Dict[str, Any]:
+        """Return the figures for the service response."""
+        stats = pstats.Stats(self.profile)
+        functions = sorted(
+            stats.stats.items(),  # type: ignore[attr-defined]
+            key=lambda item: item[1][2],
+            reverse=True,
+        )[:SUMMARY_FUNCTIONS]
+        return {
+            "report": path,
+            "profile": _profile_path(path),
+            "refresh_times_s": [round(t, 4) for t in self.refresh_times],
+            "peak_memory_kib": round(self.peak_memory / 1024, 1),
+            # Functions by time spent in their own code
+            "top_functions": [
+                {
+                    "function": pstats.func_std_string(function),
+                    "calls": calls,
+                    "own_time_s": round(own_time, 4),
+                    "cumulative_s": round(cumulative, 4),
+                }
+                for function, (_, calls, own_time, cumulative, _) in functions
+            ],
+        }
+
+
+def _profile_path(path: str) -> str:
+    """Return where the raw profile of a report is written."""
+    return path.removesuffix(".txt") + ".cprof"
+
+
+def profile_file_name(started: datetime) -> str:
+    """Return the report's file name in the config directory."""
+    return f"chmu_profile.{started.strftime('%Y%m%d_%H%M%S')}.txt"
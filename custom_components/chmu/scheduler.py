@@ -0,0 +1,76 @@
+"""Publication-aware polling schedule for ČHMÚ stations."""
+
+import zlib
+from datetime import datetime, timedelta
+from typing import Optional
+
+# ČHMÚ publishes one measurement every 10 minutes
+PUBLICATION_INTERVAL = timedelta(minutes=10)
+# Initial guess of how long after an interval ends its data appears
+DEFAULT_PUBLICATION_DELAY = timedelta(minutes=8)
+MIN_PUBLICATION_DELAY = timedelta(minutes=1)
+MAX_PUBLICATION_DELAY = timedelta(minutes=30)
+# Weight of a new observation in the delay estimate
+DELAY_SMOOTHING = 0.3
+# How much earlier to try when data was already there on the first poll
+DELAY_PROBE_STEP = timedelta(seconds=15)
+# Bounded backoff while the expected interval is not published yet
+RETRY_MIN = timedelta(minutes=1)
+RETRY_MAX = timedelta(minutes=10)
+# Stations are spread over this window so they do not poll at once
+MAX_JITTER = 60
+
+
+class PublicationTracker:
+    """Learn when a station publishes data and decide when to poll it next.
+
+    After new data arrives, the next poll is planned for when the following
+    interval is expected: its timestamp plus the learned publication delay
+    plus a fixed per-station jitter. If the data is not there yet, polling
+    retries with exponential backoff up to ``RETRY_MAX``.
+    """
+
+    __slots__ = ("delay", "latest", "attempts", "jitter", "next_poll")
+
+    def __init__(self, station_id: str):
+        """Initialize the tracker."""
+        self.delay = DEFAULT_PUBLICATION_DELAY
+        self.latest: Optional[datetime] = None
+        self.attempts = 0
+        self.jitter = timedelta(seconds=zlib.crc32(station_id.encode()) % MAX_JITTER)
+        self.next_poll: Optional[datetime] = None
+
+    def is_due(self, now: datetime) -> bool:
+        """Return if the station should be polled now."""
+        return self.next_poll is None or self.next_poll <= now
+
+    def observe(self, data_time: Optional[datetime], now: datetime) -> None:
+        """Record the result of a poll.
+
+        ``data_time`` is the timestamp of the newest measurement returned, or
+        None when the poll failed.
+        """
+        if data_time is not None and (self.latest is None or data_time > self.latest):
+            if self.latest is not None:
+                # The delay observed is an upper bound: the data may have
+                # appeared any time since the previous poll
+                observed = now - data_time - self.jitter
+                if self.attempts == 0:
+                    # Found on the first try, so probe a little earlier
+                    observed = min(observed, self.delay) - DELAY_PROBE_STEP
+                self.delay += (observed - self.delay) * DELAY_SMOOTHING
+                self.delay = min(
+                    max(self.delay, MIN_PUBLICATION_DELAY), MAX_PUBLICATION_DELAY
+                )
+
+            self.latest = data_time
+            self.attempts = 0
+            self.next_poll = data_time + PUBLICATION_INTERVAL + self.delay + self.jitter
+            if self.next_poll <= now:
+                # Behind schedule, e.g. after a restart or an outage
+                self.next_poll = now + RETRY_MIN
+            return
+
+        self.attempts += 1
+        backoff = min(RETRY_MIN * 2 ** (self.attempts - 1), RETRY_MAX)
+        self.next_poll = now + backoff
@@ -1,206 +1,355 @@
 """Sensor platform for ČHMÚ Weather integration."""
 
 import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Set, Tuple
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
+    DEGREE,
     PERCENTAGE,
+    EntityCategory,
+    UnitOfPrecipitationDepth,
     UnitOfPressure,
     UnitOfSpeed,
-    UnitOfTemperature,
-    UnitOfPrecipitationDepth,
+    UnitOfTime,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
-from .const import CONF_STATION_ID, CONF_STATION_NAME, DOMAIN
+from .const import ATTR_STALE, DOMAIN, VIRTUAL_STATION_ID
+from .coordinator import entry_stations
+from .elements import ELEMENTS
+from .stats import StationStats
 
 _LOGGER = logging.getLogger(__name__)
 
 
-async def async_setup_entry(
-    hass: HomeAssistant,
-    entry: ConfigEntry,
-    async_add_entities: AddEntitiesCallback,
-) -> None:
-    """Set up ČHMÚ sensors from a config entry."""
-    coordinator = hass.data[DOMAIN][entry.entry_id]
-    station_id = entry.data[CONF_STATION_ID]
-    station_name = entry.data.get(CONF_STATION_NAME, f"Station {station_id}")
-
-    sensors = [
-        ChmuTemperatureSensor(coordinator, entry, station_id, station_name),
-        ChmuHumiditySensor(coordinator, entry, station_id, station_name),
-        ChmuPressureSensor(coordinator, entry, station_id, station_name),
-        ChmuPrecipitationSensor(coordinator, entry, station_id, station_name),
-        ChmuWindSpeedSensor(coordinator, entry, station_id, station_name),
-        ChmuWindDirectionSensor(coordinator, entry, station_id, station_name),
-    ]
+def _value(key: str) -> Callable[[Dict[str, Any]], Any]:
+    """Return an extractor of one key of a station's data."""
 
-    async_add_entities(sensors)
+    def extract(data: Dict[str, Any]) -> Any:
+        value = data.get(key)
+        return value if value not in (None, "", []) else None
 
+    return extract
 
-class ChmuSensorBase(CoordinatorEntity, SensorEntity):
-    """Base class for ČHMÚ sensors."""
 
-    def __init__(self, coordinator, entry, station_id, station_name):
-        """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._station_id = station_id
-        self._station_name = station_name
-        self._attr_has_entity_name = True
+@dataclass(frozen=True, kw_only=True)
+class ChmuSensorEntityDescription(SensorEntityDescription):
+    """Describes a ČHMÚ sensor."""
 
-    @property
-    def device_info(self):
-        """Return device information."""
-        return {
-            "identifiers": {(DOMAIN, self._station_id)},
-            "name": self._station_name,
-            "manufacturer": "ČHMÚ",
-            "model": f"Weather Station {self._station_id}",
-            "configuration_url": "https://opendata.chmi.cz",
-            "suggested_area": "Outdoors",
-        }
-
-
-class ChmuTemperatureSensor(ChmuSensorBase):
-    """Temperature sensor."""
-
-    _attr_device_class = SensorDeviceClass.TEMPERATURE
-    _attr_state_class = SensorStateClass.MEASUREMENT
-    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
-    _attr_translation_key = "temperature"
-    _attr_icon = "mdi:thermometer"
+    value_fn: Optional[Callable[[Dict[str, Any]], Any]] = None
 
-    @property
-    def unique_id(self):
-        """Return unique ID."""
-        return f"{self._station_id}_temperature"
+    def __post_init__(self) -> None:
+        """Read the value stored under the description's key by default."""
+        if self.value_fn is None:
+            object.__setattr__(self, "value_fn", _value(self.key))
 
-    @property
-    def native_value(self):
-        """Return the state."""
-        if self.coordinator.data:
-            value = self.coordinator.data.get("temperature")
-            return value if value not in (None, "", []) else None
-        return None
-
-
-class ChmuHumiditySensor(ChmuSensorBase):
-    """Humidity sensor."""
-
-    _attr_device_class = SensorDeviceClass.HUMIDITY
-    _attr_state_class = SensorStateClass.MEASUREMENT
-    _attr_native_unit_of_measurement = PERCENTAGE
-    _attr_translation_key = "humidity"
-    _attr_icon = "mdi:water-percent"
-
-    @property
-    def unique_id(self):
-        """Return unique ID."""
-        return f"{self._station_id}_humidity"
-
-    @property
-    def native_value(self):
-        """Return the state."""
-        if self.coordinator.data:
-            value = self.coordinator.data.get("humidity")
-            return value if value not in (None, "", []) else None
-        return None
-
-
-class ChmuPressureSensor(ChmuSensorBase):
-    """Pressure sensor."""
-
-    _attr_device_class = SensorDeviceClass.PRESSURE
-    _attr_state_class = SensorStateClass.MEASUREMENT
-    _attr_native_unit_of_measurement = UnitOfPressure.HPA
-    _attr_translation_key = "pressure"
-    _attr_icon = "mdi:gauge"
-
-    @property
-    def unique_id(self):
-        """Return unique ID."""
-        return f"{self._station_id}_pressure"
 
-    @property
-    def native_value(self):
-        """Return the state."""
-        if self.coordinator.data:
-            value = self.coordinator.data.get("pressure")
-            return value if value not in (None, "", []) else None
-        return None
-
-
-class ChmuPrecipitationSensor(ChmuSensorBase):
-    """Precipitation sensor."""
-
-    _attr_device_class = SensorDeviceClass.PRECIPITATION
-    _attr_state_class = SensorStateClass.TOTAL_INCREASING
-    _attr_native_unit_of_measurement = UnitOfPrecipitationDepth.MILLIMETERS
-    _attr_translation_key = "precipitation"
-    _attr_icon = "mdi:weather-rainy"
-
-    @property
-    def unique_id(self):
-        """Return unique ID."""
-        return f"{self._station_id}_precipitation"
+SENSOR_TYPES: Tuple[ChmuSensorEntityDescription, ...] = tuple(
+    ChmuSensorEntityDescription(
+        key=info.key,
+        translation_key=info.key,
+        device_class=info.device_class,
+        state_class=info.state_class,
+        native_unit_of_measurement=info.unit,
+        icon=info.icon,
+    )
+    for info in ELEMENTS.values()
+)
+# Rolling aggregates, see StationAggregates
+DERIVED_SENSOR_TYPES: Tuple[ChmuSensorEntityDescription, ...] = (
+    ChmuSensorEntityDescription(
+        key="precipitation_1h",
+        translation_key="precipitation_1h",
+        device_class=SensorDeviceClass.PRECIPITATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfPrecipitationDepth.MILLIMETERS,
+        icon="mdi:weather-rainy",
+    ),
+    ChmuSensorEntityDescription(
+        key="precipitation_3h",
+        translation_key="precipitation_3h",
+        device_class=SensorDeviceClass.PRECIPITATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfPrecipitationDepth.MILLIMETERS,
+        icon="mdi:weather-pouring",
+    ),
+    ChmuSensorEntityDescription(
+        key="precipitation_24h",
+        translation_key="precipitation_24h",
+        device_class=SensorDeviceClass.PRECIPITATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfPrecipitationDepth.MILLIMETERS,
+        icon="mdi:weather-pouring",
+    ),
+    ChmuSensorEntityDescription(
+        key="pressure_tendency_3h",
+        translation_key="pressure_tendency_3h",
+        device_class=SensorDeviceClass.PRESSURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfPressure.HPA,
+        icon="mdi:trending-up",
+    ),
+    ChmuSensorEntityDescription(
+        key="wind_gust_max_1h",
+        translation_key="wind_gust_max_1h",
+        device_class=SensorDeviceClass.WIND_SPEED,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfSpeed.METERS_PER_SECOND,
+        icon="mdi:weather-windy-variant",
+    ),
+    ChmuSensorEntityDescription(
+        key="wind_direction_mean_1h",
+        translation_key="wind_direction_mean_1h",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=DEGREE,
+        icon="mdi:compass",
+    ),
+)
 
-    @property
-    def native_value(self):
-        """Return the state."""
-        if self.coordinator.data:
-            value = self.coordinator.data.get("precipitation")
-            return value if value not in (None, "", []) else None
-        return None
 
+@dataclass(frozen=True, kw_only=True)
+class ChmuDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor of a station's runtime counters."""
+
+    stats_fn: Callable[[StationStats, datetime], Any]
+
+
+def _milliseconds(seconds: Optional[float]) -> Optional[float]:
+    """Return a duration in milliseconds, rounded for display."""
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+DIAGNOSTIC_SENSOR_TYPES: Tuple[ChmuDiagnosticSensorEntityDescription, ...] = (
+    ChmuDiagnosticSensorEntityDescription(
+        key="fetch_duration",
+        translation_key="fetch_duration",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        stats_fn=lambda stats, now: _milliseconds(stats.last_fetch_time),
+    ),
+    ChmuDiagnosticSensorEntityDescription(
+        key="parse_duration",
+        translation_key="parse_duration",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        stats_fn=lambda stats, now: _milliseconds(stats.last_parse_time),
+    ),
+    ChmuDiagnosticSensorEntityDescription(
+        key="data_lag",
+        translation_key="data_lag",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        stats_fn=lambda stats, now: stats.lag(now),
+    ),
+    ChmuDiagnosticSensorEntityDescription(
+        key="cache_hit_ratio",
+        translation_key="cache_hit_ratio",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:cached",
+        stats_fn=lambda stats, now: (
+            round(stats.cache_hit_ratio * 100, 1)
+            if stats.cache_hit_ratio is not None
+            else None
+        ),
+    ),
+    ChmuDiagnosticSensorEntityDescription(
+        key="refresh_failures",
+        translation_key="refresh_failures",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:alert-circle-outline",
+        stats_fn=lambda stats, now: stats.failures,
+    ),
+)
+# Sensors created for every station, whether it reports them or not
+DEFAULT_SENSOR_KEYS = {info.key for info in ELEMENTS.values() if info.default}
 
-class ChmuWindSpeedSensor(ChmuSensorBase):
-    """Wind speed sensor."""
 
-    _attr_device_class = SensorDeviceClass.WIND_SPEED
-    _attr_state_class = SensorStateClass.MEASUREMENT
-    _attr_native_unit_of_measurement = UnitOfSpeed.METERS_PER_SECOND
-    _attr_translation_key = "wind_speed"
-    _attr_icon = "mdi:weather-windy"
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up ČHMÚ sensors from a config entry.
 
-    @property
-    def unique_id(self):
-        """Return unique ID."""
-        return f"{self._station_id}_wind_speed"
+    Every station of the entry gets its own device.
+    """
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    stations = entry_stations(entry.data)
+    device_infos = {
+        station_id: station_device_info(station_id, station_name)
+        for station_id, station_name in stations.items()
+    }
+
+    # A virtual station is not polled, its sources have the counters
+    async_add_entities(
+        ChmuDiagnosticSensor(coordinator, description, station_id, device_info)
+        for station_id, device_info in device_infos.items()
+        if station_id != VIRTUAL_STATION_ID
+        for description in DIAGNOSTIC_SENSOR_TYPES
+    )
+
+    added: Dict[str, Set[str]] = {station_id: set() for station_id in stations}
+
+    @callback
+    def _async_add_reported_sensors() -> None:
+        """Add sensors of elements the stations started reporting."""
+        entities = []
+        for station_id, station_added in added.items():
+            data = coordinator.data.get(station_id) if coordinator.data else None
+            new = [
+                description
+                for description in SENSOR_TYPES + DERIVED_SENSOR_TYPES
+                if description.key not in station_added
+                and (
+                    description.key in DEFAULT_SENSOR_KEYS
+                    or (data is not None and description.key in data)
+                )
+            ]
+            station_added.update(description.key for description in new)
+            entities.extend(
+                ChmuSensor(
+                    coordinator, description, station_id, device_infos[station_id]
+                )
+                for description in new
+            )
+        if entities:
+            async_add_entities(entities)
+
+    _async_add_reported_sensors()
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_reported_sensors))
+
+
+def station_device_info(station_id: str, station_name: str) -> DeviceInfo:
+    """Return the device of a station."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, station_id)},
+        name=station_name,
+        manufacturer="ČHMÚ",
+        model=(
+            "Virtual Station"
+            if station_id == VIRTUAL_STATION_ID
+            else f"Weather Station {station_id}"
+        ),
+        configuration_url="https://opendata.chmi.cz",
+        suggested_area="Outdoors",
+    )
+
+
+class ChmuSensor(CoordinatorEntity, SensorEntity):
+    """ČHMÚ sensor of one station value.
+
+    The state is only written when the value, its measurement time,
+    availability or staleness changed, not on every coordinator refresh.
+    """
+
+    entity_description: ChmuSensorEntityDescription
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator,
+        description: ChmuSensorEntityDescription,
+        station_id: str,
+        device_info: DeviceInfo,
+    ):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._station_id = station_id
+        self._attr_unique_id = f"{station_id}_{description.key}"
+        self._attr_device_info = device_info
+        # (available, value, timestamp, stale) last written to the state
+        self._snapshot: Optional[Tuple[bool, Any, Any, bool]] = None
+        self._update_from_data()
 
     @property
-    def native_value(self):
-        """Return the state."""
+    def station_data(self) -> Optional[Dict[str, Any]]:
+        """Return this station's slice of the shared coordinator data."""
         if self.coordinator.data:
-            value = self.coordinator.data.get("wind_speed")
-            return value if value not in (None, "", []) else None
+            return self.coordinator.data.get(self._station_id)
         return None
 
-
-class ChmuWindDirectionSensor(ChmuSensorBase):
-    """Wind direction sensor."""
-
-    _attr_state_class = SensorStateClass.MEASUREMENT
-    _attr_native_unit_of_measurement = "°"
-    _attr_translation_key = "wind_direction"
-    _attr_icon = "mdi:compass"
+    def _update_from_data(self) -> bool:
+        """Refresh the cached state; return if it changed."""
+        data = self.station_data
+        available = self.coordinator.last_update_success and data is not None
+        if data is None:
+            snapshot = (available, None, None, False)
+        else:
+            snapshot = (
+                available,
+                self.entity_description.value_fn(data),
+                data.get("timestamp"),
+                bool(data.get(ATTR_STALE)),
+            )
+        if snapshot == self._snapshot:
+            return False
+
+        self._snapshot = snapshot
+        self._attr_available = available
+        self._attr_native_value = snapshot[1]
+        self._attr_extra_state_attributes = (
+            {ATTR_STALE: snapshot[3]} if data is not None else None
+        )
+        return True
 
     @property
-    def unique_id(self):
-        """Return unique ID."""
-        return f"{self._station_id}_wind_direction"
-
-    @property
-    def native_value(self):
-        """Return the state."""
-        if self.coordinator.data:
-            value = self.coordinator.data.get("wind_direction")
-            return value if value not in (None, "", []) else None
-        return None
+    def available(self) -> bool:
+        """Return if the station was included in the last refresh."""
+        return self._attr_available
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if something changed."""
+        if self._update_from_data():
+            self.async_write_ha_state()
+
+
+class ChmuDiagnosticSensor(ChmuSensor):
+    """Runtime counter of one polled station, disabled by default."""
+
+    entity_description: ChmuDiagnosticSensorEntityDescription
+
+    def _update_from_data(self) -> bool:
+        """Refresh the cached state from the station's counters."""
+        stats = self.coordinator.get_stats(self._station_id)
+        value = (
+            self.entity_description.stats_fn(stats, dt_util.utcnow())
+            if stats is not None
+            else None
+        )
+        snapshot = (stats is not None, value, None, False)
+        if snapshot == self._snapshot:
+            return False
+
+        self._snapshot = snapshot
+        self._attr_available = snapshot[0]
+        self._attr_native_value = value
+        return True
@@ -0,0 +1,142 @@
+"""Compact in-memory time series of ČHMÚ measurements."""
+
+from array import array
+from datetime import datetime
+from typing import Dict, Iterator, Optional, Tuple
+
+# Two days of 10-minute intervals, so rolling windows survive midnight
+DEFAULT_CAPACITY = 288
+
+
+def parse_timestamp(timestamp: str) -> int:
+    """Convert an ISO 8601 measurement time to epoch seconds."""
+    return int(datetime.fromisoformat(timestamp).timestamp())
+
+
+def _exact(value: float) -> float:
+    """Undo float32 rounding, e.g. 12.300000190734863 back to 12.3."""
+    return float(f"{value:.7g}")
+
+
+class ElementSeries:
+    """Ring buffer of (epoch seconds, float32 value) for one element.
+
+    Values are stored in two preallocated arrays, so appending allocates
+    nothing and a full buffer overwrites its oldest entry.
+    """
+
+    __slots__ = ("_times", "_values", "_head", "_size")
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """Initialize the buffer."""
+        self._times = array("q", bytes(8 * capacity))
+        self._values = array("f", bytes(4 * capacity))
+        # Index the next entry is written to
+        self._head = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of stored entries."""
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        """Return the maximum number of entries."""
+        return len(self._times)
+
+    def append(self, timestamp: int, value: float) -> bool:
+        """Add an entry newer than the last one; return False if it is not."""
+        if self._size and timestamp <= self._times[self._head - 1]:
+            return False
+        self._times[self._head] = timestamp
+        self._values[self._head] = value
+        self._head = (self._head + 1) % len(self._times)
+        if self._size < len(self._times):
+            self._size += 1
+        return True
+
+    def latest(self) -> Optional[Tuple[int, float]]:
+        """Return the newest (timestamp, value) entry."""
+        if not self._size:
+            return None
+        index = self._head - 1
+        return self._times[index], _exact(self._values[index])
+
+    def __iter__(self) -> Iterator[Tuple[int, float]]:
+        """Iterate over the entries, oldest first."""
+        capacity = len(self._times)
+        start = self._head - self._size
+        for offset in range(self._size):
+            index = (start + offset) % capacity
+            yield self._times[index], _exact(self._values[index])
+
+    def since(self, timestamp: int) -> Iterator[Tuple[int, float]]:
+        """Iterate over the entries newer than ``timestamp``, oldest first."""
+        capacity = len(self._times)
+        # Walk back from the newest entry to find where the window starts
+        count = 0
+        while count < self._size and self._times[self._head - 1 - count] > timestamp:
+            count += 1
+        for offset in range(count, 0, -1):
+            index = (self._head - offset) % capacity
+            yield self._times[index], _exact(self._values[index])
+
+    def columns(self, after: Optional[int] = None) -> Tuple[array, array]:
+        """Return copies of the times and raw float32 values, oldest first.
+
+        Only entries newer than ``after`` are included when it is given.
+        The values are sliced straight out of the buffer, without a Python
+        object per entry.
+        """
+        count = self._size
+        if after is not None:
+            count = 0
+            while count < self._size and self._times[self._head - 1 - count] > after:
+                count += 1
+        start = (self._head - count) % len(self._times)
+        end = start + count
+        if end <= len(self._times):
+            return self._times[start:end], self._values[start:end]
+        end -= len(self._times)
+        return (
+            self._times[start:] + self._times[:end],
+            self._values[start:] + self._values[:end],
+        )
+
+
+class StationSeries:
+    """Recent measurements of all elements reported by one station."""
+
+    __slots__ = ("capacity", "elements")
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """Initialize the store."""
+        self.capacity = capacity
+        self.elements: Dict[str, ElementSeries] = {}
+
+    def append(self, element: str, timestamp: int, value: float) -> bool:
+        """Add a measurement; return False if it is not newer than the last."""
+        series = self.elements.get(element)
+        if series is None:
+            series = self.elements[element] = ElementSeries(self.capacity)
+        return series.append(timestamp, value)
+
+    def get(self, element: str) -> Optional[ElementSeries]:
+        """Return the series of an element, if the station reports it."""
+        return self.elements.get(element)
+
+    def latest(self, element: str) -> Optional[Tuple[int, float]]:
+        """Return the newest (timestamp, value) of an element."""
+        series = self.elements.get(element)
+        return series.latest() if series is not None else None
+
+    def latest_time(self) -> Optional[int]:
+        """Return the timestamp of the newest measurement of any element."""
+        return max(
+            (series.latest()[0] for series in self.elements.values() if series),
+            default=None,
+        )
+
+    def __bool__(self) -> bool:
+        """Return if any measurement is stored."""
+        return any(self.elements.values())
@@ -0,0 +1,102 @@
+"""Services for ČHMÚ Weather integration."""
+
+from datetime import timedelta
+from typing import Any, Dict
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .backfill import BACKFILL_DEFAULT_DAYS, BACKFILL_MAX_DAYS
+from .const import (
+    ATTR_END_DATE,
+    ATTR_REFRESHES,
+    ATTR_START_DATE,
+    CONF_STATION_ID,
+    DATA_HUB,
+    DOMAIN,
+    SERVICE_BACKFILL,
+    SERVICE_PROFILE,
+)
+from .profiler import profile_file_name
+
+# Most refreshes one profile may cover, about an hour of them
+PROFILE_MAX_REFRESHES = 6
+
+BACKFILL_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_STATION_ID): cv.string,
+        vol.Optional(ATTR_START_DATE): cv.date,
+        vol.Optional(ATTR_END_DATE): cv.date,
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_REFRESHES, default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=PROFILE_MAX_REFRESHES)
+        ),
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+
+    async def async_handle_backfill(call: ServiceCall) -> None:
+        """Import historical statistics of one or all configured stations."""
+        hub = hass.data.get(DOMAIN, {}).get(DATA_HUB)
+        if hub is None or not hub.station_ids:
+            raise HomeAssistantError("No ČHMÚ stations are configured")
+
+        if CONF_STATION_ID in call.data:
+            station_ids = [call.data[CONF_STATION_ID]]
+            if station_ids[0] not in hub.station_ids:
+                raise HomeAssistantError(f"Station {station_ids[0]} is not configured")
+        else:
+            station_ids = hub.station_ids
+
+        # Today's data is still being recorded by the sensors
+        end = call.data.get(ATTR_END_DATE, dt_util.utcnow().date() - timedelta(days=1))
+        start = call.data.get(
+            ATTR_START_DATE, end - timedelta(days=BACKFILL_DEFAULT_DAYS - 1)
+        )
+        if start > end:
+            raise HomeAssistantError("Start date must not be after end date")
+        if (end - start).days >= BACKFILL_MAX_DAYS:
+            raise HomeAssistantError(
+                f"Backfill is limited to {BACKFILL_MAX_DAYS} days at a time"
+            )
+
+        hub.async_start_backfill(station_ids, start, end)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_BACKFILL, async_handle_backfill, schema=BACKFILL_SCHEMA
+    )
+
+    async def async_handle_profile(call: ServiceCall) -> Dict[str, Any]:
+        """Profile the next refreshes and write the results to the config dir."""
+        hub = hass.data.get(DOMAIN, {}).get(DATA_HUB)
+        if hub is None or not hub.station_ids:
+            raise HomeAssistantError("No ČHMÚ stations are configured")
+
+        started = dt_util.now()
+        try:
+            profiler = await hub.async_profile(call.data[ATTR_REFRESHES])
+        except (RuntimeError, ValueError) as err:
+            raise HomeAssistantError(f"Profiling failed: {err}") from err
+
+        path = hass.config.path(profile_file_name(started))
+        await hass.async_add_executor_job(profiler.write, path, started)
+        return profiler.summary(path)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_handle_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,135 @@
+"""Runtime performance counters of one station."""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+class StationStats:
+    """Counters updated on every refresh of a station.
+
+    Recording only adds to a few numbers, so it is cheap enough to stay on
+    for every refresh.
+    """
+
+    __slots__ = (
+        "refreshes",
+        "failures",
+        "requests",
+        "not_modified",
+        "partial",
+        "not_found",
+        "bytes",
+        "rows",
+        "fetch_time",
+        "parse_time",
+        "last_fetch_time",
+        "last_parse_time",
+        "last_bytes",
+        "last_error",
+        "last_success",
+        "data_time",
+    )
+
+    def __init__(self):
+        """Initialize the counters."""
+        self.refreshes = 0
+        self.failures = 0
+        # Responses by kind
+        self.requests = 0
+        self.not_modified = 0
+        self.partial = 0
+        self.not_found = 0
+        # Totals over all refreshes
+        self.bytes = 0
+        self.rows = 0
+        self.fetch_time = 0.0
+        self.parse_time = 0.0
+        # The last refresh
+        self.last_fetch_time: Optional[float] = None
+        self.last_parse_time = 0.0
+        self.last_bytes = 0
+        self.last_error: Optional[str] = None
+        self.last_success: Optional[datetime] = None
+        # Timestamp of the newest measurement
+        self.data_time: Optional[datetime] = None
+
+    def start_refresh(self) -> None:
+        """Reset the figures of the last refresh."""
+        self.refreshes += 1
+        self.last_parse_time = 0.0
+        self.last_bytes = 0
+
+    def add_response(self, status: int) -> None:
+        """Count a response by its HTTP status."""
+        self.requests += 1
+        if status == 304:
+            self.not_modified += 1
+        elif status == 206:
+            self.partial += 1
+        elif status == 404:
+            self.not_found += 1
+
+    def add_chunk(self, size: int, rows: int, parse_time: float) -> None:
+        """Count a downloaded chunk and the time spent parsing it."""
+        self.bytes += size
+        self.last_bytes += size
+        self.rows += rows
+        self.parse_time += parse_time
+        self.last_parse_time += parse_time
+
+    def end_refresh(
+        self,
+        fetch_time: float,
+        now: datetime,
+        data_time: Optional[datetime] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Record the outcome of a refresh."""
+        self.fetch_time += fetch_time
+        self.last_fetch_time = fetch_time
+        if error is not None:
+            self.failures += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+            return
+        self.last_success = now
+        if data_time is not None:
+            self.data_time = data_time
+
+    @property
+    def cache_hit_ratio(self) -> Optional[float]:
+        """Return the share of requests answered with 304 Not Modified."""
+        return self.not_modified / self.requests if self.requests else None
+
+    def lag(self, now: datetime) -> Optional[float]:
+        """Return the age of the newest measurement in seconds."""
+        if self.data_time is None:
+            return None
+        return (now - self.data_time).total_seconds()
+
+    def as_dict(self, now: datetime) -> Dict[str, Any]:
+        """Return the counters and the figures derived from them."""
+        refreshes = self.refreshes or 1
+        return {
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "last_success": self.last_success.isoformat()
+            if self.last_success
+            else None,
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "partial": self.partial,
+            "not_found": self.not_found,
+            "cache_hit_ratio": self.cache_hit_ratio,
+            "bytes": self.bytes,
+            "last_bytes": self.last_bytes,
+            "rows_scanned": self.rows,
+            "fetch_ms_last": self.last_fetch_time * 1000
+            if self.last_fetch_time is not None
+            else None,
+            "fetch_ms_mean": self.fetch_time / refreshes * 1000,
+            "parse_ms_last": self.last_parse_time * 1000,
+            "parse_ms_mean": self.parse_time / refreshes * 1000,
+            "data_time": self.data_time.isoformat() if self.data_time else None,
+            "data_lag_s": self.lag(now),
+        }
@@ -0,0 +1,134 @@
+"""Virtual station interpolated from the stations around a location."""
+
+from math import atan2, cos, degrees, exp, radians, sin
+from typing import Any, Dict, List, Optional, Tuple
+
+from .const import ATTR_STALE
+
+# Stations a virtual station is interpolated from
+VIRTUAL_STATION_COUNT = 4
+# Power of the inverse distance weights
+IDW_POWER = 2
+# Closer stations are weighted as if they were this far, in km
+MIN_DISTANCE = 0.5
+
+# Standard atmosphere temperature lapse rate in K/m
+LAPSE_RATE = 0.0065
+GRAVITY = 9.80665
+# Specific gas constant of dry air in J/(kg·K)
+GAS_CONSTANT = 287.05
+STANDARD_TEMPERATURE = 288.15
+
+# Keys corrected for the elevation difference
+TEMPERATURE_KEYS = {"temperature", "grass_temperature"}
+PRESSURE_KEYS = {"pressure"}
+# Keys averaged as vectors
+DIRECTION_KEYS = {"wind_direction", "wind_gust_direction", "wind_direction_mean_1h"}
+# Keys that are not measurements
+SKIPPED_KEYS = {"station_name", "timestamp", ATTR_STALE}
+
+
+class VirtualStation:
+    """Estimate every element at a location from nearby stations.
+
+    Values are combined with inverse distance weighting. The weights and
+    elevation differences only depend on the station positions, so they are
+    computed once and each refresh costs one weighted sum per element.
+    Temperature is first moved to the location's elevation with the standard
+    lapse rate and pressure with the hypsometric equation.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        elevation: Optional[float],
+        sources: List[Tuple[str, float, Optional[float]]],
+    ):
+        """Initialize the station.
+
+        ``sources`` are the (station ID, distance in km, elevation) of the
+        stations to interpolate from.
+        """
+        self.name = name
+        self.station_ids = [station_id for station_id, _, _ in sources]
+        self._weights = [
+            1 / max(distance, MIN_DISTANCE) ** IDW_POWER for _, distance, _ in sources
+        ]
+        # Height of the location above each station, None when unknown
+        self._rise = [
+            elevation - station_elevation
+            if elevation is not None and station_elevation is not None
+            else None
+            for _, _, station_elevation in sources
+        ]
+
+    def interpolate(self, data: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Return the estimated values from the current station results."""
+        available = [
+            (data[station_id], weight, rise)
+            for station_id, weight, rise in zip(
+                self.station_ids, self._weights, self._rise
+            )
+            if station_id in data
+        ]
+        if not available:
+            return None
+
+        # Weighted sums per key: total, total weight, and x/y for directions
+        sums: Dict[str, List[float]] = {}
+        for result, weight, rise in available:
+            for key, value in result.items():
+                if (
+                    key in SKIPPED_KEYS
+                    or isinstance(value, bool)
+                    or not isinstance(value, (int, float))
+                ):
+                    continue
+                acc = sums.get(key)
+                if acc is None:
+                    acc = sums[key] = [0.0, 0.0, 0.0]
+                if key in DIRECTION_KEYS:
+                    angle = radians(value)
+                    acc[0] += weight * cos(angle)
+                    acc[2] += weight * sin(angle)
+                else:
+                    acc[0] += weight * _at_elevation(key, value, rise, result)
+                acc[1] += weight
+
+        estimate: Dict[str, Any] = {}
+        for key, (total, weight, y) in sums.items():
+            if key in DIRECTION_KEYS:
+                estimate[key] = round(degrees(atan2(y, total)), 1) % 360
+            else:
+                estimate[key] = round(total / weight, 2)
+
+        estimate["station_name"] = self.name
+        estimate["timestamp"] = max(
+            (
+                result["timestamp"]
+                for result, _, _ in available
+                if result.get("timestamp")
+            ),
+            default=None,
+        )
+        estimate[ATTR_STALE] = any(result.get(ATTR_STALE) for result, _, _ in available)
+        return estimate
+
+
+def _at_elevation(
+    key: str, value: float, rise: Optional[float], result: Dict[str, Any]
+) -> float:
+    """Move a station value to the location's elevation."""
+    if rise is None:
+        return value
+    if key in TEMPERATURE_KEYS:
+        return value - LAPSE_RATE * rise
+    if key in PRESSURE_KEYS:
+        temperature = result.get("temperature")
+        kelvin = (
+            temperature + 273.15
+            if isinstance(temperature, (int, float))
+            else STANDARD_TEMPERATURE
+        )
+        return value * exp(-GRAVITY * rise / (GAS_CONSTANT * kelvin))
+    return value
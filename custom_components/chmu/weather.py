@@ -0,0 +1,186 @@
+"""Weather platform for ČHMÚ Weather integration."""
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from homeassistant.components.weather import (
+    ATTR_CONDITION_POURING,
+    ATTR_CONDITION_RAINY,
+    ATTR_CONDITION_SNOWY,
+    ATTR_CONDITION_SNOWY_RAINY,
+    ATTR_CONDITION_SUNNY,
+    ATTR_CONDITION_WINDY,
+    Forecast,
+    WeatherEntity,
+    WeatherEntityFeature,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    UnitOfPrecipitationDepth,
+    UnitOfPressure,
+    UnitOfSpeed,
+    UnitOfTemperature,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import ATTR_STALE, DOMAIN
+from .coordinator import entry_stations
+from .derived import apparent_temperature, beaufort, dew_point
+from .sensor import station_device_info
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_BEAUFORT = "beaufort"
+ATTR_PRESSURE_TENDENCY = "pressure_tendency_3h"
+
+# Precipitation in the last hour, in mm, from which it is pouring
+POURING_RATE = 4.0
+# Beaufort force from which it is windy
+WINDY_FORCE = 6
+# Seconds of sunshine in a 10-minute interval for it to count as sunny
+SUNNY_SECONDS = 300
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up a ČHMÚ weather entity for every station of a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities(
+        ChmuWeather(
+            coordinator, station_id, station_device_info(station_id, station_name)
+        )
+        for station_id, station_name in entry_stations(entry.data).items()
+    )
+
+
+def _condition(data: Dict[str, Any], force: Optional[int]) -> Optional[str]:
+    """Estimate the condition from what a station measures.
+
+    Stations do not report cloud cover, so without precipitation, wind or
+    sunshine the condition is unknown.
+    """
+    rain = data.get("precipitation_1h", data.get("precipitation"))
+    if rain:
+        temperature = data.get("temperature")
+        if temperature is not None and temperature <= 0:
+            return ATTR_CONDITION_SNOWY
+        if temperature is not None and temperature <= 2:
+            return ATTR_CONDITION_SNOWY_RAINY
+        return ATTR_CONDITION_POURING if rain >= POURING_RATE else ATTR_CONDITION_RAINY
+    if force is not None and force >= WINDY_FORCE:
+        return ATTR_CONDITION_WINDY
+    sunshine = data.get("sunshine_duration")
+    if sunshine is not None and sunshine >= SUNNY_SECONDS:
+        return ATTR_CONDITION_SUNNY
+    return None
+
+
+class ChmuWeather(CoordinatorEntity, WeatherEntity):
+    """Current weather at one station and its nowcast for the next hours.
+
+    Dew point, apparent temperature, Beaufort force, the condition and the
+    hourly forecast are derived once per new interval and cached; refreshes
+    that bring no new measurement leave the entity untouched.
+    """
+
+    _attr_has_entity_name = True
+    _attr_name = None
+    _attr_native_temperature_unit = UnitOfTemperature.CELSIUS
+    _attr_native_pressure_unit = UnitOfPressure.HPA
+    _attr_native_wind_speed_unit = UnitOfSpeed.METERS_PER_SECOND
+    _attr_native_precipitation_unit = UnitOfPrecipitationDepth.MILLIMETERS
+    _attr_supported_features = WeatherEntityFeature.FORECAST_HOURLY
+
+    def __init__(self, coordinator, station_id: str, device_info: DeviceInfo):
+        """Initialize the weather entity."""
+        super().__init__(coordinator)
+        self._station_id = station_id
+        self._attr_unique_id = f"{station_id}_weather"
+        self._attr_device_info = device_info
+        # (available, timestamp, stale) the cached values were derived for
+        self._derived_for: Optional[Tuple[bool, Optional[str], bool]] = None
+        # Built on first request after each new interval
+        self._forecast: Optional[List[Forecast]] = None
+        self._update_from_data()
+
+    def _update_from_data(self) -> bool:
+        """Derive the state from a new interval; return if it changed."""
+        data = (self.coordinator.data or {}).get(self._station_id)
+        available = self.coordinator.last_update_success and data is not None
+        key = (
+            available,
+            data.get("timestamp") if data else None,
+            bool(data.get(ATTR_STALE)) if data else False,
+        )
+        if key == self._derived_for:
+            return False
+
+        self._derived_for = key
+        self._attr_available = available
+        self._forecast = None
+        if data is None:
+            return True
+
+        temperature = data.get("temperature")
+        humidity = data.get("humidity")
+        wind_speed = data.get("wind_speed")
+        force = beaufort(wind_speed) if wind_speed is not None else None
+
+        self._attr_native_temperature = temperature
+        self._attr_humidity = humidity
+        self._attr_native_pressure = data.get("pressure")
+        self._attr_native_wind_speed = wind_speed
+        self._attr_wind_bearing = data.get("wind_direction")
+        self._attr_native_wind_gust_speed = data.get("wind_gust")
+        self._attr_native_dew_point = (
+            dew_point(temperature, humidity)
+            if temperature is not None and humidity is not None
+            else None
+        )
+        self._attr_native_apparent_temperature = (
+            apparent_temperature(temperature, humidity, wind_speed)
+            if temperature is not None
+            and humidity is not None
+            and wind_speed is not None
+            else None
+        )
+        self._attr_condition = _condition(data, force)
+        self._attr_extra_state_attributes = {
+            ATTR_PRESSURE_TENDENCY: data.get(ATTR_PRESSURE_TENDENCY),
+            ATTR_BEAUFORT: force,
+            ATTR_STALE: key[2],
+        }
+        return True
+
+    async def async_forecast_hourly(self) -> Optional[List[Forecast]]:
+        """Return the nowcast of the next hours."""
+        if self._forecast is None:
+            self._forecast = [
+                Forecast(
+                    datetime=entry["timestamp"],
+                    native_temperature=entry.get("temperature"),
+                    native_pressure=entry.get("pressure"),
+                    native_wind_speed=entry.get("wind_speed"),
+                    wind_bearing=entry.get("wind_direction"),
+                )
+                for entry in self.coordinator.get_forecast(self._station_id) or []
+            ]
+        return self._forecast
+
+    @property
+    def available(self) -> bool:
+        """Return if the station was included in the last refresh."""
+        return self._attr_available
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state and push the forecast only for a new interval."""
+        if self._update_from_data():
+            self.async_write_ha_state()
+            self.hass.async_create_task(self.async_update_listeners(("hourly",)))
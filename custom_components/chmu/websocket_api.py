@@ -0,0 +1,156 @@
+"""WebSocket API serving the in-memory station series to frontend cards."""
+
+import base64
+import sys
+from typing import Any, Dict, List, Optional
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import CONF_STATION_ID, DATA_HUB, DOMAIN
+from .elements import ELEMENTS
+from .series import ElementSeries, StationSeries
+
+ATTR_ELEMENTS = "elements"
+
+# Sensor key to element code, e.g. temperature to T
+ELEMENT_CODES = {info.key: code for code, info in ELEMENTS.items()}
+
+SERIES_SCHEMA = {
+    vol.Required(CONF_STATION_ID): str,
+    vol.Optional(ATTR_ELEMENTS): [vol.In(ELEMENT_CODES)],
+}
+
+
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Register the integration's websocket commands."""
+    websocket_api.async_register_command(hass, websocket_series)
+    websocket_api.async_register_command(hass, websocket_subscribe_series)
+
+
+def _encode(series: ElementSeries, after: Optional[int] = None) -> Dict[str, Any]:
+    """Encode the entries of an element newer than ``after`` as columns.
+
+    ``start`` is the first timestamp in epoch seconds and ``deltas`` the
+    seconds between consecutive timestamps. ``values`` are little-endian
+    float32 in base64.
+    """
+    times, values = series.columns(after)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return {
+        "start": times[0] if times else None,
+        "deltas": [times[i] - times[i - 1] for i in range(1, len(times))],
+        "values": base64.b64encode(values.tobytes()).decode(),
+    }
+
+
+def _get_series(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> Optional[StationSeries]:
+    """Return the series of the requested station, or send an error."""
+    hub = hass.data.get(DOMAIN, {}).get(DATA_HUB)
+    series = hub.get_series(msg[CONF_STATION_ID]) if hub is not None else None
+    if not series:
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_NOT_FOUND,
+            f"No series of station {msg[CONF_STATION_ID]}",
+        )
+        return None
+    return series
+
+
+def _element_keys(series: StationSeries, msg: dict) -> List[str]:
+    """Return the requested keys, by default every key the station reports."""
+    if ATTR_ELEMENTS in msg:
+        return msg[ATTR_ELEMENTS]
+    return [key for key, code in ELEMENT_CODES.items() if series.get(code)]
+
+
+@websocket_api.websocket_command({vol.Required("type"): "chmu/series", **SERIES_SCHEMA})
+@callback
+def websocket_series(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Return the series of a station's elements kept in memory."""
+    series = _get_series(hass, connection, msg)
+    if series is None:
+        return
+    connection.send_result(
+        msg["id"],
+        {
+            key: _encode(element_series)
+            for key in _element_keys(series, msg)
+            if (element_series := series.get(ELEMENT_CODES[key])) is not None
+        },
+    )
+
+
+@websocket_api.websocket_command(
+    {vol.Required("type"): "chmu/series/subscribe", **SERIES_SCHEMA}
+)
+@callback
+def websocket_subscribe_series(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Send the series of a station's elements, then the new intervals.
+
+    After every hub refresh that brought new measurements, an event with
+    only the entries newer than those already sent is pushed. When the
+    station is dropped or the hub shuts down, the subscription ends with an
+    error, so the card can subscribe again.
+    """
+    series = _get_series(hass, connection, msg)
+    if series is None:
+        return
+    hub = hass.data[DOMAIN][DATA_HUB]
+    station_id = msg[CONF_STATION_ID]
+    keys = _element_keys(series, msg)
+    # Newest timestamp sent per key
+    sent: Dict[str, int] = {}
+
+    @callback
+    def _async_end() -> None:
+        """Unsubscribe and tell the card the series is gone."""
+        unsubscribe = connection.subscriptions.pop(msg["id"], None)
+        if unsubscribe is None:
+            return
+        unsubscribe()
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_NOT_FOUND,
+            f"No series of station {station_id}",
+        )
+
+    @callback
+    def _async_send_new() -> None:
+        """Send what is newer than the last message."""
+        current = hub.get_series(station_id)
+        if current is None:
+            _async_end()
+            return
+        update = {}
+        for key in keys:
+            element_series = current.get(ELEMENT_CODES[key])
+            latest = element_series.latest() if element_series is not None else None
+            if latest is None or latest[0] == sent.get(key):
+                continue
+            update[key] = _encode(element_series, sent.get(key))
+            sent[key] = latest[0]
+        if update:
+            connection.send_message(websocket_api.event_message(msg["id"], update))
+
+    remove_listener = hub.async_add_listener(_async_send_new)
+    remove_shutdown_listener = hub.async_on_shutdown(_async_end)
+
+    @callback
+    def _async_unsubscribe() -> None:
+        remove_listener()
+        remove_shutdown_listener()
+
+    connection.subscriptions[msg["id"]] = _async_unsubscribe
+    connection.send_result(msg["id"])
+    _async_send_new()
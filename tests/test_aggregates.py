@@ -0,0 +1,124 @@
+"""Tests for the rolling-window aggregates."""
+
+import random
+from math import atan2, cos, degrees, radians, sin
+
+import pytest
+
+from custom_components.chmu.aggregates import (
+    HOUR,
+    INTERVAL,
+    StationAggregates,
+    WindowDirection,
+)
+from custom_components.chmu.series import StationSeries
+
+START = 1_790_000_000 // INTERVAL * INTERVAL
+
+# Result key, element and span of each window
+WINDOWS = [
+    ("precipitation_1h", "SRA10M", HOUR),
+    ("precipitation_3h", "SRA10M", 3 * HOUR),
+    ("precipitation_24h", "SRA10M", 24 * HOUR),
+    ("wind_gust_max_1h", "Fmax", HOUR),
+    ("wind_direction_mean_1h", "D", HOUR),
+    ("pressure_tendency_3h", "P", 3 * HOUR),
+]
+
+
+def _measurements(rng, intervals):
+    """Return (element, timestamp, value) with some intervals missing."""
+    measurements = []
+    pressure = 980.0
+    for interval in range(intervals):
+        timestamp = START + interval * INTERVAL
+        pressure += rng.uniform(-0.5, 0.5)
+        values = {
+            "SRA10M": rng.choice((0.0, 0.0, 0.1, 0.4, 2.3)),
+            "Fmax": round(rng.uniform(0, 20), 1),
+            "D": float(rng.randint(0, 359)),
+            "P": round(pressure, 1),
+        }
+        for element, value in values.items():
+            # Stations miss an interval now and then
+            if rng.random() > 0.05:
+                measurements.append((element, timestamp, value))
+    return measurements
+
+
+def _expected(entries, key, span):
+    """Compute a window from scratch over all entries of its element."""
+    latest = entries[-1][0]
+    first = entries[0][0]
+    start = latest - span
+    inside = [value for timestamp, value in entries if timestamp > start]
+    if key == "pressure_tendency_3h":
+        if first > start:
+            return None
+        reference = [value for timestamp, value in entries if timestamp <= start][-1]
+        return round(entries[-1][1] - reference, 1)
+    if first > start + INTERVAL:
+        return None
+    if key.startswith("precipitation"):
+        return round(sum(inside), 2)
+    if key == "wind_gust_max_1h":
+        return max(inside)
+    x = sum(cos(radians(value)) for value in inside)
+    y = sum(sin(radians(value)) for value in inside)
+    return round(degrees(atan2(y, x)), 1) % 360
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_updates_match_a_full_recomputation(seed):
+    """After every batch of new data each window equals a fresh computation."""
+    rng = random.Random(seed)
+    measurements = _measurements(rng, 30 * 6)
+    series = StationSeries()
+    aggregates = StationAggregates()
+    seen = {}
+
+    position = 0
+    while position < len(measurements):
+        # Refreshes bring anything from one row to a few hours of data
+        batch = measurements[position : position + rng.randint(1, 80)]
+        position += len(batch)
+        for element, timestamp, value in batch:
+            series.append(element, timestamp, value)
+            seen.setdefault(element, []).append((timestamp, value))
+
+        values = aggregates.update(series)
+        for key, element, span in WINDOWS:
+            expected = _expected(seen[element], key, span)
+            if expected is None:
+                assert key not in values
+            else:
+                assert values[key] == pytest.approx(expected, abs=1e-9), key
+
+
+def test_windows_wait_for_their_whole_span():
+    """A window has no value until the element was seen for its span."""
+    series = StationSeries()
+    aggregates = StationAggregates()
+    for interval in range(6):
+        series.append("SRA10M", START + interval * INTERVAL, 0.5)
+    series.append("P", START, 990.0)
+    series.append("P", START + 5 * INTERVAL, 991.0)
+
+    values = aggregates.update(series)
+    assert values["precipitation_1h"] == 3.0
+    assert "precipitation_3h" not in values
+    assert "pressure_tendency_3h" not in values
+
+
+def test_mean_direction_across_north():
+    """Directions either side of north average to north, not south."""
+    window = WindowDirection(HOUR)
+    for offset, direction in enumerate((350.0, 10.0, 355.0, 5.0)):
+        window.add(START + offset * INTERVAL, direction)
+    assert window.value == 0.0
+
+    # Opposite directions cancel out
+    window = WindowDirection(HOUR)
+    window.add(START, 90.0)
+    window.add(START + INTERVAL, 270.0)
+    assert window.value is None
@@ -0,0 +1,186 @@
+"""Tests for the ČHMÚ station API."""
+
+import asyncio
+import contextlib
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from homeassistant.util import dt as dt_util
+
+from benchmarks import generators
+from custom_components.chmu.api import (
+    ChmuApi,
+    FetchResult,
+    _async_fetch_metadata_values,
+)
+
+STATION = generators.station_ids(1)[0]
+DAY = date(2026, 10, 1)
+
+
+class FakeResponse:
+    """Streamed response body of a file."""
+
+    def __init__(self, body):
+        self.status = 200
+        self.content = self
+        self._body = body
+
+    async def iter_chunked(self, size):
+        for start in range(0, len(self._body), size):
+            yield self._body[start : start + size]
+
+
+class FakeClient:
+    """Serves files by name; missing ones are not found."""
+
+    base_url = "https://opendata.test"
+
+    def __init__(self):
+        self.files = {}
+        self.requested = []
+
+    async def async_fetch(self, url, validators=None, start=None, reader=None):
+        name = url.rsplit("/", 1)[1]
+        self.requested.append(name)
+        if name not in self.files:
+            return FetchResult(404, None, {})
+        return FetchResult(200, await reader(FakeResponse(self.files[name])), {})
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Let the test set the current UTC time."""
+    now = [datetime(2026, 10, 1, 12, 5, tzinfo=timezone.utc)]
+    monkeypatch.setattr(dt_util, "utcnow", lambda: now[0])
+    return now
+
+
+def test_timestamp_without_temperature(clock):
+    """The result is timed by the newest element, not by the wall clock."""
+    client = FakeClient()
+    api = ChmuApi(client, STATION)
+    # Humidity is one interval ahead of precipitation, no temperature at all
+    rows = generators.data_rows([STATION], DAY, 73, ("H",))
+    rows += generators.data_rows([STATION], DAY, 72, ("SRA10M",))
+    client.files[generators.data_filename(STATION, DAY)] = generators._document(
+        generators.DATA_HEADER, rows
+    )
+
+    result = asyncio.run(api.async_get_current_data())
+    assert "temperature" not in result
+    assert result["timestamp"] == "2026-10-01T12:00:00+00:00"
+    assert api.stats.data_time == datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+
+    # Unchanged data keeps its timestamp on the next refresh
+    clock[0] = clock[0].replace(minute=7)
+    assert asyncio.run(api.async_get_current_data())["timestamp"] == result["timestamp"]
+
+
+def _publish(client, day, intervals):
+    """Publish a station's file for a day with ``intervals`` from midnight."""
+    client.files[generators.data_filename(STATION, day)] = generators.data_file(
+        [STATION], day, intervals, ("T",)
+    )
+
+
+def test_previous_day_is_served_within_the_grace_window(clock):
+    """Right after midnight yesterday's file stands in for today's."""
+    client = FakeClient()
+    _publish(client, date(2026, 9, 30), 144)
+    clock[0] = datetime(2026, 10, 1, 0, 30, tzinfo=timezone.utc)
+
+    result = asyncio.run(ChmuApi(client, STATION).async_get_current_data())
+    assert result["timestamp"] == "2026-09-30T23:50:00+00:00"
+    assert client.requested == [
+        generators.data_filename(STATION, date(2026, 9, 30)),
+        generators.data_filename(STATION, date(2026, 10, 1)),
+    ]
+
+
+def test_previous_day_is_not_served_after_the_grace_window(clock):
+    """Starting later with only yesterday's file published is an error."""
+    client = FakeClient()
+    _publish(client, date(2026, 9, 30), 144)
+    clock[0] = datetime(2026, 10, 1, 2, 0, tzinfo=timezone.utc)
+
+    with pytest.raises(ValueError):
+        asyncio.run(ChmuApi(client, STATION).async_get_current_data())
+
+
+def test_rollover_at_utc_midnight(clock):
+    """The new file takes over once it has rows; until then the old one stays."""
+    client = FakeClient()
+    api = ChmuApi(client, STATION)
+    yesterday, today = date(2026, 9, 30), date(2026, 10, 1)
+
+    async def run():
+        _publish(client, yesterday, 143)
+        clock[0] = datetime(2026, 9, 30, 23, 55, tzinfo=timezone.utc)
+        timestamps = [(await api.async_get_current_data())["timestamp"]]
+
+        # Past midnight the new file is missing, then empty
+        _publish(client, yesterday, 144)
+        clock[0] = datetime(2026, 10, 1, 0, 5, tzinfo=timezone.utc)
+        timestamps.append((await api.async_get_current_data())["timestamp"])
+        _publish(client, today, 0)
+        clock[0] = datetime(2026, 10, 1, 0, 10, tzinfo=timezone.utc)
+        timestamps.append((await api.async_get_current_data())["timestamp"])
+
+        _publish(client, today, 2)
+        clock[0] = datetime(2026, 10, 1, 0, 20, tzinfo=timezone.utc)
+        timestamps.append((await api.async_get_current_data())["timestamp"])
+        return timestamps
+
+    assert asyncio.run(run()) == [
+        "2026-09-30T23:40:00+00:00",
+        "2026-09-30T23:50:00+00:00",
+        "2026-09-30T23:50:00+00:00",
+        "2026-10-01T00:10:00+00:00",
+    ]
+    # The series continues across the two files
+    times = [timestamp for timestamp, _ in api.series.get("T")]
+    assert times == sorted(times)
+    assert len(times) == 146
+
+
+def test_missing_new_file_after_the_grace_window(clock):
+    """A station that publishes nothing today stops being served."""
+    client = FakeClient()
+    api = ChmuApi(client, STATION)
+    _publish(client, date(2026, 9, 30), 144)
+
+    async def run():
+        clock[0] = datetime(2026, 9, 30, 23, 55, tzinfo=timezone.utc)
+        await api.async_get_current_data()
+        clock[0] = datetime(2026, 10, 1, 0, 55, tzinfo=timezone.utc)
+        await api.async_get_current_data()
+        clock[0] = datetime(2026, 10, 1, 1, 5, tzinfo=timezone.utc)
+        with pytest.raises(ValueError, match="No data published today"):
+            await api.async_get_current_data()
+
+    asyncio.run(run())
+
+
+class FakeSession:
+    """Answers every request with 404 and records the URLs."""
+
+    def __init__(self):
+        self.urls = []
+
+    @contextlib.asynccontextmanager
+    async def get(self, url, **kwargs):
+        self.urls.append(url)
+        yield SimpleNamespace(status=404, headers={})
+
+
+def test_metadata_file_is_named_by_the_utc_day(clock):
+    """Just after local midnight the metadata file is still yesterday's (UTC)."""
+    session = FakeSession()
+    clock[0] = datetime(2026, 9, 30, 22, 30, tzinfo=timezone.utc)
+
+    with pytest.raises(ValueError):
+        asyncio.run(_async_fetch_metadata_values(session, "https://opendata.test"))
+    assert session.urls[0].endswith("/meta1-20260930.json")
@@ -0,0 +1,148 @@
+"""Tests for the backfill of long-term statistics into a real recorder."""
+
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+
+import aiohttp
+import pytest
+
+from homeassistant import config_entries, loader
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.statistics import statistics_during_period
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er, recorder, translation
+from homeassistant.setup import async_setup_component
+
+from benchmarks import generators
+from benchmarks.server import StandInServer
+from custom_components.chmu.api import ChmuClient
+from custom_components.chmu.backfill import async_backfill_station
+from custom_components.chmu.const import DOMAIN
+from custom_components.chmu.governor import RequestGovernor
+from custom_components.chmu.series import parse_timestamp
+
+STATION = generators.station_ids(1)[0]
+FIRST_DAY = date(2026, 10, 1)
+DAYS = 7
+PRECIPITATION = f"{DOMAIN}:{STATION}_precipitation"
+
+
+def _day(number):
+    return FIRST_DAY + timedelta(days=number)
+
+
+async def _async_read(hass, statistic_id, types):
+    rows = await get_instance(hass).async_add_executor_job(
+        statistics_during_period,
+        hass,
+        datetime(2000, 1, 1, tzinfo=timezone.utc),
+        None,
+        {statistic_id},
+        "hour",
+        None,
+        types,
+    )
+    return rows.get(statistic_id, [])
+
+
+def _backfill(tmp_path, ranges):
+    """Import the given ranges of days in order and return the stored rows.
+
+    Returns the precipitation sum rows and the temperature mean rows.
+    """
+
+    async def run():
+        server = StandInServer()
+        base_url = await server.async_start()
+        for number in range(DAYS + 2):
+            server.files[
+                f"/now/data/{generators.data_filename(STATION, _day(number))}"
+            ] = generators.data_file([STATION], _day(number), seed=number)
+
+        config_dir = tmp_path / "config"
+        config_dir.mkdir(parents=True)
+        hass = HomeAssistant(str(config_dir))
+        loader.async_setup(hass)
+        translation.async_setup(hass)
+        recorder.async_initialize_recorder(hass)
+        hass.config_entries = config_entries.ConfigEntries(hass, {})
+        await hass.config_entries.async_initialize()
+        await er.async_load(hass)
+        entity_id = (
+            er.async_get(hass)
+            .async_get_or_create("sensor", DOMAIN, f"{STATION}_temperature")
+            .entity_id
+        )
+        await hass.async_start()
+        db_url = f"sqlite:///{config_dir / 'home-assistant_v2.db'}"
+        assert await async_setup_component(
+            hass, "recorder", {"recorder": {"db_url": db_url}}
+        )
+        await hass.async_block_till_done()
+
+        try:
+            async with aiohttp.ClientSession() as session:
+                client = ChmuClient(session, base_url, RequestGovernor(rate=None))
+                for first, last in ranges:
+                    await async_backfill_station(
+                        hass, client, STATION, "Station", _day(first), _day(last)
+                    )
+                    await get_instance(hass).async_block_till_done()
+            return (
+                await _async_read(hass, PRECIPITATION, {"state", "sum"}),
+                await _async_read(hass, entity_id, {"mean", "min", "max"}),
+            )
+        finally:
+            await hass.async_stop()
+            await server.async_stop()
+
+    return asyncio.run(run())
+
+
+def _hourly(element):
+    """Return the values of an element by hour of the whole range."""
+    range_start = datetime(2026, 10, 1, tzinfo=timezone.utc).timestamp()
+    range_stop = range_start + DAYS * 86400
+    hours = {}
+    for number in range(DAYS + 1):
+        for row in generators.data_rows([STATION], _day(number), seed=number):
+            if row[1] != element:
+                continue
+            # A 10-minute value belongs to the hour its interval ends in
+            hour = (parse_timestamp(row[2]) - 1) // 3600 * 3600
+            if range_start <= hour < range_stop:
+                hours.setdefault(hour, []).append(row[3])
+    return hours
+
+
+def test_hourly_statistics_match_the_files(tmp_path):
+    """Every hour of the range holds the 10-minute values that end in it."""
+    precipitation, temperature = _backfill(tmp_path, [(0, DAYS - 1)])
+
+    totals = _hourly("SRA10M")
+    assert [row["start"] for row in precipitation] == sorted(totals)
+    total = 0.0
+    for row in precipitation:
+        total += sum(totals[row["start"]])
+        assert row["state"] == pytest.approx(sum(totals[row["start"]]))
+        assert row["sum"] == pytest.approx(total)
+
+    values = _hourly("T")
+    assert len(temperature) == len(values) == DAYS * 24
+    for row in temperature:
+        hour = values[row["start"]]
+        assert len(hour) == 6
+        assert row["mean"] == pytest.approx(sum(hour) / 6)
+        assert row["min"] == pytest.approx(min(hour))
+        assert row["max"] == pytest.approx(max(hour))
+
+
+def test_sum_stays_continuous_across_imports_in_any_order(tmp_path):
+    """Ranges imported out of order, overlapping or again give one sum."""
+    reference, _ = _backfill(tmp_path / "reference", [(0, DAYS - 1)])
+    mixed, _ = _backfill(tmp_path / "mixed", [(4, 6), (0, 2), (1, 5), (3, 3)])
+
+    assert [row["start"] for row in mixed] == [row["start"] for row in reference]
+    for row, expected in zip(mixed, reference):
+        assert row["state"] == pytest.approx(expected["state"])
+        assert row["sum"] == pytest.approx(expected["sum"])
@@ -0,0 +1,73 @@
+"""Tests for the hub coordinator shared by all config entries."""
+
+import asyncio
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.chmu.coordinator import async_get_hub
+
+TIMESTAMP = "2026-10-01T12:00:00+00:00"
+
+
+def _run(test, tmp_path):
+    """Run a test coroutine with a Home Assistant instance."""
+
+    async def run():
+        hass = HomeAssistant(str(tmp_path))
+        try:
+            await test(hass)
+        finally:
+            await hass.async_stop(force=True)
+
+    asyncio.run(run())
+
+
+def test_station_removed_during_a_refresh(tmp_path):
+    """A station whose entry unloads mid-refresh is dropped, not an error."""
+
+    async def test(hass):
+        hub = async_get_hub(hass)
+        hub.async_add_station("11111", "Kept")
+        hub.async_add_station("22222", "Removed")
+
+        async def kept():
+            await asyncio.sleep(0)
+            return {"timestamp": TIMESTAMP, "temperature": 10.0}
+
+        async def removed():
+            hub.async_remove_station("22222")
+            return {"timestamp": TIMESTAMP, "temperature": 20.0}
+
+        hub._apis["11111"].async_get_current_data = kept
+        hub._apis["22222"].async_get_current_data = removed
+
+        await hub.async_refresh()
+        assert hub.last_update_success
+        assert set(hub.data) == {"11111"}
+        assert set(hub._snapshot_data()) == {"11111"}
+        assert set(hub._snapshot) == {"11111"}
+        await hub.async_shutdown()
+
+    _run(test, tmp_path)
+
+
+def test_station_removed_during_its_first_fetch(tmp_path):
+    """A single-station fetch tolerates the station going away meanwhile."""
+
+    async def test(hass):
+        hub = async_get_hub(hass)
+        hub.async_add_station("22222", "Removed")
+
+        async def removed():
+            hub.async_remove_station("22222")
+            return {"timestamp": TIMESTAMP, "temperature": 20.0}
+
+        hub._apis["22222"].async_get_current_data = removed
+
+        result = await hub.async_refresh_station("22222")
+        assert result["temperature"] == 20.0
+        assert "22222" not in (hub.data or {})
+        assert hub.get_tracker("22222") is None
+        await hub.async_shutdown()
+
+    _run(test, tmp_path)
@@ -0,0 +1,89 @@
+"""Tests for the spatial index of the station catalogue."""
+
+import random
+from math import asin, cos, radians, sin, sqrt
+
+import pytest
+
+from custom_components.chmu.geo import EARTH_RADIUS, StationIndex
+
+
+def _haversine(lat1, lon1, lat2, lon2):
+    dlat = radians(lat2 - lat1)
+    dlon = radians(lon2 - lon1)
+    a = (
+        sin(dlat / 2) ** 2
+        + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS * asin(sqrt(a))
+
+
+def _catalogue(count, seed=1):
+    rng = random.Random(seed)
+    stations = {
+        f"{n:05d}": {
+            "name": f"Station {n}",
+            "latitude": rng.uniform(48.5, 51.1),
+            "longitude": rng.uniform(12.0, 18.9),
+        }
+        for n in range(count)
+    }
+    # Stations without coordinates are not indexed
+    stations["99999"] = {"name": "Unknown", "latitude": None, "longitude": None}
+    return stations
+
+
+def _brute_force(stations, latitude, longitude):
+    return sorted(
+        (
+            _haversine(latitude, longitude, info["latitude"], info["longitude"]),
+            station_id,
+        )
+        for station_id, info in stations.items()
+        if info["latitude"] is not None
+    )
+
+
+QUERIES = [(49.0 + n * 0.17, 12.5 + n * 0.43) for n in range(15)]
+
+
+@pytest.mark.parametrize("latitude,longitude", QUERIES)
+def test_nearest_matches_brute_force(latitude, longitude):
+    """The k nearest stations and their distances match a full scan."""
+    stations = _catalogue(500)
+    index = StationIndex(stations)
+    expected = _brute_force(stations, latitude, longitude)
+
+    for k in (1, 3, 10):
+        found = index.nearest(latitude, longitude, k)
+        assert [station_id for station_id, _ in found] == [
+            station_id for _, station_id in expected[:k]
+        ]
+        for (_, distance), (reference, _) in zip(found, expected):
+            assert distance == pytest.approx(reference, abs=1e-6)
+
+
+@pytest.mark.parametrize("latitude,longitude", QUERIES)
+def test_within_matches_brute_force(latitude, longitude):
+    """Stations within a radius match a full scan, closest first."""
+    stations = _catalogue(500)
+    index = StationIndex(stations)
+    expected = _brute_force(stations, latitude, longitude)
+
+    for radius in (5, 25, 80):
+        found = index.within(latitude, longitude, radius)
+        assert [station_id for station_id, _ in found] == [
+            station_id for distance, station_id in expected if distance <= radius
+        ]
+
+
+def test_small_and_empty_catalogues():
+    """Asking for more stations than indexed returns all of them."""
+    stations = _catalogue(3)
+    index = StationIndex(stations)
+
+    assert len(index) == 3
+    assert len(index.nearest(50.0, 15.0, 10)) == 3
+    assert index.nearest(50.0, 15.0, 0) == []
+    assert StationIndex({}).nearest(50.0, 15.0) == []
+    assert StationIndex({}).within(50.0, 15.0, 100) == []
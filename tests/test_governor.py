@@ -0,0 +1,161 @@
+"""Tests for the request governor shared by all ČHMÚ requests."""
+
+import asyncio
+from datetime import timedelta
+from email.utils import format_datetime
+
+import pytest
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.chmu.governor import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_LIVE,
+    BackoffError,
+    RequestGovernor,
+    _parse_retry_after,
+)
+
+
+def test_slots_are_granted_in_priority_order():
+    """Waiting requests get a freed slot by priority, then in arrival order."""
+
+    async def run():
+        governor = RequestGovernor(rate=None, concurrency=1)
+        await governor.acquire()
+        granted = []
+
+        async def request(name, priority):
+            await governor.acquire(priority)
+            granted.append(name)
+            governor.release()
+
+        tasks = [
+            asyncio.create_task(request(name, priority))
+            for name, priority in (
+                ("backfill", PRIORITY_BACKGROUND),
+                ("flow", PRIORITY_INTERACTIVE),
+                ("refresh 1", PRIORITY_LIVE),
+                ("refresh 2", PRIORITY_LIVE),
+            )
+        ]
+        await asyncio.sleep(0)
+        assert granted == []
+        governor.release()
+        await asyncio.gather(*tasks)
+        return granted
+
+    assert asyncio.run(run()) == ["refresh 1", "refresh 2", "flow", "backfill"]
+
+
+def test_concurrency_cap():
+    """No more requests than the cap hold a slot at once."""
+
+    async def run():
+        governor = RequestGovernor(rate=None, concurrency=2)
+        active = peak = 0
+
+        async def request():
+            nonlocal active, peak
+            async with governor.slot():
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(request() for _ in range(6)))
+        return peak, governor.granted
+
+    assert asyncio.run(run()) == (2, 6)
+
+
+def test_token_bucket_spaces_requests_after_the_burst():
+    """Requests beyond the burst wait for tokens at the configured rate."""
+
+    async def run():
+        governor = RequestGovernor(rate=50.0, burst=2)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(4):
+            async with governor.slot():
+                pass
+        return loop.time() - start
+
+    # Two requests from the burst, two more at 20 ms each
+    assert asyncio.run(run()) >= 0.035
+
+
+def test_backoff_rejects_live_and_delays_background():
+    """During a backoff live requests fail fast and background ones wait."""
+
+    async def run():
+        governor = RequestGovernor(rate=None)
+        governor.observe(429, "0.1")
+        loop = asyncio.get_running_loop()
+
+        with pytest.raises(BackoffError):
+            await governor.acquire(PRIORITY_LIVE)
+        with pytest.raises(BackoffError):
+            await governor.acquire(PRIORITY_INTERACTIVE)
+
+        start = loop.time()
+        async with governor.slot(PRIORITY_BACKGROUND):
+            waited = loop.time() - start
+        return waited, governor.rejected
+
+    waited, rejected = asyncio.run(run())
+    assert waited >= 0.09
+    assert rejected == 2
+
+
+def test_backoff_doubles_and_resets():
+    """Consecutive failures double the backoff; a success resets it."""
+    now = [1000.0]
+    governor = RequestGovernor(rate=None, clock=lambda: now[0])
+
+    governor.observe(503)
+    assert governor.as_dict()["backoff_s"] == 2.0
+    governor.observe(None)
+    assert governor.as_dict()["backoff_s"] == 4.0
+    assert governor.as_dict()["consecutive_failures"] == 2
+
+    now[0] += 10
+    governor.observe(200)
+    assert governor.as_dict()["backoff_s"] == 0.0
+    assert governor.as_dict()["consecutive_failures"] == 0
+
+    # Client errors other than 429 are not the server's fault
+    governor.observe(404)
+    assert governor.as_dict()["backoffs"] == 2
+
+
+def test_waiting_request_can_be_cancelled():
+    """A cancelled request does not keep its place or a slot."""
+
+    async def run():
+        governor = RequestGovernor(rate=None, concurrency=1)
+        await governor.acquire()
+        waiting = asyncio.create_task(governor.acquire(PRIORITY_BACKGROUND))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        governor.release()
+        await asyncio.wait_for(governor.acquire(), 1)
+        return governor.as_dict()
+
+    state = asyncio.run(run())
+    assert state["active"] == 1
+    assert state["waiting"] == 0
+
+
+def test_parse_retry_after():
+    """Retry-After is read as seconds or as an HTTP date."""
+    assert _parse_retry_after(None) is None
+    assert _parse_retry_after("120") == 120.0
+    assert _parse_retry_after("-5") == 0.0
+    assert _parse_retry_after("soon") is None
+
+    date = format_datetime(dt_util.utcnow() + timedelta(seconds=60), usegmt=True)
+    assert _parse_retry_after(date) == pytest.approx(60, abs=2)
@@ -0,0 +1,94 @@
+"""Tests for the streaming parser of ČHMÚ data files."""
+
+import json
+
+import pytest
+
+from custom_components.chmu.parser import RowStream, StationParser
+
+STATION = "0-20000-0-11520"
+
+
+def _document(rows, title="Praha-Ruzyně – měření"):
+    """Return a daily file with non-ASCII text before and inside the rows."""
+    return json.dumps(
+        {
+            "data": {
+                "type": "DataCollection",
+                "title": title,
+                "data": {
+                    "header": "STATION,ELEMENT,DT,VAL,FLAG,QUALITY",
+                    "values": rows,
+                },
+            }
+        },
+        ensure_ascii=False,
+    ).encode()
+
+
+def _rows(count, flag="ž"):
+    return [
+        [STATION, "T", f"2026-10-01T{hour:02d}:00:00Z", 10.0 + hour, flag, 0.0]
+        for hour in range(count)
+    ]
+
+
+def _feed(stream, document, size):
+    rows = []
+    for start in range(0, len(document), size):
+        rows.extend(stream.feed(document[start : start + size]))
+    rows.extend(stream.close())
+    return rows
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64])
+def test_offset_with_multibyte_text_split_across_chunks(size):
+    """The offset counts bytes, also when characters straddle chunks."""
+    rows = _rows(5)
+    document = _document(rows)
+    stream = RowStream()
+
+    assert _feed(stream, document, size) == rows
+    # Just after the last row, before the closing bracket of the array
+    assert stream.offset == document.rindex(b"]]") + 1
+    assert stream.done
+
+
+def test_offset_continues_a_fragment():
+    """A fragment read from the offset continues the previous document."""
+    document = _document(_rows(3))
+    longer = _document(_rows(6))
+    stream = RowStream()
+    _feed(stream, document, 5)
+    assert longer[: stream.offset] == document[: stream.offset]
+
+    tail = RowStream(in_values=True)
+    assert _feed(tail, longer[stream.offset :], 3) == _rows(6)[3:]
+    assert stream.offset + tail.offset == longer.rindex(b"]]") + 1
+
+
+def test_truncated_document():
+    """A document cut off inside the array is an error."""
+    document = _document(_rows(3))
+    stream = RowStream()
+    stream.feed(document[:-20])
+    with pytest.raises(ValueError):
+        stream.close()
+
+
+def test_incremental_parse_matches_full_parse():
+    """Reading the appended bytes gives the same series as a full read."""
+    document = _document(_rows(3))
+    longer = _document(_rows(6))
+
+    parser = StationParser("11520")
+    parser.parse_document(document)
+    parser.begin(partial=True)
+    for start in range(parser.offset, len(longer), 4):
+        parser.feed(longer[start : start + 4])
+    parser.close()
+
+    full = StationParser("11520")
+    full.parse_document(longer)
+    assert list(parser.series.get("T")) == list(full.series.get("T"))
+    assert parser.offset == full.offset
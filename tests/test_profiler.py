@@ -0,0 +1,88 @@
+"""Tests for the on-demand refresh profiler."""
+
+import asyncio
+import sys
+import tracemalloc
+
+import pytest
+
+from custom_components.chmu.profiler import RefreshProfiler
+
+
+def _work():
+    return sum(n * n for n in range(10000))
+
+
+def _assert_stopped():
+    assert sys.getprofile() is None
+    assert not tracemalloc.is_tracing()
+
+
+def test_profile_resolves_after_the_last_refresh():
+    """Each refresh is recorded and profiling stops in between."""
+
+    async def run():
+        profiler = RefreshProfiler(2)
+        for _ in range(2):
+            assert not profiler.done.done()
+            profiler.enable()
+            _work()
+            profiler.disable()
+            _assert_stopped()
+        await profiler.done
+        return profiler
+
+    profiler = asyncio.run(run())
+    assert len(profiler.refresh_times) == 2
+    assert len(profiler.allocations) == 2
+    assert profiler.summary("/tmp/chmu_profile.txt")["top_functions"]
+
+
+def test_abort_during_a_refresh_stops_profiling():
+    """A hub shut down mid-refresh leaves no profiler or tracing behind."""
+
+    async def run():
+        profiler = RefreshProfiler(2)
+        profiler.enable()
+        _work()
+        profiler.abort(RuntimeError("The hub was shut down"))
+        profiler.disable()
+        _assert_stopped()
+        with pytest.raises(RuntimeError):
+            await profiler.done
+        return profiler
+
+    assert asyncio.run(run()).refresh_times == []
+
+
+def test_cancelled_service_call_during_a_refresh_stops_profiling():
+    """Cancelling the waiting service call leaves no profiler behind."""
+
+    async def run():
+        profiler = RefreshProfiler(1)
+        waiting = asyncio.ensure_future(profiler.done)
+        profiler.enable()
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert profiler.done.cancelled()
+        profiler.disable()
+        _assert_stopped()
+        return profiler
+
+    assert asyncio.run(run()).refresh_times == []
+
+
+def test_disable_without_enable_is_harmless():
+    """Ending a refresh that was never profiled records nothing."""
+
+    async def run():
+        profiler = RefreshProfiler(1)
+        profiler.disable()
+        return profiler
+
+    profiler = asyncio.run(run())
+    assert profiler.refresh_times == []
+    assert not profiler.done.done()
+    _assert_stopped()
@@ -0,0 +1,124 @@
+"""Tests for the publication-aware polling schedule."""
+
+from datetime import datetime, timedelta, timezone
+
+from custom_components.chmu.scheduler import (
+    DEFAULT_PUBLICATION_DELAY,
+    DELAY_PROBE_STEP,
+    DELAY_SMOOTHING,
+    MAX_PUBLICATION_DELAY,
+    MIN_PUBLICATION_DELAY,
+    PUBLICATION_INTERVAL,
+    RETRY_MAX,
+    RETRY_MIN,
+    PublicationTracker,
+)
+
+START = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def test_first_result_plans_the_next_interval():
+    """The next poll is when the following interval should be published."""
+    tracker = PublicationTracker("11520")
+    assert tracker.is_due(START)
+
+    now = START + timedelta(minutes=9)
+    tracker.observe(START, now)
+
+    expected = START + PUBLICATION_INTERVAL + DEFAULT_PUBLICATION_DELAY
+    assert tracker.next_poll == expected + tracker.jitter
+    assert tracker.delay == DEFAULT_PUBLICATION_DELAY
+    assert not tracker.is_due(now)
+    assert tracker.is_due(tracker.next_poll)
+
+
+def test_behind_schedule_retries_soon():
+    """Old data, e.g. after a restart, does not plan a poll in the past."""
+    tracker = PublicationTracker("11520")
+    now = START + timedelta(hours=2)
+    tracker.observe(START, now)
+    assert tracker.next_poll == now + RETRY_MIN
+
+
+def test_late_publication_raises_the_delay():
+    """Data found after retries moves the delay towards what was observed."""
+    tracker = PublicationTracker("11520")
+    tracker.observe(START, START + timedelta(minutes=9))
+
+    data_time = START + PUBLICATION_INTERVAL
+    tracker.observe(START, tracker.next_poll)
+    assert tracker.attempts == 1
+
+    now = data_time + timedelta(minutes=14) + tracker.jitter
+    tracker.observe(data_time, now)
+    observed = timedelta(minutes=14)
+    expected = DEFAULT_PUBLICATION_DELAY + (
+        (observed - DEFAULT_PUBLICATION_DELAY) * DELAY_SMOOTHING
+    )
+    assert tracker.delay == expected
+    assert tracker.attempts == 0
+    assert tracker.latest == data_time
+
+
+def test_data_found_on_the_first_try_probes_earlier():
+    """Each first-try hit lowers the delay, down to the minimum."""
+    tracker = PublicationTracker("11520")
+    tracker.observe(START, START + timedelta(minutes=9))
+
+    delays = []
+    data_time = START
+    for _ in range(150):
+        data_time += PUBLICATION_INTERVAL
+        tracker.observe(data_time, tracker.next_poll)
+        delays.append(tracker.delay)
+
+    first = DEFAULT_PUBLICATION_DELAY - DELAY_PROBE_STEP * DELAY_SMOOTHING
+    assert delays[0] == first
+    assert delays == sorted(delays, reverse=True)
+    assert delays[-1] == MIN_PUBLICATION_DELAY
+
+
+def test_delay_is_capped():
+    """A very late publication does not push the delay past the maximum."""
+    tracker = PublicationTracker("11520")
+    tracker.observe(START, START + timedelta(minutes=9))
+    tracker.observe(None, tracker.next_poll)
+
+    data_time = START + PUBLICATION_INTERVAL
+    tracker.observe(data_time, data_time + timedelta(hours=12))
+    tracker.observe(None, data_time + timedelta(hours=12))
+    tracker.observe(data_time + PUBLICATION_INTERVAL, data_time + timedelta(days=2))
+    assert tracker.delay == MAX_PUBLICATION_DELAY
+
+
+def test_backoff_while_nothing_new_is_published():
+    """Failed or unchanged polls back off exponentially up to the cap."""
+    tracker = PublicationTracker("11520")
+    tracker.observe(START, START + timedelta(minutes=9))
+
+    now = tracker.next_poll
+    waits = []
+    for attempt in range(7):
+        # A failure and an unchanged file count alike
+        tracker.observe(None if attempt % 2 else START, now)
+        waits.append(tracker.next_poll - now)
+        now = tracker.next_poll
+
+    assert waits == [
+        RETRY_MIN,
+        RETRY_MIN * 2,
+        RETRY_MIN * 4,
+        RETRY_MIN * 8,
+        RETRY_MAX,
+        RETRY_MAX,
+        RETRY_MAX,
+    ]
+    assert tracker.latest == START
+
+
+def test_jitter_is_stable_per_station():
+    """Stations are spread out, but each always by the same amount."""
+    assert PublicationTracker("11520").jitter == PublicationTracker("11520").jitter
+    jitters = {PublicationTracker(f"{n:05d}").jitter for n in range(50)}
+    assert len(jitters) > 10
+    assert all(timedelta(0) <= jitter < timedelta(minutes=1) for jitter in jitters)
@@ -0,0 +1,74 @@
+"""Tests for the ring buffers of the station series."""
+
+from custom_components.chmu.series import ElementSeries, StationSeries
+
+
+def _filled(capacity, count):
+    series = ElementSeries(capacity)
+    for n in range(count):
+        assert series.append(600 * n, n + 0.1)
+    return series
+
+
+def test_wrap_around_keeps_the_newest_entries():
+    """A full buffer overwrites its oldest entries."""
+    series = _filled(5, 13)
+
+    assert len(series) == 5
+    assert list(series) == [(600 * n, n + 0.1) for n in range(8, 13)]
+    assert series.latest() == (600 * 12, 12.1)
+
+
+def test_append_rejects_old_entries():
+    """Entries not newer than the newest one are ignored."""
+    series = _filled(5, 7)
+
+    assert not series.append(600 * 6, 0.0)
+    assert not series.append(600 * 2, 0.0)
+    assert series.latest() == (600 * 6, 6.1)
+
+
+def test_since_across_the_wrap():
+    """Entries newer than a timestamp are returned oldest first."""
+    series = _filled(5, 13)
+
+    assert list(series.since(600 * 9)) == [(600 * n, n + 0.1) for n in (10, 11, 12)]
+    assert list(series.since(600 * 12)) == []
+    assert list(series.since(0)) == list(series)
+
+
+def test_columns_match_iteration_at_every_head_position():
+    """The column slices are contiguous, whatever the head position."""
+    for count in range(12):
+        series = _filled(5, count)
+        times, values = series.columns()
+        assert list(times) == [timestamp for timestamp, _ in series]
+        assert [round(value, 1) for value in values] == [v for _, v in series]
+
+        if count:
+            after = 600 * (count - 3)
+            times, _ = series.columns(after)
+            assert list(times) == [t for t, _ in series.since(after)]
+
+
+def test_empty_series():
+    """An empty buffer has no entries."""
+    series = ElementSeries(5)
+
+    assert len(series) == 0
+    assert series.latest() is None
+    assert list(series) == []
+    times, values = series.columns()
+    assert len(times) == len(values) == 0
+
+
+def test_latest_time_across_elements():
+    """The newest measurement of any element times the station."""
+    series = StationSeries(5)
+    assert series.latest_time() is None
+
+    series.append("T", 600, 10.0)
+    series.append("H", 1200, 80.0)
+    series.append("T", 1800, 10.5)
+    series.append("SRA10M", 1200, 0.1)
+    assert series.latest_time() == 1800
@@ -0,0 +1,50 @@
+"""Tests for the translations shipped with the integration."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from custom_components.chmu.config_flow import (
+    MULTIPLE_STATIONS,
+    STATIONS_WITHIN_RADIUS,
+)
+from custom_components.chmu.const import CONF_STATION_ID, VIRTUAL_STATION_ID
+
+COMPONENT = Path(__file__).parent.parent / "custom_components" / "chmu"
+
+
+def _load(path):
+    return json.loads((COMPONENT / path).read_text(encoding="utf-8"))
+
+
+def _keys(strings, path=()):
+    """Return the paths of all strings."""
+    for key, value in strings.items():
+        if isinstance(value, dict):
+            yield from _keys(value, (*path, key))
+        else:
+            yield (*path, key)
+
+
+def test_english_matches_strings():
+    """The English translation is the source strings."""
+    assert _load("translations/en.json") == _load("strings.json")
+
+
+@pytest.mark.parametrize("language", ["cs"])
+def test_translation_is_complete(language):
+    """Every string has a translation, so no form mixes languages."""
+    assert set(_keys(_load(f"translations/{language}.json"))) == set(
+        _keys(_load("strings.json"))
+    )
+
+
+def test_station_selector_options_are_translated():
+    """The options leading to other steps are labelled by the translations."""
+    options = _load("strings.json")["selector"][CONF_STATION_ID]["options"]
+    assert set(options) == {
+        VIRTUAL_STATION_ID,
+        MULTIPLE_STATIONS,
+        STATIONS_WITHIN_RADIUS,
+    }
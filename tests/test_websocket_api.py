@@ -0,0 +1,116 @@
+"""Tests for the series subscription of frontend cards."""
+
+import asyncio
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant
+
+from custom_components.chmu.coordinator import async_get_hub
+from custom_components.chmu.websocket_api import websocket_subscribe_series
+
+STATION = "11520"
+START = 1_790_000_400
+
+
+class FakeConnection:
+    """Records what is sent to the card."""
+
+    def __init__(self):
+        self.subscriptions = {}
+        self.messages = []
+
+    def send_result(self, msg_id, result=None):
+        self.messages.append(("result", result))
+
+    def send_error(self, msg_id, code, message):
+        self.messages.append(("error", code))
+
+    def send_message(self, message):
+        self.messages.append(("event", message["event"]))
+
+
+def _run(test, tmp_path):
+    async def run():
+        hass = HomeAssistant(str(tmp_path))
+        hub = async_get_hub(hass)
+        hub.async_add_station(STATION, "Station")
+        hub.get_series(STATION).append("T", START, 10.0)
+        try:
+            await test(hass, hub)
+        finally:
+            await hass.async_stop(force=True)
+
+    asyncio.run(run())
+
+
+def _subscribe(hass):
+    connection = FakeConnection()
+    websocket_subscribe_series(
+        hass,
+        connection,
+        {"id": 1, "type": "chmu/series/subscribe", "station_id": STATION},
+    )
+    return connection
+
+
+def test_new_intervals_are_pushed(tmp_path):
+    """After the full series only the new entries are sent."""
+
+    async def test(hass, hub):
+        connection = _subscribe(hass)
+        hub.get_series(STATION).append("T", START + 600, 10.5)
+        hub.async_update_listeners()
+        # Nothing new
+        hub.async_update_listeners()
+
+        assert [kind for kind, _ in connection.messages] == ["result", "event", "event"]
+        assert connection.messages[1][1]["temperature"]["start"] == START
+        assert connection.messages[2][1]["temperature"]["start"] == START + 600
+        assert connection.messages[2][1]["temperature"]["deltas"] == []
+        await hub.async_shutdown()
+
+    _run(test, tmp_path)
+
+
+def test_subscription_ends_when_the_hub_shuts_down(tmp_path):
+    """A hub replaced after the last entry unloads does not leave it silent."""
+
+    async def test(hass, hub):
+        connection = _subscribe(hass)
+        await hub.async_shutdown()
+
+        assert connection.messages[-1] == ("error", websocket_api.ERR_NOT_FOUND)
+        assert connection.subscriptions == {}
+        assert hub._shutdown_listeners == []
+
+    _run(test, tmp_path)
+
+
+def test_subscription_ends_when_the_station_is_dropped(tmp_path):
+    """A station removed from a hub still in use ends its subscriptions."""
+
+    async def test(hass, hub):
+        connection = _subscribe(hass)
+        hub.async_remove_station(STATION)
+        hub.async_update_listeners()
+
+        assert connection.messages[-1] == ("error", websocket_api.ERR_NOT_FOUND)
+        assert connection.subscriptions == {}
+        # Unsubscribing also stopped watching for the shutdown
+        await hub.async_shutdown()
+        assert connection.messages.count(("error", websocket_api.ERR_NOT_FOUND)) == 1
+
+    _run(test, tmp_path)
+
+
+def test_card_unsubscribing(tmp_path):
+    """Unsubscribing removes both listeners from the hub."""
+
+    async def test(hass, hub):
+        connection = _subscribe(hass)
+        connection.subscriptions.pop(1)()
+        assert not hub._listeners
+        assert hub._shutdown_listeners == []
+        await hub.async_shutdown()
+
+    _run(test, tmp_path)